@@ -0,0 +1,67 @@
+"""full-text and trigram search for users and companies
+
+Revision ID: 3f1a9c2b7d10
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c2b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+USERS_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(username, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(first_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(last_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(email, '')), 'B')"
+)
+COMPANIES_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+TRIGRAM_INDEXES = [
+    ("users", "username"),
+    ("users", "first_name"),
+    ("users", "last_name"),
+    ("users", "email"),
+    ("company_profiles", "name"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, expression in (("users", USERS_VECTOR), ("company_profiles", COMPANIES_VECTOR)):
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+            f"ON {table} USING gin (search_vector)"
+        )
+
+    for table, column in TRIGRAM_INDEXES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+            f"ON {table} USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    for table, column in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm")
+
+    for table in ("users", "company_profiles"):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+    # pg_trgm is left installed; other schemas may depend on it
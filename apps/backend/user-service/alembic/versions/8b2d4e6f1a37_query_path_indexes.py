@@ -0,0 +1,67 @@
+"""composite indexes for CRUD query paths
+
+Revision ID: 8b2d4e6f1a37
+Revises: 3f1a9c2b7d10
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2d4e6f1a37'
+down_revision = '3f1a9c2b7d10'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, partial predicate); mirrors the models' __table_args__.
+# Partial where every query on the path filters active rows with a bare
+# "is_active" or "is_active = true" (which the planner matches to the predicate).
+# Member listings, companies of a user and sessions of a user keep is_active
+# as a key column: they also run without the filter, and the user_id /
+# company_id indexes double as foreign key indexes, which must cover every row.
+INDEXES = [
+    ("ix_users_active_status_created_at", "users", ["status", "created_at", "id"], "is_active"),
+    ("ix_users_created_at_id", "users", ["created_at", "id"], None),
+    ("ix_user_sessions_user_id_is_active", "user_sessions", ["user_id", "is_active"], None),
+    ("ix_user_sessions_expires_at", "user_sessions", ["expires_at"], None),
+    (
+        "ix_company_profiles_active_is_verified_created_at",
+        "company_profiles",
+        ["is_verified", "created_at", "id"],
+        "is_active",
+    ),
+    ("ix_team_members_active_company_id_user_id", "team_members", ["company_id", "user_id"], "is_active"),
+    (
+        "ix_team_members_company_id_is_active_created_at",
+        "team_members",
+        ["company_id", "is_active", "created_at", "id"],
+        None,
+    ),
+    ("ix_team_members_user_id_is_active", "team_members", ["user_id", "is_active"], None),
+    ("ix_subscriptions_company_id_created_at", "subscriptions", ["company_id", "created_at"], None),
+    ("ix_subscriptions_active_current_period_end", "subscriptions", ["current_period_end"], "is_active"),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids blocking writes on large tables; it cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
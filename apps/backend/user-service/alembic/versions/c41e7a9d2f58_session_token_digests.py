@@ -0,0 +1,112 @@
+"""look up sessions by token digest
+
+Revision ID: c41e7a9d2f58
+Revises: 8b2d4e6f1a37
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41e7a9d2f58'
+down_revision = '8b2d4e6f1a37'
+branch_labels = None
+depends_on = None
+
+
+# Rows hashed per UPDATE; each batch commits on its own
+BACKFILL_BATCH_SIZE = 5000
+
+# (index name, digest column, source column); mirrors UserSession.__table_args__
+DIGESTS = [
+    ("ix_user_sessions_session_token_digest", "session_token_digest", "session_token"),
+    ("ix_user_sessions_refresh_token_digest", "refresh_token_digest", "refresh_token"),
+]
+
+
+def _backfill(digest_column: str, source_column: str) -> None:
+    """Hash existing tokens in primary key order, BACKFILL_BATCH_SIZE rows per batch.
+
+    Each batch starts after the last id of the previous one, so it is an
+    index range scan; filtering on the NULL digest instead would rescan
+    every row already hashed, on every batch.
+    """
+    connection = op.get_bind()
+
+    def batch(after_last_id: bool) -> sa.TextClause:
+        lower_bound = "WHERE id > :last_id " if after_last_id else ""
+        return sa.text(
+            f"WITH batch AS ("
+            f"SELECT id FROM user_sessions {lower_bound}ORDER BY id LIMIT :batch_size), "
+            f"hashed AS ("
+            f"UPDATE user_sessions SET {digest_column} = sha256(convert_to({source_column}, 'UTF8')) "
+            f"WHERE id IN (SELECT id FROM batch) "
+            f"AND {digest_column} IS NULL AND {source_column} IS NOT NULL) "
+            f"SELECT id FROM batch ORDER BY id DESC LIMIT 1"
+        )
+
+    last_id = connection.execute(batch(False), {"batch_size": BACKFILL_BATCH_SIZE}).scalar()
+    while last_id is not None:
+        last_id = connection.execute(
+            batch(True), {"batch_size": BACKFILL_BATCH_SIZE, "last_id": last_id}
+        ).scalar()
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("user_sessions")}
+
+    for _, digest_column, _ in DIGESTS:
+        op.execute(f"ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS {digest_column} bytea")
+
+    # Autocommit: every backfill batch and CONCURRENTLY index build commits on its own
+    with op.get_context().autocommit_block():
+        for name, digest_column, source_column in DIGESTS:
+            if source_column in columns:
+                _backfill(digest_column, source_column)
+            op.create_index(
+                name,
+                "user_sessions",
+                [digest_column],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        # The full-JWT index is no longer used by any lookup
+        op.drop_index(
+            "ix_user_sessions_session_token",
+            table_name="user_sessions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.alter_column("user_sessions", "session_token_digest", nullable=False)
+    # New sessions no longer store the raw token; the column is dropped in a later release
+    if "session_token" in columns:
+        op.alter_column("user_sessions", "session_token", nullable=True)
+
+
+def downgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("user_sessions")}
+
+    if "session_token" in columns:
+        # Sessions created after the upgrade have no raw token to fall back on
+        op.execute("DELETE FROM user_sessions WHERE session_token IS NULL")
+        op.alter_column("user_sessions", "session_token", nullable=False)
+
+    with op.get_context().autocommit_block():
+        if "session_token" in columns:
+            op.create_index(
+                "ix_user_sessions_session_token",
+                "user_sessions",
+                ["session_token"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, _, _ in reversed(DIGESTS):
+            op.drop_index(name, table_name="user_sessions", postgresql_concurrently=True, if_exists=True)
+
+    for _, digest_column, _ in reversed(DIGESTS):
+        op.drop_column("user_sessions", digest_column)
@@ -6,6 +6,7 @@ from .v1 import api_router
 from .dependencies import (
     get_db,
     get_current_user,
+    get_current_user_snapshot,
     get_current_active_user,
     get_current_verified_user,
     get_current_superuser,
@@ -23,6 +24,7 @@ __all__ = [
     "api_router",
     "get_db",
     "get_current_user", 
+    "get_current_user_snapshot",
     "get_current_active_user",
     "get_current_verified_user",
     "get_current_superuser",
@@ -10,9 +10,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 import logging
 
+from app.core.cache import (
+    CompanyAccess,
+    REQUEST_ACCESS_KEY,
+    UserSnapshot,
+    company_access_cache,
+    invalidate_company_access,
+    user_cache
+)
 from app.core.database import get_session
-from app.core.security import verify_token, check_permission
+from app.core.security import PermissionSet, verify_token, check_permission
 from app.crud import user as user_crud
+from app.crud.base import decode_cursor, InvalidCursorError
 from app.models.user_simple import User, UserRole
 from app.schemas.user import TokenData
 
@@ -56,11 +65,55 @@ async def get_current_user_token(
         raise credentials_exception
 
 
+async def get_current_user_snapshot(
+    db: AsyncSession = Depends(get_db),
+    token_data: Dict[str, Any] = Depends(get_current_user_token)
+) -> UserSnapshot:
+    """Get current user's auth snapshot, served from the user cache when fresh."""
+    try:
+        user_id = UUID(token_data.get("sub"))
+        snapshot = user_cache.get(user_id)
+        
+        if snapshot is None:
+            user = await user_crud.get(db, user_id)
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found"
+                )
+            
+            snapshot = UserSnapshot.from_user(user)
+            user_cache.set(user_id, snapshot)
+        
+        if not snapshot.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Inactive user"
+            )
+        
+        return snapshot
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Invalid user ID in token: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token format"
+        )
+    except Exception as e:
+        logger.error(f"Error getting current user: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token_data: Dict[str, Any] = Depends(get_current_user_token)
 ) -> User:
-    """Get current authenticated user."""
+    """Get current authenticated user row (for endpoints needing the full profile)."""
     try:
         user_id = UUID(token_data.get("sub"))
         user = await user_crud.get(db, user_id)
@@ -71,6 +124,8 @@ async def get_current_user(
                 detail="User not found"
             )
         
+        user_cache.set(user_id, UserSnapshot.from_user(user))
+        
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,6 +137,8 @@ async def get_current_user(
         
         return user
         
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Invalid user ID in token: {str(e)}")
         raise HTTPException(
@@ -109,8 +166,8 @@ async def get_current_active_user(
 
 
 async def get_current_verified_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+) -> UserSnapshot:
     """Get current verified user."""
     if not current_user.is_verified:
         raise HTTPException(
@@ -121,8 +178,8 @@ async def get_current_verified_user(
 
 
 async def get_current_superuser(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+) -> UserSnapshot:
     """Get current superuser."""
     if not current_user.is_superuser:
         raise HTTPException(
@@ -133,8 +190,8 @@ async def get_current_superuser(
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user_snapshot)
+) -> UserSnapshot:
     """Get current admin user."""
     if current_user.role != UserRole.ADMIN and not current_user.is_superuser:
         raise HTTPException(
@@ -144,26 +201,46 @@ async def get_current_admin_user(
     return current_user
 
 
-def require_permission(permission: str):
-    """Dependency factory for permission checking."""
-    async def permission_dependency(
-        current_user: User = Depends(get_current_active_user)
-    ) -> User:
-        if not check_permission(current_user.role, permission, current_user.is_superuser):
+def require_permission(permission: str, company_scoped: bool = False):
+    """Dependency factory for permission checking.
+    
+    With company_scoped=True the route's company_id path parameter is used
+    and the caller's per-company grants are combined with their role.
+    """
+    def check(current_user: UserSnapshot, extra: Optional[PermissionSet] = None) -> UserSnapshot:
+        if not check_permission(current_user.role, permission, current_user.is_superuser, extra):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Permission required: {permission}"
             )
         return current_user
     
-    return permission_dependency
+    if not company_scoped:
+        async def permission_dependency(
+            current_user: UserSnapshot = Depends(get_current_user_snapshot)
+        ) -> UserSnapshot:
+            return check(current_user)
+        
+        return permission_dependency
+    
+    async def company_permission_dependency(
+        company_id: UUID,
+        db: AsyncSession = Depends(get_db),
+        current_user: UserSnapshot = Depends(get_current_verified_user)
+    ) -> UserSnapshot:
+        if current_user.is_superuser:
+            return current_user
+        access = await get_company_access(company_id, db, current_user)
+        return check(current_user, PermissionSet(access.permissions))
+    
+    return company_permission_dependency
 
 
 def require_roles(*roles: UserRole):
     """Dependency factory for role checking."""
     async def role_dependency(
-        current_user: User = Depends(get_current_active_user)
-    ) -> User:
+        current_user: UserSnapshot = Depends(get_current_user_snapshot)
+    ) -> UserSnapshot:
         if current_user.role not in roles and not current_user.is_superuser:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -216,27 +293,33 @@ async def rate_limit_dependency(
     client_ip = request.client.host
     key = f"rate_limit:{client_ip}"
     
-    if not rate_limiter.is_allowed(key, limit, window):
+    result = await rate_limiter.hit(key, limit, window)
+    if not result.allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Rate limit exceeded",
             headers={
-                "Retry-After": str(window),
+                "Retry-After": str(result.retry_after),
                 "X-RateLimit-Limit": str(limit),
-                "X-RateLimit-Remaining": str(0),
+                "X-RateLimit-Remaining": str(result.remaining),
             }
         )
 
 
 # Pagination dependency
 class PaginationParams:
-    """Pagination parameters."""
+    """Pagination parameters.
+    
+    Offset mode uses ``page``/``size``. Passing ``cursor`` (an empty string for
+    the first page) switches to keyset pagination on (created_at, id).
+    """
     
     def __init__(
         self, 
         page: int = 1,
         size: int = 20,
-        max_size: int = 100
+        max_size: int = 100,
+        cursor: Optional[str] = None
     ):
         if page < 1:
             page = 1
@@ -249,47 +332,112 @@ class PaginationParams:
         self.size = size
         self.skip = (page - 1) * size
         self.limit = size
+        self.cursor = cursor
+    
+    @property
+    def use_cursor(self) -> bool:
+        """Whether keyset (cursor) pagination was requested."""
+        return self.cursor is not None
 
 
 async def get_pagination_params(
     page: int = 1,
-    size: int = 20
+    size: int = 20,
+    cursor: Optional[str] = None
 ) -> PaginationParams:
     """Get pagination parameters."""
-    return PaginationParams(page=page, size=size)
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+    return PaginationParams(page=page, size=size, cursor=cursor)
 
 
 # Company access dependency
-async def get_user_company(
+async def _resolve_company_access(
     company_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    db: AsyncSession,
+    current_user: UserSnapshot
 ):
-    """Check if user has access to company."""
-    from app.crud import company as company_crud, team_member
+    """Return (company or None, decision), consulting the request then process caches.
     
-    # Check if user owns the company
-    company = await company_crud.get(db, company_id)
-    if not company:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Company not found"
-        )
+    A miss costs one query loading the company with the user's membership.
+    """
+    from app.crud import team_member
     
-    if company.owner_id == current_user.id:
-        return company
+    key = (current_user.id, company_id)
+    request_cache = db.info.setdefault(REQUEST_ACCESS_KEY, {})
+    access = request_cache.get(key)
+    if access is None:
+        access = company_access_cache.get(key)
+    if access is not None:
+        request_cache[key] = access
+        return None, access
     
-    # Check if user is a team member
-    membership = await team_member.get_by_company_and_user(
+    company, membership = await team_member.get_company_with_membership(
         db, company_id, current_user.id
     )
+    if company is None:
+        return None, None
     
-    if not membership or not membership.is_active:
+    access = CompanyAccess.build(company, membership, current_user.id)
+    company_access_cache.set(key, access)
+    request_cache[key] = access
+    return company, access
+
+
+def _check_company_access(access: Optional[CompanyAccess]) -> CompanyAccess:
+    """Raise 404 / 403 unless access allows the user in."""
+    if access is None or not access.company_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company not found"
+        )
+    
+    if not access.allowed:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access to company denied"
         )
     
+    return access
+
+
+async def get_company_access(
+    company_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_verified_user)
+) -> CompanyAccess:
+    """Check if user has access to company without loading it when cached."""
+    _, access = await _resolve_company_access(company_id, db, current_user)
+    return _check_company_access(access)
+
+
+async def get_user_company(
+    company_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_verified_user)
+):
+    """Check if user has access to company and return it."""
+    from app.models.company_simple import CompanyProfile
+    
+    company, access = await _resolve_company_access(company_id, db, current_user)
+    _check_company_access(access)
+    
+    if company is None:
+        # Cached decision; the identity map makes repeat loads in a request free
+        company = await db.get(CompanyProfile, company_id)
+        if company is None:
+            invalidate_company_access(company_id, db=db)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Company not found"
+            )
+    
     return company
 
 
@@ -28,10 +28,13 @@ from app.core.security import (
     create_email_verification_token,
     create_password_reset_token,
     verify_token,
+    token_digest,
     validate_password_strength
 )
 from app.core.config import get_settings
+from app.core.revocation import revocation_list
 from app.models.user_simple import UserStatus
+from app.tasks import task_queue
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -74,9 +77,17 @@ async def register(
         
         # Create user
         user = await user_crud.create(db, user_create)
+        verification_token = create_email_verification_token(user.email)
         
-        # Send verification email (in a real app, this would be done asynchronously)
-        # await send_verification_email(user.email, user.first_name)
+        # Keyed on the link being sent, so only retries of this very email are dropped
+        await task_queue.enqueue(
+            "email.verification",
+            idempotency_key=token_digest(verification_token).hex(),
+            to_email=user.email,
+            first_name=user.first_name or "there",
+            verification_token=verification_token
+        )
+        await task_queue.enqueue("audit.record", action="user.registered", actor_id=user.id, target_id=user.id)
         
         logger.info(f"New user registered: {user.email}")
         
@@ -101,11 +112,12 @@ async def login(
 ) -> Any:
     """Login user and return JWT tokens."""
     try:
-        # Authenticate user
+        # Authenticate user; login bookkeeping is deferred below
         user = await user_crud.authenticate(
             db,
             email=user_credentials.email,
-            password=user_credentials.password
+            password=user_credentials.password,
+            record_login=False
         )
         
         if not user:
@@ -145,14 +157,15 @@ async def login(
             expires_delta=refresh_token_expires
         )
         
-        # Create session record
-        session_expires = datetime.utcnow() + access_token_expires
+        # The session is committed before the tokens are returned, so an immediate
+        # refresh or logout finds it; only last-login bookkeeping is deferred
+        now = datetime.utcnow()
         await session_crud.create_session(
             db,
             user_id=user.id,
-            session_token=access_token,
-            refresh_token=refresh_token,
-            expires_at=session_expires,
+            session_token_digest=token_digest(access_token),
+            refresh_token_digest=token_digest(refresh_token),
+            expires_at=now + access_token_expires,
             ip_address=request.client.host,
             user_agent=request.headers.get("user-agent"),
             device_info={
@@ -161,6 +174,8 @@ async def login(
                 "remember_me": user_credentials.remember_me
             }
         )
+        await task_queue.enqueue("auth.record_login", user_id=user.id, logged_in_at=now)
+        await task_queue.enqueue("audit.record", action="user.login", actor_id=user.id, target_id=user.id)
         
         logger.info(f"User logged in: {user.email}")
         
@@ -235,16 +250,16 @@ async def refresh_token(
             expires_delta=refresh_token_expires
         )
         
+        # The old refresh token is single use
+        await revocation_list.revoke_token(payload)
+        
         # Update session
-        await session_crud.update(
+        await session_crud.rotate_tokens(
             db,
             session,
-            {
-                "session_token": access_token,
-                "refresh_token": new_refresh_token,
-                "expires_at": datetime.utcnow() + access_token_expires,
-                "last_accessed_at": datetime.utcnow()
-            }
+            access_token,
+            new_refresh_token,
+            expires_at=datetime.utcnow() + access_token_expires
         )
         
         logger.info(f"Token refreshed for user: {user.email}")
@@ -285,6 +300,9 @@ async def logout(
                 detail="Invalid token"
             )
         
+        # The token stops working everywhere now, not when it expires
+        await revocation_list.revoke_token(payload)
+        
         # Get and deactivate session
         session = await session_crud.get_by_token(db, token)
         if session:
@@ -325,6 +343,9 @@ async def logout_all(
         from uuid import UUID
         user_id = UUID(payload.get("sub"))
         
+        # Every token issued so far, access and refresh, stops working
+        await revocation_list.revoke_user(user_id)
+        
         # Deactivate all user sessions
         sessions_count = await session_crud.deactivate_user_sessions(db, user_id)
         
@@ -363,8 +384,13 @@ async def request_email_verification(
         # Generate verification token
         verification_token = create_email_verification_token(user.email)
         
-        # In a real app, send email asynchronously
-        # await send_verification_email(user.email, verification_token)
+        await task_queue.enqueue(
+            "email.verification",
+            idempotency_key=token_digest(verification_token).hex(),
+            to_email=user.email,
+            first_name=user.first_name or "there",
+            verification_token=verification_token
+        )
         
         logger.info(f"Email verification requested: {user.email}")
         
@@ -407,6 +433,12 @@ async def verify_email(
         
         # Verify user
         await user_crud.verify_email(db, user)
+        await task_queue.enqueue(
+            "email.welcome",
+            idempotency_key=token_digest(verification_data.token).hex(),
+            to_email=user.email,
+            first_name=user.first_name or "there"
+        )
         
         logger.info(f"Email verified: {user.email}")
         
@@ -439,8 +471,14 @@ async def request_password_reset(
         # Generate reset token
         reset_token = create_password_reset_token(user.email)
         
-        # In a real app, send email asynchronously
-        # await send_password_reset_email(user.email, reset_token)
+        await task_queue.enqueue(
+            "email.password_reset",
+            idempotency_key=token_digest(reset_token).hex(),
+            to_email=user.email,
+            first_name=user.first_name or "there",
+            reset_token=reset_token
+        )
+        await task_queue.enqueue("audit.record", action="user.password_reset_requested", target_id=user.id)
         
         logger.info(f"Password reset requested: {user.email}")
         
@@ -489,7 +527,8 @@ async def confirm_password_reset(
         # Update password
         await user_crud.update_password(db, user, reset_data.new_password)
         
-        # Logout user from all sessions for security
+        # Logout user from all sessions for security; tokens issued so far stop working
+        await revocation_list.revoke_user(user.id)
         await session_crud.deactivate_user_sessions(db, user.id)
         
         logger.info(f"Password reset completed: {user.email}")
@@ -12,6 +12,7 @@ from app.api.dependencies import (
     get_db,
     get_current_verified_user,
     get_user_company,
+    get_company_access,
     get_pagination_params,
     get_search_params,
     PaginationParams,
@@ -31,8 +32,9 @@ from app.schemas.company import (
     TeamMemberListResponse,
     CompanySearchFilters
 )
-from app.models.user_simple import User
+from app.core.cache import UserSnapshot
 from app.models.company_simple import CompanyProfile, CompanySize, IndustryType
+from app.tasks import task_queue
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -42,7 +44,7 @@ router = APIRouter()
 async def create_company(
     company_create: CompanyCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> Any:
     """Create a new company profile."""
     try:
@@ -74,19 +76,18 @@ async def create_company(
 @router.get("/my-companies", response_model=CompanyListResponse)
 async def get_my_companies(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: UserSnapshot = Depends(get_current_verified_user),
     pagination: PaginationParams = Depends(get_pagination_params)
 ) -> Any:
     """Get current user's companies."""
     try:
-        companies = await company_crud.get_by_owner(
+        companies, total = await company_crud.get_page(
             db,
-            current_user.id,
             skip=pagination.skip,
-            limit=pagination.limit
+            limit=pagination.limit,
+            filters={"owner_id": current_user.id},
+            cursor=pagination.cursor
         )
-        
-        total = await company_crud.count(db, filters={"owner_id": current_user.id})
         total_pages = (total + pagination.size - 1) // pagination.size
         
         return {
@@ -94,7 +95,8 @@ async def get_my_companies(
             "total": total,
             "page": pagination.page,
             "size": pagination.size,
-            "pages": total_pages
+            "pages": total_pages,
+            "next_cursor": company_crud.next_cursor(companies, pagination.limit) if pagination.use_cursor else None
         }
         
     except Exception as e:
@@ -109,7 +111,7 @@ async def get_my_companies(
 async def get_company(
     company_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> Any:
     """Get company by ID (owner or team member only)."""
     company = await get_user_company(company_id, db, current_user)
@@ -121,14 +123,15 @@ async def update_company(
     company_id: UUID,
     company_update: CompanyUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> Any:
     """Update company profile."""
     try:
         company = await get_user_company(company_id, db, current_user)
+        access = await get_company_access(company_id, db, current_user)
         
         # Only owner can update company profile
-        if company.owner_id != current_user.id:
+        if not access.is_owner:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only company owner can update profile"
@@ -155,14 +158,15 @@ async def update_company(
 async def delete_company(
     company_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> None:
     """Delete company (soft delete)."""
     try:
         company = await get_user_company(company_id, db, current_user)
+        access = await get_company_access(company_id, db, current_user)
         
         # Only owner can delete company
-        if company.owner_id != current_user.id:
+        if not access.is_owner:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only company owner can delete company"
@@ -207,32 +211,18 @@ async def search_public_companies(
         if country:
             filters["country"] = country
         
-        if search.q:
-            companies = await company_crud.search_companies(
-                db,
-                search_term=search.q,
-                skip=pagination.skip,
-                limit=pagination.limit,
-                filters=filters
-            )
-        elif skills:
-            companies = await company_crud.get_companies_by_skills(
-                db,
-                skills=skills,
-                skip=pagination.skip,
-                limit=pagination.limit
-            )
-        else:
-            companies = await company_crud.get_multi(
-                db,
-                skip=pagination.skip,
-                limit=pagination.limit,
-                filters=filters,
-                order_by="created_at"
-            )
-        
-        # Get total count
-        total = await company_crud.count(db, filters=filters)
+        # Page and total count in a single query
+        companies, total = await company_crud.get_page(
+            db,
+            skip=pagination.skip,
+            limit=pagination.limit,
+            order_by=None if search.q or skills else "created_at",
+            filters=filters,
+            cursor=pagination.cursor,
+            search_term=search.q,
+            search_fields=company_crud.search_fields,
+            conditions=[company_crud.skills_condition(skills)] if skills else None
+        )
         total_pages = (total + pagination.size - 1) // pagination.size
         
         return {
@@ -240,7 +230,8 @@ async def search_public_companies(
             "total": total,
             "page": pagination.page,
             "size": pagination.size,
-            "pages": total_pages
+            "pages": total_pages,
+            "next_cursor": company_crud.next_cursor(companies, pagination.limit) if pagination.use_cursor else None
         }
         
     except Exception as e:
@@ -288,33 +279,24 @@ async def get_company_by_slug(
 async def get_team_members(
     company_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: UserSnapshot = Depends(get_current_verified_user),
     pagination: PaginationParams = Depends(get_pagination_params),
     role: Optional[str] = Query(None, description="Filter by role")
 ) -> Any:
     """Get company team members."""
     try:
-        company = await get_user_company(company_id, db, current_user)
+        await get_company_access(company_id, db, current_user)
         
+        filters = {"company_id": company_id, "is_active": True}
         if role:
-            members = await member_crud.get_members_by_role(
-                db,
-                company_id,
-                role,
-                skip=pagination.skip,
-                limit=pagination.limit
-            )
-        else:
-            members = await member_crud.get_company_members(
-                db,
-                company_id,
-                skip=pagination.skip,
-                limit=pagination.limit
-            )
+            filters["role"] = role
         
-        total = await member_crud.count(
-            db, 
-            filters={"company_id": company_id, "is_active": True}
+        members, total = await member_crud.get_page(
+            db,
+            skip=pagination.skip,
+            limit=pagination.limit,
+            filters=filters,
+            cursor=pagination.cursor
         )
         total_pages = (total + pagination.size - 1) // pagination.size
         
@@ -323,7 +305,8 @@ async def get_team_members(
             "total": total,
             "page": pagination.page,
             "size": pagination.size,
-            "pages": total_pages
+            "pages": total_pages,
+            "next_cursor": member_crud.next_cursor(members, pagination.limit) if pagination.use_cursor else None
         }
         
     except HTTPException:
@@ -341,22 +324,19 @@ async def invite_team_member(
     company_id: UUID,
     member_invite: TeamMemberInvite,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> Any:
     """Invite team member."""
     try:
         company = await get_user_company(company_id, db, current_user)
+        access = await get_company_access(company_id, db, current_user)
         
         # Only owner or admin members can invite
-        if company.owner_id != current_user.id:
-            membership = await member_crud.get_by_company_and_user(
-                db, company_id, current_user.id
+        if not access.can_manage_members:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions to invite members"
             )
-            if not membership or membership.role not in ["admin", "manager"]:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Insufficient permissions to invite members"
-                )
         
         # Check if user exists
         from app.crud import user as user_crud
@@ -389,8 +369,21 @@ async def invite_team_member(
             invited_by=current_user.id
         )
         
-        # In a real app, send invitation email
-        # await send_team_invitation_email(invited_user.email, company.name, member_invite.message)
+        await task_queue.enqueue(
+            "email.team_invitation",
+            idempotency_key=str(member.id),
+            to_email=invited_user.email,
+            first_name=invited_user.first_name or "there",
+            company_name=company.name,
+            message=member_invite.message
+        )
+        await task_queue.enqueue(
+            "audit.record",
+            action="company.member_invited",
+            actor_id=current_user.id,
+            target_id=invited_user.id,
+            details={"company_id": company_id, "role": member_invite.role}
+        )
         
         logger.info(f"Team member invited: {invited_user.email} to {company.name}")
         
@@ -412,7 +405,7 @@ async def update_team_member(
     member_id: UUID,
     member_update: TeamMemberUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> Any:
     """Update team member."""
     try:
@@ -426,15 +419,12 @@ async def update_team_member(
             )
         
         # Check permissions
-        if company.owner_id != current_user.id:
-            current_membership = await member_crud.get_by_company_and_user(
-                db, company_id, current_user.id
+        access = await get_company_access(company_id, db, current_user)
+        if not access.can_manage_members:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions to update member"
             )
-            if not current_membership or current_membership.role not in ["admin", "manager"]:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Insufficient permissions to update member"
-                )
         
         update_data = member_update.model_dump(exclude_unset=True)
         updated_member = await member_crud.update(db, member, update_data)
@@ -458,7 +448,7 @@ async def remove_team_member(
     company_id: UUID,
     member_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> None:
     """Remove team member."""
     try:
@@ -472,18 +462,12 @@ async def remove_team_member(
             )
         
         # Check permissions - can remove self or if owner/admin
+        access = await get_company_access(company_id, db, current_user)
         can_remove = (
             member.user_id == current_user.id or  # Self
-            company.owner_id == current_user.id   # Owner
+            access.can_manage_members             # Owner or admin
         )
         
-        if not can_remove:
-            current_membership = await member_crud.get_by_company_and_user(
-                db, company_id, current_user.id
-            )
-            if current_membership and current_membership.role in ["admin", "manager"]:
-                can_remove = True
-        
         if not can_remove:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -3,8 +3,10 @@ User endpoints for SkillForge AI User Service
 """
 
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+import json
 import logging
 from uuid import UUID
 
@@ -22,6 +24,8 @@ from app.crud import user as user_crud, user_settings as settings_crud
 from app.schemas.user import (
     UserResponse,
     UserPublicResponse,
+    UserBatchRequest,
+    UserBatchResponse,
     UserAdminResponse,
     UserUpdate,
     UserPasswordUpdate,
@@ -34,7 +38,15 @@ from app.schemas.user import (
 )
 from app.models.user_simple import User, UserRole, UserStatus
 from app.core.security import validate_password_strength, Permissions
+from app.core.cache import UserSnapshot, user_cache
+from app.core.revocation import revocation_list
 from app.core.config import get_settings
+from app.utils.bulk_import import (
+    iter_lines,
+    iter_csv_records,
+    iter_ndjson_records,
+    stream_user_import
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -87,8 +99,8 @@ async def change_password(
     """Change current user's password."""
     try:
         # Verify current password
-        from app.core.security import verify_password
-        if not verify_password(password_update.current_password, current_user.hashed_password):
+        from app.core.security import verify_password_async
+        if not await verify_password_async(password_update.current_password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
@@ -168,20 +180,23 @@ async def update_user_settings(
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_current_user(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: UserSnapshot = Depends(get_current_verified_user)
 ) -> None:
     """Delete current user account (soft delete)."""
     try:
+        user = await user_crud.get(db, current_user.id)
+        
         # Soft delete by deactivating account
         await user_crud.update_status(
             db, 
-            current_user, 
+            user, 
             UserStatus.INACTIVE, 
             is_active=False
         )
         
-        # Deactivate all sessions
+        # Deactivate all sessions and revoke their tokens
         from app.crud import user_session
+        await revocation_list.revoke_user(current_user.id)
         await user_session.deactivate_user_sessions(db, current_user.id)
         
         logger.info(f"User account deleted: {current_user.email}")
@@ -211,6 +226,30 @@ async def get_user_public_profile(
     return user
 
 
+@router.post("/public/batch", response_model=UserBatchResponse)
+async def get_user_public_profiles(
+    batch: UserBatchRequest,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Get public profiles for several users with one query.
+    
+    Profiles come back in request order; unknown and inactive ids are
+    listed in missing, each only once.
+    """
+    ids = list(dict.fromkeys(batch.ids))
+    users = await user_crud.get_many(db, ids)
+    
+    found, missing = [], []
+    for user_id, user in zip(ids, users):
+        if user is None or not user.is_active:
+            missing.append(user_id)
+            continue
+        user_cache.set(user.id, UserSnapshot.from_user(user))
+        found.append(user)
+    
+    return {"users": found, "missing": missing}
+
+
 @router.get("/public", response_model=UserPublicListResponse)
 async def get_public_users(
     db: AsyncSession = Depends(get_db),
@@ -225,32 +264,18 @@ async def get_public_users(
         if verified_only:
             filters["is_verified"] = True
         
-        if search.q:
-            users = await user_crud.search_users(
-                db,
-                search_term=search.q,
-                skip=pagination.skip,
-                limit=pagination.limit,
-                filters=filters
-            )
-        elif skills:
-            users = await user_crud.get_users_by_skills(
-                db,
-                skills=skills,
-                skip=pagination.skip,
-                limit=pagination.limit
-            )
-        else:
-            users = await user_crud.get_multi(
-                db,
-                skip=pagination.skip,
-                limit=pagination.limit,
-                filters=filters,
-                order_by="created_at"
-            )
-        
-        # Get total count
-        total = await user_crud.count(db, filters=filters)
+        # Page and total count in a single query
+        users, total = await user_crud.get_page(
+            db,
+            skip=pagination.skip,
+            limit=pagination.limit,
+            order_by=None if search.q or skills else "created_at",
+            filters=filters,
+            cursor=pagination.cursor,
+            search_term=search.q,
+            search_fields=user_crud.search_fields,
+            conditions=[user_crud.skills_condition(skills)] if skills else None
+        )
         total_pages = (total + pagination.size - 1) // pagination.size
         
         return {
@@ -258,7 +283,8 @@ async def get_public_users(
             "total": total,
             "page": pagination.page,
             "size": pagination.size,
-            "pages": total_pages
+            "pages": total_pages,
+            "next_cursor": user_crud.next_cursor(users, pagination.limit) if pagination.use_cursor else None
         }
         
     except Exception as e:
@@ -275,9 +301,9 @@ async def get_users(
     db: AsyncSession = Depends(get_db),
     pagination: PaginationParams = Depends(get_pagination_params),
     search: SearchParams = Depends(get_search_params),
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserSnapshot = Depends(get_current_admin_user),
     role: Optional[UserRole] = Query(None, description="Filter by role"),
-    status: Optional[UserStatus] = Query(None, description="Filter by status"),
+    user_status: Optional[UserStatus] = Query(None, alias="status", description="Filter by status"),
     is_verified: Optional[bool] = Query(None, description="Filter by verification status"),
     is_active: Optional[bool] = Query(None, description="Filter by active status")
 ) -> Any:
@@ -286,38 +312,38 @@ async def get_users(
         filters = {}
         if role:
             filters["role"] = role
-        if status:
-            filters["status"] = status
+        if user_status:
+            filters["status"] = user_status
         if is_verified is not None:
             filters["is_verified"] = is_verified
         if is_active is not None:
             filters["is_active"] = is_active
         
-        if search.q:
-            users = await user_crud.search_users(
-                db,
-                search_term=search.q,
-                skip=pagination.skip,
-                limit=pagination.limit,
-                filters=filters
+        if pagination.use_cursor and search.sort_by not in (None, "created_at"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination only supports sorting by created_at"
             )
-        else:
+        
+        order_by = None
+        if not search.q:
             order_by = search.sort_by or "created_at"
             if search.sort_order == "asc":
                 order_by = order_by
             else:
                 order_by = f"-{order_by}"
-            
-            users = await user_crud.get_multi(
-                db,
-                skip=pagination.skip,
-                limit=pagination.limit,
-                filters=filters,
-                order_by=order_by
-            )
         
-        # Get total count
-        total = await user_crud.count(db, filters=filters)
+        # Page and total count in a single query
+        users, total = await user_crud.get_page(
+            db,
+            skip=pagination.skip,
+            limit=pagination.limit,
+            order_by=order_by,
+            filters=filters,
+            cursor=pagination.cursor,
+            search_term=search.q,
+            search_fields=user_crud.search_fields
+        )
         total_pages = (total + pagination.size - 1) // pagination.size
         
         return {
@@ -325,9 +351,12 @@ async def get_users(
             "total": total,
             "page": pagination.page,
             "size": pagination.size,
-            "pages": total_pages
+            "pages": total_pages,
+            "next_cursor": user_crud.next_cursor(users, pagination.limit) if pagination.use_cursor else None
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Admin users list error: {str(e)}")
         raise HTTPException(
@@ -336,11 +365,58 @@ async def get_users(
         )
 
 
+@router.post("/import")
+async def import_users(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    company_id: Optional[UUID] = None,
+    member_role: str = Query("member", max_length=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_admin_user)
+) -> StreamingResponse:
+    """Bulk import users from a streamed CSV or NDJSON body (admin only).
+    
+    Rows are validated against UserCreate and written in chunks; the response
+    streams one NDJSON result per row followed by a summary line. With
+    ``company_id`` the created users are also added as team members.
+    """
+    if company_id is not None:
+        from app.crud import company as company_crud
+        if not await company_crud.exists(db, company_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Company not found"
+            )
+    
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    
+    lines = iter_lines(request.stream())
+    records = iter_csv_records(lines) if format == "csv" else iter_ndjson_records(lines)
+    report = stream_user_import(
+        db,
+        records,
+        chunk_size=settings.BULK_IMPORT_CHUNK_SIZE,
+        company_id=company_id,
+        member_role=member_role
+    )
+    
+    async def render():
+        summary = None
+        async for item in report:
+            if "summary" in item:
+                summary = item["summary"]
+            yield json.dumps(item) + "\n"
+        logger.info(f"Bulk user import finished by {current_user.email}: {summary}")
+    
+    return StreamingResponse(render(), media_type="application/x-ndjson")
+
+
 @router.get("/{user_id}", response_model=UserAdminResponse)
 async def get_user(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserSnapshot = Depends(get_current_admin_user)
 ) -> Any:
     """Get user by ID (admin only)."""
     user = await user_crud.get(db, user_id)
@@ -358,7 +434,7 @@ async def update_user_role(
     user_id: UUID,
     role_update: UserRoleUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserSnapshot = Depends(get_current_admin_user)
 ) -> Any:
     """Update user role (admin only)."""
     try:
@@ -402,7 +478,7 @@ async def update_user_status(
     user_id: UUID,
     status_update: UserStatusUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserSnapshot = Depends(get_current_admin_user)
 ) -> Any:
     """Update user status (admin only)."""
     try:
@@ -427,9 +503,10 @@ async def update_user_status(
             status_update.is_active
         )
         
-        # If user is being deactivated, logout all sessions
+        # If user is being deactivated, logout all sessions and revoke their tokens
         if status_update.is_active is False or status_update.status == UserStatus.SUSPENDED:
             from app.crud import user_session
+            await revocation_list.revoke_user(user.id)
             await user_session.deactivate_user_sessions(db, user.id)
         
         logger.info(f"User status updated: {user.email} -> {status_update.status}")
@@ -450,7 +527,7 @@ async def update_user_status(
 async def delete_user(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserSnapshot = Depends(get_current_admin_user)
 ) -> None:
     """Delete user (admin only)."""
     try:
@@ -476,8 +553,9 @@ async def delete_user(
             is_active=False
         )
         
-        # Deactivate all sessions
+        # Deactivate all sessions and revoke their tokens
         from app.crud import user_session
+        await revocation_list.revoke_user(user.id)
         await user_session.deactivate_user_sessions(db, user.id)
         
         logger.info(f"User deleted: {user.email}")
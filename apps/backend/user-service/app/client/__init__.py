@@ -0,0 +1,10 @@
+"""
+Client-side helpers for services consuming SkillForge AI User Service tokens
+"""
+
+from .token_verifier import JWKSVerifier, TokenVerificationError
+
+__all__ = [
+    "JWKSVerifier",
+    "TokenVerificationError",
+]
@@ -0,0 +1,147 @@
+"""
+Local verification of user-service tokens for other SkillForge services
+
+Verifies access tokens against the public keys published at
+``/.well-known/jwks.json``, so a downstream request needs no call to the
+user service. Keys are cached for the max-age the endpoint advertises,
+revalidated with the ETag, and refetched early when a token names an
+unknown kid (key rotation), at most once per min_refresh_interval.
+
+Only PyJWT and httpx are imported, so the module can be vendored as is.
+Revocation is not visible here: downstream services rely on access
+tokens being short-lived.
+
+    verifier = JWKSVerifier("http://user-service:8000/.well-known/jwks.json")
+    claims = await verifier.verify(token)
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class TokenVerificationError(Exception):
+    """The token is invalid, expired, of the wrong type or signed by an unknown key."""
+
+
+class _Key:
+    """Verification key and the one algorithm it may be used with."""
+    
+    __slots__ = ("key", "algorithm")
+    
+    def __init__(self, key: Any, algorithm: str):
+        self.key = key
+        self.algorithm = algorithm
+
+
+class JWKSVerifier:
+    """Verifies tokens with a cached JSON Web Key Set."""
+    
+    def __init__(
+        self,
+        jwks_url: str,
+        algorithms: Sequence[str] = ("ES256", "EdDSA"),
+        default_ttl: float = 300,
+        min_refresh_interval: float = 30,
+        timeout: float = 5.0,
+        leeway: float = 0,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.jwks_url = jwks_url
+        # Never symmetric algorithms: anyone holding the public key could forge tokens
+        self.algorithms = tuple(alg for alg in algorithms if not alg.startswith("HS"))
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.leeway = leeway
+        self._client = client or httpx.AsyncClient(timeout=timeout)
+        self._owns_client = client is None
+        self._keys: Dict[str, _Key] = {}
+        self._etag: Optional[str] = None
+        self._expires_at = 0.0
+        self._fetched_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def verify(self, token: str, expected_type: Optional[str] = "access") -> Dict[str, Any]:
+        """Claims of a valid token; raises TokenVerificationError otherwise."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(str(e)) from e
+        
+        kid = header.get("kid")
+        if kid is None:
+            raise TokenVerificationError("Token has no key id")
+        key = await self.get_key(kid)
+        
+        try:
+            claims = jwt.decode(token, key.key, algorithms=[key.algorithm], leeway=self.leeway)
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(str(e)) from e
+        
+        if expected_type is not None and claims.get("type") != expected_type:
+            raise TokenVerificationError(f"Expected a {expected_type} token")
+        return claims
+    
+    async def get_key(self, kid: str) -> _Key:
+        """Key for kid, refreshing the set when it is stale or kid is new."""
+        now = time.monotonic()
+        if now >= self._expires_at or (
+            kid not in self._keys and now - self._fetched_at >= self.min_refresh_interval
+        ):
+            await self.refresh()
+        
+        key = self._keys.get(kid)
+        if key is None:
+            raise TokenVerificationError(f"Unknown key id: {kid}")
+        return key
+    
+    async def refresh(self) -> None:
+        """Fetch the key set; on failure keep serving the keys already cached."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        fetched_at = self._fetched_at
+        async with self._lock:
+            if self._fetched_at != fetched_at:
+                # Another caller refreshed while this one waited
+                return
+            try:
+                await self._fetch()
+            except (httpx.HTTPError, ValueError, jwt.PyJWTError) as e:
+                logger.warning(f"Failed to refresh JWKS from {self.jwks_url}: {str(e)}")
+                # Retry no sooner than min_refresh_interval
+                self._expires_at = time.monotonic() + self.min_refresh_interval
+            finally:
+                self._fetched_at = time.monotonic()
+    
+    async def _fetch(self) -> None:
+        headers = {"If-None-Match": self._etag} if self._etag and self._keys else {}
+        response = await self._client.get(self.jwks_url, headers=headers)
+        ttl = self._ttl(response.headers.get("cache-control"))
+        
+        if response.status_code != 304:
+            response.raise_for_status()
+            keys = {}
+            for jwk in response.json().get("keys", []):
+                if jwk.get("alg") in self.algorithms and "kid" in jwk:
+                    keys[jwk["kid"]] = _Key(jwt.PyJWK(jwk, algorithm=jwk["alg"]).key, jwk["alg"])
+            self._keys = keys
+            self._etag = response.headers.get("etag")
+        self._expires_at = time.monotonic() + ttl
+    
+    def _ttl(self, cache_control: Optional[str]) -> float:
+        match = _MAX_AGE.search(cache_control or "")
+        return float(match.group(1)) if match else self.default_ttl
+    
+    async def aclose(self) -> None:
+        """Close the HTTP client if this verifier created it."""
+        if self._owns_client:
+            await self._client.aclose()
@@ -14,22 +14,69 @@ from .database import (
     get_db_info,
     DatabaseTransaction
 )
+from .cache import (
+    TTLCache,
+    UserSnapshot,
+    user_cache,
+    invalidate_user,
+    CompanyAccess,
+    company_access_cache,
+    invalidate_company_access
+)
+from .metrics import (
+    MetricsMiddleware,
+    RequestQueryStats,
+    current_query_stats,
+    render_metrics,
+    start_metrics_server
+)
+from .profiling import (
+    QueryProfile,
+    QueryProfilerMiddleware,
+    profile_queries
+)
+from .rate_limit import (
+    RateLimitResult,
+    RateLimitBackend,
+    InMemoryRateLimitBackend,
+    RedisRateLimitBackend
+)
+from .revocation import (
+    Revocation,
+    RevocationBackend,
+    InMemoryRevocationBackend,
+    RedisRevocationBackend,
+    RevocationList,
+    revocation_list
+)
 from .security import (
     create_access_token,
     create_refresh_token,
     create_email_verification_token,
     create_password_reset_token,
     verify_token,
+    decode_token,
+    token_digest,
+    verified_token_cache,
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    password_hasher,
+    PasswordHasher,
+    PasswordHashingBusyError,
     generate_random_password,
     generate_api_key,
     Permissions,
     ROLE_PERMISSIONS,
+    PermissionSet,
+    ROLE_PERMISSION_SETS,
+    get_permission_set,
     get_user_permissions,
     check_permission,
     add_security_headers,
     rate_limiter,
+    RateLimiter,
     sanitize_input,
     validate_email_format,
     validate_password_strength
@@ -50,22 +97,69 @@ __all__ = [
     "get_db_info",
     "DatabaseTransaction",
     
+    # Cache
+    "TTLCache",
+    "UserSnapshot",
+    "user_cache",
+    "invalidate_user",
+    "CompanyAccess",
+    "company_access_cache",
+    "invalidate_company_access",
+    
+    # Metrics
+    "MetricsMiddleware",
+    "RequestQueryStats",
+    "current_query_stats",
+    "render_metrics",
+    "start_metrics_server",
+    
+    # Profiling
+    "QueryProfile",
+    "QueryProfilerMiddleware",
+    "profile_queries",
+    
+    # Rate Limiting
+    "RateLimitResult",
+    "RateLimitBackend",
+    "InMemoryRateLimitBackend",
+    "RedisRateLimitBackend",
+    
+    # Token Revocation
+    "Revocation",
+    "RevocationBackend",
+    "InMemoryRevocationBackend",
+    "RedisRevocationBackend",
+    "RevocationList",
+    "revocation_list",
+    
     # Security
     "create_access_token",
     "create_refresh_token", 
     "create_email_verification_token",
     "create_password_reset_token",
     "verify_token",
+    "decode_token",
+    "token_digest",
+    "verified_token_cache",
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "password_hasher",
+    "PasswordHasher",
+    "PasswordHashingBusyError",
     "generate_random_password",
     "generate_api_key",
     "Permissions",
     "ROLE_PERMISSIONS",
+    "PermissionSet",
+    "ROLE_PERMISSION_SETS",
+    "get_permission_set",
     "get_user_permissions",
     "check_permission",
     "add_security_headers",
     "rate_limiter",
+    "RateLimiter",
     "sanitize_input",
     "validate_email_format",
     "validate_password_strength",
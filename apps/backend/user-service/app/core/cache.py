@@ -0,0 +1,204 @@
+"""
+In-process caches for SkillForge AI User Service
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import get_settings
+from app.core.metrics import CACHE_LOOKUPS
+
+settings = get_settings()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+    
+    def __init__(self, max_size: int = 1024, ttl: float = 60, name: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        # Named caches also report lookups to Prometheus
+        self._hit_counter = CACHE_LOOKUPS.labels(cache=name, result="hit") if name else None
+        self._miss_counter = CACHE_LOOKUPS.labels(cache=name, result="miss") if name else None
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry, counting the lookup as a hit or miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                if self._miss_counter is not None:
+                    self._miss_counter.inc()
+                return default
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            if self._hit_counter is not None:
+                self._hit_counter.inc()
+            return entry[1]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used beyond max_size."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches predicate; O(n), for rare bulk changes."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Minimal authentication view of a user, safe to cache across requests."""
+    
+    id: UUID
+    email: str
+    role: str
+    is_active: bool
+    is_verified: bool
+    is_superuser: bool
+    
+    @classmethod
+    def from_user(cls, user: Any) -> "UserSnapshot":
+        """Build a snapshot from a User row."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            is_verified=getattr(user, "is_verified", getattr(user, "is_email_verified", False)),
+            is_superuser=getattr(user, "is_superuser", False),
+        )
+
+
+# Per-process cache of user auth snapshots keyed by user id
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL,
+    name="user"
+)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    """Forget the cached snapshot after a change to a user's auth state."""
+    user_cache.invalidate(user_id)
+
+
+@dataclass(frozen=True)
+class CompanyAccess:
+    """Authorization decision for a (user, company) pair, safe to cache across requests."""
+    
+    company_id: UUID
+    user_id: UUID
+    company_active: bool
+    is_owner: bool
+    member_id: Optional[UUID] = None
+    role: Optional[str] = None
+    # Bitmask of the member's per-company grants (see PermissionSet)
+    permissions: int = 0
+    
+    @property
+    def allowed(self) -> bool:
+        """Whether the user may access the company at all."""
+        return self.company_active and (self.is_owner or self.member_id is not None)
+    
+    @property
+    def can_manage_members(self) -> bool:
+        """Whether the user may invite, update or remove members."""
+        return self.allowed and (self.is_owner or self.role in ("admin", "manager"))
+    
+    @classmethod
+    def build(cls, company: Any, member: Optional[Any], user_id: UUID) -> "CompanyAccess":
+        """Build a decision from a company row and the user's active membership, if any."""
+        # app.core.security caches verified tokens here, so it is imported lazily
+        from app.core.security import PermissionSet
+        
+        return cls(
+            company_id=company.id,
+            user_id=user_id,
+            company_active=company.is_active,
+            is_owner=getattr(company, "owner_id", None) == user_id,
+            member_id=member.id if member is not None else None,
+            role=member.role if member is not None else None,
+            permissions=PermissionSet.from_names(getattr(member, "permissions", None)).mask,
+        )
+
+
+# Per-process cache of company access decisions keyed by (user_id, company_id);
+# the short TTL bounds staleness across worker processes
+company_access_cache = TTLCache(
+    max_size=settings.COMPANY_ACCESS_CACHE_MAX_SIZE,
+    ttl=settings.COMPANY_ACCESS_CACHE_TTL,
+    name="company_access"
+)
+
+# Session.info key of the request-scoped decision cache
+REQUEST_ACCESS_KEY = "company_access"
+
+
+def invalidate_company_access(
+    company_id: UUID,
+    user_id: Optional[UUID] = None,
+    db: Optional[Any] = None
+) -> None:
+    """Forget access decisions for one member, or for every user when user_id is None.
+    
+    Pass the session to also clear the request-scoped copies it holds.
+    """
+    if user_id is not None:
+        company_access_cache.invalidate((user_id, company_id))
+    else:
+        company_access_cache.invalidate_where(lambda key: key[1] == company_id)
+    
+    if db is not None:
+        request_cache = db.info.get(REQUEST_ACCESS_KEY, {})
+        for key in list(request_cache):
+            if key[1] == company_id and (user_id is None or key[0] == user_id):
+                del request_cache[key]
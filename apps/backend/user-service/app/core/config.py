@@ -20,10 +20,32 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = Field(default_factory=lambda: secrets.token_urlsafe(32), env="SECRET_KEY")
-    ALGORITHM: str = Field(default="HS256", env="ALGORITHM")
+    ALGORITHM: str = Field(default="HS256", env="ALGORITHM")  # HS256 (SECRET_KEY), ES256, EdDSA
+    JWT_KEYS_DIR: Optional[str] = Field(default=None, env="JWT_KEYS_DIR")  # <kid>.pem files; required for ES256/EdDSA outside development
+    JWT_ACTIVE_KID: Optional[str] = Field(default=None, env="JWT_ACTIVE_KID")  # signing key; others only verify
+    JWT_ACCEPT_HS256: bool = Field(default=False, env="JWT_ACCEPT_HS256")  # accept SECRET_KEY tokens while migrating
+    JWKS_CACHE_MAX_AGE: int = Field(default=300, env="JWKS_CACHE_MAX_AGE")  # seconds
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, env="REFRESH_TOKEN_EXPIRE_DAYS")
     
+    # Password Hashing
+    PASSWORD_HASH_EXECUTOR: str = Field(default="thread", env="PASSWORD_HASH_EXECUTOR")  # thread, process
+    PASSWORD_HASH_WORKERS: int = Field(default=4, env="PASSWORD_HASH_WORKERS")
+    PASSWORD_HASH_MAX_QUEUE: int = Field(default=32, env="PASSWORD_HASH_MAX_QUEUE")
+    
+    # Auth Cache
+    USER_CACHE_TTL: int = Field(default=60, env="USER_CACHE_TTL")  # seconds
+    USER_CACHE_MAX_SIZE: int = Field(default=10000, env="USER_CACHE_MAX_SIZE")
+    COMPANY_ACCESS_CACHE_TTL: int = Field(default=30, env="COMPANY_ACCESS_CACHE_TTL")  # seconds
+    COMPANY_ACCESS_CACHE_MAX_SIZE: int = Field(default=50000, env="COMPANY_ACCESS_CACHE_MAX_SIZE")
+    TOKEN_CACHE_MAX_SIZE: int = Field(default=10000, env="TOKEN_CACHE_MAX_SIZE")  # verified tokens; 0 disables
+    
+    # Bulk Import
+    BULK_IMPORT_CHUNK_SIZE: int = Field(default=500, env="BULK_IMPORT_CHUNK_SIZE")
+    
+    # Batch Lookup
+    USER_BATCH_MAX_IDS: int = Field(default=100, env="USER_BATCH_MAX_IDS")  # ids per /users/public/batch request
+    
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = Field(
         default=["http://localhost:3000", "http://localhost:8080"],
@@ -45,6 +67,14 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = Field(default="localhost", env="POSTGRES_HOST")
     POSTGRES_PORT: int = Field(default=5432, env="POSTGRES_PORT")
     
+    # Database Connection Pool
+    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, env="DB_POOL_TIMEOUT")  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = Field(default=1800, env="DB_POOL_RECYCLE")  # seconds, -1 disables
+    DB_POOL_PRE_PING: str = Field(default="idle", env="DB_POOL_PRE_PING")  # always, idle, never
+    DB_POOL_PRE_PING_IDLE: int = Field(default=60, env="DB_POOL_PRE_PING_IDLE")  # seconds idle before an "idle" ping
+    
     # Redis Configuration
     REDIS_URL: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
     CACHE_TTL: int = Field(default=300, env="CACHE_TTL")  # 5 minutes
@@ -57,6 +87,36 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = Field(default=None, env="SMTP_PASSWORD")
     EMAILS_FROM_EMAIL: Optional[EmailStr] = Field(default=None, env="EMAILS_FROM_EMAIL")
     EMAILS_FROM_NAME: Optional[str] = Field(default=None, env="EMAILS_FROM_NAME")
+    SMTP_TIMEOUT: float = Field(default=10.0, env="SMTP_TIMEOUT")  # seconds
+    
+    # Email Delivery
+    EMAIL_POOL_SIZE: int = Field(default=2, env="EMAIL_POOL_SIZE")  # persistent SMTP connections per process
+    EMAIL_CONNECTION_MAX_IDLE: int = Field(default=60, env="EMAIL_CONNECTION_MAX_IDLE")  # seconds before a NOOP check
+    EMAIL_WORKERS: int = Field(default=2, env="EMAIL_WORKERS")
+    EMAIL_QUEUE_SIZE: int = Field(default=1000, env="EMAIL_QUEUE_SIZE")
+    EMAIL_BATCH_SIZE: int = Field(default=50, env="EMAIL_BATCH_SIZE")  # messages per connection checkout
+    EMAIL_MAX_ATTEMPTS: int = Field(default=3, env="EMAIL_MAX_ATTEMPTS")
+    EMAIL_RETRY_BACKOFF: float = Field(default=1.0, env="EMAIL_RETRY_BACKOFF")  # seconds, doubled per attempt
+    EMAIL_TEMPLATE_BYTECODE_CACHE: bool = Field(default=True, env="EMAIL_TEMPLATE_BYTECODE_CACHE")
+    EMAIL_TEMPLATE_CACHE_DIR: Optional[str] = Field(default=None, env="EMAIL_TEMPLATE_CACHE_DIR")  # default: system temp dir
+    
+    # Background Tasks
+    TASK_BACKEND: str = Field(default="asyncio", env="TASK_BACKEND")  # asyncio, celery, inline
+    TASK_WORKERS: int = Field(default=4, env="TASK_WORKERS")  # asyncio backend workers
+    TASK_QUEUE_SIZE: int = Field(default=10000, env="TASK_QUEUE_SIZE")
+    TASK_IDEMPOTENCY_TTL: int = Field(default=300, env="TASK_IDEMPOTENCY_TTL")  # seconds duplicates are suppressed
+    TASK_MAX_RETRIES: int = Field(default=3, env="TASK_MAX_RETRIES")  # celery backend
+    CELERY_BROKER_URL: Optional[str] = Field(default=None, env="CELERY_BROKER_URL")  # defaults to REDIS_URL
+    
+    # Maintenance
+    MAINTENANCE_ENABLED: bool = Field(default=False, env="MAINTENANCE_ENABLED")  # run the scheduler in the API process
+    MAINTENANCE_TICK_SECONDS: float = Field(default=30.0, env="MAINTENANCE_TICK_SECONDS")
+    MAINTENANCE_BATCH_SIZE: int = Field(default=1000, env="MAINTENANCE_BATCH_SIZE")  # rows per statement
+    MAINTENANCE_BATCH_PAUSE: float = Field(default=0.1, env="MAINTENANCE_BATCH_PAUSE")  # seconds between batches
+    MAINTENANCE_MAX_BATCHES: Optional[int] = Field(default=None, env="MAINTENANCE_MAX_BATCHES")  # per job run
+    MAINTENANCE_LOCK_ID: int = Field(default=72173001, env="MAINTENANCE_LOCK_ID")  # PostgreSQL advisory lock key
+    SESSION_CLEANUP_INTERVAL: int = Field(default=3600, env="SESSION_CLEANUP_INTERVAL")  # seconds
+    SUBSCRIPTION_EXPIRY_INTERVAL: int = Field(default=300, env="SUBSCRIPTION_EXPIRY_INTERVAL")  # seconds
     
     # First Superuser
     FIRST_SUPERUSER: Optional[EmailStr] = Field(default=None, env="FIRST_SUPERUSER")
@@ -68,6 +128,14 @@ class Settings(BaseSettings):
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
+    RATE_LIMIT_BACKEND: str = Field(default="memory", env="RATE_LIMIT_BACKEND")  # memory, redis
+    RATE_LIMIT_MAX_KEYS: int = Field(default=100000, env="RATE_LIMIT_MAX_KEYS")
+    RATE_LIMIT_SWEEP_INTERVAL: int = Field(default=60, env="RATE_LIMIT_SWEEP_INTERVAL")  # seconds
+    
+    # Token Revocation
+    REVOCATION_BACKEND: str = Field(default="memory", env="REVOCATION_BACKEND")  # memory, redis
+    REVOCATION_SWEEP_INTERVAL: int = Field(default=60, env="REVOCATION_SWEEP_INTERVAL")  # seconds
+    REVOCATION_EPOCH_TTL: int = Field(default=30 * 24 * 3600, env="REVOCATION_EPOCH_TTL")  # longest token lifetime (remember-me refresh)
     
     # File Upload
     MAX_FILE_SIZE_MB: int = Field(default=10, env="MAX_FILE_SIZE_MB")
@@ -79,7 +147,10 @@ class Settings(BaseSettings):
     
     # Monitoring
     ENABLE_METRICS: bool = Field(default=True, env="ENABLE_METRICS")
-    METRICS_PORT: int = Field(default=9090, env="METRICS_PORT")
+    METRICS_PORT: int = Field(default=9090, env="METRICS_PORT")  # 0 serves METRICS_PATH on the app instead
+    METRICS_PATH: str = Field(default="/metrics", env="METRICS_PATH")
+    SQL_PROFILING: bool = Field(default=True, env="SQL_PROFILING")  # never active in production
+    SQL_PROFILING_REPEAT_THRESHOLD: int = Field(default=3, env="SQL_PROFILING_REPEAT_THRESHOLD")
     
     # Testing
     TEST_DATABASE_URL: Optional[str] = Field(default=None, env="TEST_DATABASE_URL")
@@ -127,6 +198,11 @@ class Settings(BaseSettings):
         """Check if running in testing environment."""
         return self.ENVIRONMENT.lower() == "testing"
     
+    @property
+    def sql_profiling_enabled(self) -> bool:
+        """Check if per-request SQL profiling is active."""
+        return self.SQL_PROFILING and not self.is_production
+    
     class Config:
         """Pydantic configuration."""
         env_file = ".env"
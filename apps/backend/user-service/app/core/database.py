@@ -3,13 +3,24 @@ Database configuration and session management for SkillForge AI User Service
 """
 
 import asyncio
+import time
 from typing import AsyncGenerator, Optional
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncEngine, async_sessionmaker
-from sqlalchemy.pool import NullPool
-from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy import event, exc, text
 import logging
 
 from app.core.config import get_settings
+from app.core.metrics import (
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CHECKOUT_DURATION,
+    DB_POOL_CONNECTION_AGE,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_CHECKED_OUT,
+    record_query
+)
+from app.core.profiling import record_statement
 from app.models.base import SQLModel
 
 logger = logging.getLogger(__name__)
@@ -29,13 +40,23 @@ def create_engine() -> AsyncEngine:
         f"{settings.POSTGRES_DB}"
     )
     
-    return create_async_engine(
+    if settings.is_testing:
+        pool_options = {"poolclass": NullPool}
+    else:
+        pool_options = {
+            "poolclass": InstrumentedQueuePool if settings.ENABLE_METRICS else AsyncAdaptedQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+        }
+    
+    new_engine = create_async_engine(
         database_url,
         echo=settings.is_development and not settings.is_testing,
         future=True,
-        poolclass=NullPool if settings.is_testing else None,
-        pool_pre_ping=True,
-        pool_recycle=300,  # 5 minutes
+        **pool_options,
         json_serializer=None,  # Use default JSON serializer
         # Use separate connection parameters to avoid URL parsing issues
         connect_args={
@@ -47,6 +68,114 @@ def create_engine() -> AsyncEngine:
             "command_timeout": 10,
         }
     )
+    
+    if settings.DB_POOL_PRE_PING == "idle":
+        enable_idle_pre_ping(new_engine, settings.DB_POOL_PRE_PING_IDLE)
+    if settings.ENABLE_METRICS:
+        instrument_pool(new_engine)
+    if settings.ENABLE_METRICS or settings.sql_profiling_enabled:
+        instrument_queries(new_engine)
+    return new_engine
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def enable_idle_pre_ping(engine: AsyncEngine, idle_seconds: float) -> None:
+    """Ping only connections idle longer than idle_seconds on checkout.
+    
+    Avoids pool_pre_ping's round trip on every checkout while still catching
+    connections dropped by the server or proxy while idle.
+    """
+    sync_engine = engine.sync_engine
+    
+    @event.listens_for(sync_engine, "checkout")
+    def ping_idle_connection(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries with a fresh one
+            raise exc.DisconnectionError(f"Idle connection failed ping: {e}") from e
+    
+    @event.listens_for(sync_engine, "checkin")
+    def mark_checked_in(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Record pool checkouts, hold time and connection age as Prometheus metrics."""
+    sync_engine = engine.sync_engine
+    
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        DB_POOL_CONNECTIONS.labels(event="connect").inc()
+    
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.monotonic()
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_CHECKED_OUT.inc()
+    
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        now = time.monotonic()
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            DB_POOL_CHECKOUT_DURATION.observe(now - checked_out_at)
+            DB_POOL_CHECKED_OUT.dec()
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            DB_POOL_CONNECTION_AGE.observe(now - connected_at)
+    
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_CONNECTIONS.labels(event="invalidate").inc()
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    # setdefault keeps the first start time when listeners are attached twice
+    conn.info.setdefault("query_started_at", time.perf_counter())
+
+
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started_at", None)
+    if started is None:
+        return  # already recorded by another copy of this listener
+    duration = time.perf_counter() - started
+    record_query(duration)
+    record_statement(statement, duration)
+
+
+def _clear_query_timer(exception_context):
+    if exception_context.connection is not None:
+        exception_context.connection.info.pop("query_started_at", None)
+
+
+def instrument_queries(target) -> None:
+    """Time every SQL statement for metrics and the query profiler.
+    
+    target may be an AsyncEngine, an Engine, or the Engine class to cover
+    every engine; attaching to the same target twice is a no-op.
+    """
+    if isinstance(target, AsyncEngine):
+        target = target.sync_engine
+    if event.contains(target, "before_cursor_execute", _start_query_timer):
+        return
+    event.listen(target, "before_cursor_execute", _start_query_timer)
+    event.listen(target, "after_cursor_execute", _stop_query_timer)
+    event.listen(target, "handle_error", _clear_query_timer)
 
 
 def get_engine() -> AsyncEngine:
@@ -253,12 +382,18 @@ async def get_db_info() -> dict:
             
             # Get connection pool info
             pool = engine.pool
-            pool_info = {
-                "size": pool.size(),
-                "checked_in": pool.checkedin(),
-                "checked_out": pool.checkedout(),
-                "overflow": pool.overflow(),
-            }
+            pool_info = {"class": type(pool).__name__, "status": pool.status()}
+            if isinstance(pool, AsyncAdaptedQueuePool):
+                pool_info.update({
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                    "max_overflow": settings.DB_MAX_OVERFLOW,
+                    "timeout": settings.DB_POOL_TIMEOUT,
+                    "recycle": settings.DB_POOL_RECYCLE,
+                    "pre_ping": settings.DB_POOL_PRE_PING,
+                })
             
             return {
                 "status": "healthy",
@@ -0,0 +1,253 @@
+"""
+Token signing keys for SkillForge AI User Service
+
+Tokens are signed with ES256 (P-256) or EdDSA (Ed25519) keys identified by
+a ``kid`` header, so other services verify them against the public keys
+served at /.well-known/jwks.json instead of sharing a secret. HS256 with
+SECRET_KEY is the default, for single-service deployments and until keys
+are configured.
+
+Keys are PEM files named ``<kid>.pem`` in JWT_KEYS_DIR; JWT_ACTIVE_KID
+picks the one that signs and every other key only verifies. To rotate:
+
+1. add the new key file; it is published in the JWKS but does not sign yet
+2. once verifiers have refreshed their JWKS (JWKS_CACHE_MAX_AGE), point
+   JWT_ACTIVE_KID at it
+3. remove the old file after the longest token lifetime has passed
+
+Without JWT_KEYS_DIR a key is generated at startup in development and
+testing only: tokens would not survive restarts nor verify on other
+workers, so any other environment refuses to start.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("ES256", "EdDSA")
+
+
+class KeyConfigurationError(ValueError):
+    """Signing keys are missing, unreadable or of an unsupported type."""
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """One asymmetric key; private_key is None for keys that only verify."""
+    
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any = None
+    
+    @classmethod
+    def from_private_key(cls, kid: str, private_key: Any) -> "SigningKey":
+        return cls(
+            kid=kid,
+            algorithm=_algorithm_for(private_key),
+            public_key=private_key.public_key(),
+            private_key=private_key,
+        )
+    
+    @classmethod
+    def from_pem(cls, kid: str, pem: bytes) -> "SigningKey":
+        """Load a private key, or a public key that will only verify."""
+        if b"PRIVATE KEY" in pem:
+            return cls.from_private_key(kid, serialization.load_pem_private_key(pem, password=None))
+        public_key = serialization.load_pem_public_key(pem)
+        return cls(kid=kid, algorithm=_algorithm_for(public_key), public_key=public_key)
+    
+    @classmethod
+    def generate(cls, algorithm: str = "ES256", kid: Optional[str] = None) -> "SigningKey":
+        """New random key; kid defaults to the RFC 7638 thumbprint."""
+        if algorithm == "ES256":
+            private_key = ec.generate_private_key(ec.SECP256R1())
+        elif algorithm == "EdDSA":
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            raise KeyConfigurationError(f"Unsupported signing algorithm: {algorithm}")
+        key = cls.from_private_key(kid or "", private_key)
+        return key if kid else replace(key, kid=key.thumbprint())
+    
+    def public_jwk(self) -> Dict[str, Any]:
+        """Public half as a JWK."""
+        if self.algorithm == "ES256":
+            jwk = ECAlgorithm.to_jwk(self.public_key, as_dict=True)
+        else:
+            jwk = OKPAlgorithm.to_jwk(self.public_key, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+    
+    def thumbprint(self) -> str:
+        """RFC 7638 JWK thumbprint, base64url without padding."""
+        jwk = self.public_jwk()
+        members = ("crv", "kty", "x", "y") if jwk["kty"] == "EC" else ("crv", "kty", "x")
+        canonical = json.dumps({name: jwk[name] for name in members}, separators=(",", ":"), sort_keys=True)
+        digest = hashlib.sha256(canonical.encode()).digest()
+        return jwt.utils.base64url_encode(digest).decode()
+
+
+def _algorithm_for(key: Any) -> str:
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if not isinstance(key.curve, ec.SECP256R1):
+            raise KeyConfigurationError(f"Unsupported EC curve: {key.curve.name}")
+        return "ES256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise KeyConfigurationError(f"Unsupported key type: {type(key).__name__}")
+
+
+class KeyRing:
+    """The signing key plus every key whose tokens are still accepted.
+    
+    secret is an HS256 key: with no asymmetric keys it signs and verifies
+    everything (and the JWKS is empty); otherwise it only verifies tokens
+    without a kid, issued before migrating off HS256.
+    """
+    
+    def __init__(
+        self,
+        keys: Optional[List[SigningKey]] = None,
+        active_kid: Optional[str] = None,
+        secret: Optional[str] = None
+    ):
+        self._keys: Dict[str, SigningKey] = {}
+        self._active: Optional[SigningKey] = None
+        self.secret = secret
+        self._lock = threading.Lock()
+        self._jwks_cache: Optional[tuple] = None
+        for key in keys or []:
+            self.add(key)
+        if active_kid is not None:
+            self.activate(active_kid)
+    
+    @property
+    def active(self) -> Optional[SigningKey]:
+        """Key that signs new tokens; None in HS256 mode."""
+        return self._active
+    
+    def add(self, key: SigningKey) -> None:
+        """Publish and accept a key without signing with it yet."""
+        with self._lock:
+            self._keys[key.kid] = key
+            self._jwks_cache = None
+    
+    def activate(self, kid: str) -> None:
+        """Sign new tokens with a key already on the ring."""
+        key = self._keys.get(kid)
+        if key is None:
+            raise KeyConfigurationError(f"Unknown signing key: {kid}")
+        if key.private_key is None:
+            raise KeyConfigurationError(f"Signing key {kid} has no private key")
+        self._active = key
+    
+    def remove(self, kid: str) -> None:
+        """Stop accepting tokens signed with a retired key."""
+        if self._active is not None and self._active.kid == kid:
+            raise KeyConfigurationError(f"Cannot remove the active signing key {kid}")
+        with self._lock:
+            self._keys.pop(kid, None)
+            self._jwks_cache = None
+    
+    def rotate(self, key: SigningKey) -> None:
+        """Add a key and sign with it at once; the previous key keeps verifying."""
+        self.add(key)
+        self.activate(key.kid)
+    
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Sign claims with the active key."""
+        if self._active is None:
+            return jwt.encode(claims, self.secret, algorithm="HS256")
+        return jwt.encode(
+            claims,
+            self._active.private_key,
+            algorithm=self._active.algorithm,
+            headers={"kid": self._active.kid}
+        )
+    
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify a token against the key named by its kid; raises jwt.PyJWTError."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self.secret is None:
+                raise jwt.InvalidTokenError("Token has no key id")
+            return jwt.decode(token, self.secret, algorithms=["HS256"])
+        
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown key id: {kid}")
+        # Pinning the algorithm to the key rules out algorithm confusion
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+    
+    def jwks(self) -> Dict[str, Any]:
+        """Public keys as a JWK Set."""
+        return json.loads(self.jwks_document()[0])
+    
+    def jwks_document(self) -> tuple:
+        """Serialized JWK Set and its ETag, rebuilt only when the keys change."""
+        cached = self._jwks_cache
+        if cached is None:
+            with self._lock:
+                body = json.dumps(
+                    {"keys": [key.public_jwk() for key in self._keys.values()]},
+                    separators=(",", ":")
+                ).encode()
+                cached = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+                self._jwks_cache = cached
+        return cached
+    
+    def __contains__(self, kid: str) -> bool:
+        return kid in self._keys
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def load_keys(directory: str) -> List[SigningKey]:
+    """Every ``<kid>.pem`` in a directory, ordered by kid."""
+    path = Path(directory)
+    if not path.is_dir():
+        raise KeyConfigurationError(f"JWT_KEYS_DIR is not a directory: {directory}")
+    return [SigningKey.from_pem(file.stem, file.read_bytes()) for file in sorted(path.glob("*.pem"))]
+
+
+def create_key_ring() -> KeyRing:
+    """Build the key ring configured by ALGORITHM and JWT_KEYS_DIR."""
+    if settings.ALGORITHM == "HS256":
+        return KeyRing(secret=settings.SECRET_KEY)
+    if settings.ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+        raise KeyConfigurationError(f"Unsupported ALGORITHM: {settings.ALGORITHM}")
+    
+    secret = settings.SECRET_KEY if settings.JWT_ACCEPT_HS256 else None
+    if settings.JWT_KEYS_DIR:
+        keys = load_keys(settings.JWT_KEYS_DIR)
+        active_kid = settings.JWT_ACTIVE_KID
+        if active_kid is None:
+            private = [key.kid for key in keys if key.private_key is not None]
+            if len(private) != 1:
+                raise KeyConfigurationError("Set JWT_ACTIVE_KID unless JWT_KEYS_DIR holds exactly one private key")
+            active_kid = private[0]
+        return KeyRing(keys, active_kid=active_kid, secret=secret)
+    
+    if not (settings.is_development or settings.is_testing):
+        raise KeyConfigurationError(f"JWT_KEYS_DIR must be set to sign with {settings.ALGORITHM}")
+    key = SigningKey.generate(settings.ALGORITHM)
+    logger.warning("JWT_KEYS_DIR is not set; signing with a key generated at startup")
+    return KeyRing([key], active_kid=key.kid, secret=secret)
+
+
+# Global key ring instance
+signing_keys = create_key_ring()
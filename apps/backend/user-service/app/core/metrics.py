@@ -0,0 +1,267 @@
+"""
+Prometheus metrics for SkillForge AI User Service
+
+Multi-worker deployments must set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory before the workers start; every worker then writes its
+samples there and any worker can serve the aggregated view.
+"""
+
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+logger = logging.getLogger(__name__)
+
+# Route label for requests that matched no route, keeps label cardinality bounded
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10)
+
+# HTTP requests
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Database queries
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Latency of individual SQL statements",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_QUERY_TIME_PER_REQUEST = Histogram(
+    "db_query_time_per_request_seconds",
+    "Total SQL time spent per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Password hashing
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent in bcrypt per operation",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2.5),
+)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time hashing jobs wait for a worker",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Hashing jobs shed because the worker queue was full",
+)
+
+# Caches; hit ratio is rate(hit) / rate(hit + miss)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "In-process cache lookups",
+    ["cache", "result"],
+)
+
+# Token revocation
+TOKEN_REVOCATIONS = Counter(
+    "token_revocations_total",
+    "Tokens revoked by this instance, singly (jti) or per user",
+    ["kind"],
+)
+REVOKED_TOKEN_REJECTIONS = Counter(
+    "revoked_token_rejections_total",
+    "Token verifications rejected because the token was revoked",
+)
+
+# Email delivery
+EMAIL_DELIVERIES = Counter(
+    "email_deliveries_total",
+    "Outgoing emails by outcome (sent, failed, retried, dropped)",
+    ["result"],
+)
+EMAIL_QUEUE_DEPTH = Gauge(
+    "email_queue_depth",
+    "Emails waiting for a dispatcher worker",
+    multiprocess_mode="livesum",
+)
+
+# Maintenance jobs
+MAINTENANCE_ROWS = Counter(
+    "maintenance_rows_total",
+    "Rows deleted or updated by maintenance jobs",
+    ["job"],
+)
+MAINTENANCE_DURATION = Histogram(
+    "maintenance_duration_seconds",
+    "Duration of one maintenance job run",
+    ["job"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+)
+
+# Database connection pool
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time a connection stays checked out of the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CONNECTION_AGE = Histogram(
+    "db_pool_connection_age_seconds",
+    "Age of pooled connections when they are returned",
+    buckets=(1, 10, 30, 60, 300, 600, 1200, 1800, 3600, 7200),
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool",
+)
+DB_POOL_CONNECTIONS = Counter(
+    "db_pool_connections_total",
+    "Connections opened or invalidated by the pool",
+    ["event"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+
+
+@dataclass
+class RequestQueryStats:
+    """SQL statements executed while handling one request."""
+    
+    count: int = 0
+    duration: float = 0.0
+
+
+_request_queries: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_queries", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """Query stats of the request being handled, if any."""
+    return _request_queries.get()
+
+
+def record_query(duration: float) -> None:
+    """Record one SQL statement globally and against the current request."""
+    DB_QUERY_DURATION.observe(duration)
+    stats = _request_queries.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
+
+
+def route_template(scope) -> str:
+    """Matched route path such as /api/v1/users/{user_id}, never the raw path."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and SQL usage per route."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        method = scope["method"]
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=method)
+        stats = RequestQueryStats()
+        token = _request_queries.set(stats)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            in_progress.dec()
+            _request_queries.reset(token)
+            
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(duration)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+            DB_QUERY_TIME_PER_REQUEST.labels(route).observe(stats.duration)
+
+
+def is_multiprocess() -> bool:
+    """Whether samples are shared across worker processes."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose; aggregates all workers in multiprocess mode."""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Metrics in the Prometheus text format with their content type."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> bool:
+    """Serve metrics on a separate port.
+    
+    With several workers only the first to bind the port serves it, which is
+    enough in multiprocess mode since each worker exposes the aggregate.
+    """
+    try:
+        start_http_server(port, registry=metrics_registry())
+    except OSError as e:
+        logger.info(f"Metrics port {port} not bound by this worker: {str(e)}")
+        return False
+    logger.info(f"Serving metrics on port {port}")
+    return True
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared multiprocess files."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,123 @@
+"""
+SQL query profiling for SkillForge AI User Service
+Attributes statement counts, DB time and repeated statements to each request
+"""
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions differing only in values compare equal."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed within one profiling scope."""
+    
+    count: int = 0
+    duration: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    fingerprint_durations: Dict[str, float] = field(default_factory=dict)
+    
+    def record(self, statement: str, duration: float) -> None:
+        """Add one executed statement."""
+        key = fingerprint(statement)
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[key] += 1
+        self.fingerprint_durations[key] = self.fingerprint_durations.get(key, 0.0) + duration
+    
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        """Fingerprints executed at least threshold times, most frequent first."""
+        return [(key, count) for key, count in self.fingerprints.most_common() if count >= threshold]
+    
+    def summary(self, threshold: int = 2) -> str:
+        """Human readable report for logs and assertion messages."""
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f}ms"]
+        for key, count in self.repeated(threshold):
+            lines.append(f"  {count}x {key}")
+        return "\n".join(lines)
+
+
+# Innermost profile last; every active profile sees each statement
+_active_profiles: ContextVar[Tuple[QueryProfile, ...]] = ContextVar("active_profiles", default=())
+
+
+def record_statement(statement: str, duration: float) -> None:
+    """Attribute a statement to every active profile."""
+    for profile in _active_profiles.get():
+        profile.record(statement, duration)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Collect the statements executed inside the block."""
+    profile = QueryProfile()
+    token = _active_profiles.set(_active_profiles.get() + (profile,))
+    try:
+        yield profile
+    finally:
+        _active_profiles.reset(token)
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware reporting each request's SQL usage in headers and logs.
+    
+    Meant for non-production use; repeated fingerprints at or above
+    repeat_threshold are flagged as likely N+1 patterns.
+    """
+    
+    def __init__(self, app, repeat_threshold: int = 3):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with profile_queries() as profile:
+            async def send_with_profile(message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(profile.count)
+                    headers["X-DB-Query-Time"] = f"{profile.duration * 1000:.2f}"
+                    headers["X-DB-Repeated-Queries"] = str(len(profile.repeated(self.repeat_threshold)))
+                await send(message)
+            
+            await self.app(scope, receive, send_with_profile)
+        
+        if not profile.count:
+            return
+        route = route_template(scope)
+        repeated = profile.repeated(self.repeat_threshold)
+        if repeated:
+            logger.warning(
+                f"Possible N+1 in {scope['method']} {route}: "
+                f"{profile.summary(self.repeat_threshold)}"
+            )
+        else:
+            logger.info(f"{scope['method']} {route}: {profile.summary(self.repeat_threshold)}")
@@ -0,0 +1,216 @@
+"""
+Rate limiting for SkillForge AI User Service
+Sliding-window counters over pluggable in-memory and Redis backends
+"""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a single rate limit check."""
+    
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int = 0
+
+
+def _sliding_window(
+    previous: int,
+    current: int,
+    elapsed: float,
+    limit: int,
+    window: int
+) -> RateLimitResult:
+    """Evaluate one hit against the weighted previous + current window counts.
+    
+    ``current`` excludes the hit being evaluated.
+    """
+    weight = max(0.0, 1.0 - elapsed / window)
+    estimated = previous * weight + current
+    
+    if estimated + 1 <= limit:
+        return RateLimitResult(
+            allowed=True,
+            limit=limit,
+            remaining=max(0, int(limit - estimated - 1)),
+        )
+    
+    # Time until the previous window's share decays enough for one more hit
+    if previous and current < limit:
+        wait = window * (1.0 - (limit - 1 - current) / previous) - elapsed
+    else:
+        wait = window - elapsed
+    return RateLimitResult(
+        allowed=False,
+        limit=limit,
+        remaining=0,
+        retry_after=max(1, math.ceil(wait)),
+    )
+
+
+class RateLimitBackend(ABC):
+    """Storage interface for rate limit counters."""
+    
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Record a hit for key and report whether it is allowed."""
+    
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Forget all hits for key."""
+    
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process backend with idle-key sweeping and a hard key cap."""
+    
+    def __init__(self, max_keys: int = 100000, sweep_interval: float = 60):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        # key -> [window_start, previous, current, expires_at], least recently used first
+        self._windows: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._next_sweep = time.monotonic() + sweep_interval
+    
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Record a hit for key and report whether it is allowed."""
+        now = time.time()
+        self._maybe_sweep(now)
+        
+        window_start = int(now // window) * window
+        entry = self._windows.get(key)
+        if entry is None:
+            entry = [window_start, 0, 0, 0.0]
+            self._windows[key] = entry
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        elif entry[0] != window_start:
+            entry[1] = entry[2] if entry[0] == window_start - window else 0
+            entry[0], entry[2] = window_start, 0
+        self._windows.move_to_end(key)
+        
+        result = _sliding_window(entry[1], entry[2], now - window_start, limit, window)
+        if result.allowed:
+            entry[2] += 1
+        entry[3] = window_start + 2 * window
+        return result
+    
+    async def reset(self, key: str) -> None:
+        """Forget all hits for key."""
+        self._windows.pop(key, None)
+    
+    def _maybe_sweep(self, now: float) -> None:
+        """Drop idle keys from the least recently used end."""
+        monotonic_now = time.monotonic()
+        if monotonic_now < self._next_sweep:
+            return
+        self._next_sweep = monotonic_now + self.sweep_interval
+        
+        while self._windows:
+            key, entry = next(iter(self._windows.items()))
+            if entry[3] > now:
+                break
+            del self._windows[key]
+    
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Backend sharing counters across processes through Redis.
+    
+    Each window is a plain counter key that expires after two windows, so
+    Redis bounds memory without explicit sweeping. Errors fail open.
+    """
+    
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "rl:"):
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+    
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Record a hit for key and report whether it is allowed."""
+        now = time.time()
+        window_start = int(now // window) * window
+        current_key = f"{self.prefix}{key}:{window_start}"
+        previous_key = f"{self.prefix}{key}:{window_start - window}"
+        
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.incr(current_key)
+                pipe.expire(current_key, 2 * window)
+                pipe.get(previous_key)
+                current, _, previous = await pipe.execute()
+            
+            result = _sliding_window(
+                int(previous or 0), int(current) - 1, now - window_start, limit, window
+            )
+            if not result.allowed:
+                # Rejected hits do not consume quota
+                await self.client.decr(current_key)
+            return result
+        except Exception as e:
+            logger.warning(f"Redis rate limit check failed, allowing request: {str(e)}")
+            return RateLimitResult(allowed=True, limit=limit, remaining=limit)
+    
+    async def reset(self, key: str) -> None:
+        """Forget all hits for key."""
+        async for redis_key in self.client.scan_iter(match=f"{self.prefix}{key}:*"):
+            await self.client.delete(redis_key)
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.client.close()
+
+
+class RateLimiter:
+    """Sliding-window rate limiter over a pluggable backend."""
+    
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self.backend = backend or InMemoryRateLimitBackend()
+    
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Record a hit and return the full result for response headers."""
+        return await self.backend.hit(key, limit, window)
+    
+    async def is_allowed(self, key: str, limit: int, window: int) -> bool:
+        """Check if request is within rate limit."""
+        return (await self.hit(key, limit, window)).allowed
+    
+    async def reset(self, key: str) -> None:
+        """Reset rate limit for key."""
+        await self.backend.reset(key)
+    
+    async def close(self) -> None:
+        """Release backend resources."""
+        await self.backend.close()
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the rate limiter configured by RATE_LIMIT_BACKEND."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RateLimiter(RedisRateLimitBackend(url=settings.REDIS_URL))
+    return RateLimiter(InMemoryRateLimitBackend(
+        max_keys=settings.RATE_LIMIT_MAX_KEYS,
+        sweep_interval=settings.RATE_LIMIT_SWEEP_INTERVAL
+    ))
+
+
+# Global rate limiter instance
+rate_limiter = create_rate_limiter()
@@ -0,0 +1,247 @@
+"""
+Token revocation for SkillForge AI User Service
+In-process denylist of revoked token ids and per-user epochs, kept in sync
+across instances through pluggable backends
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.metrics import TOKEN_REVOCATIONS, REVOKED_TOKEN_REJECTIONS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+JTI = "jti"
+USER = "user"
+
+
+@dataclass(frozen=True)
+class Revocation:
+    """One revocation: a single token (jti) or every token of a user issued before epoch."""
+    
+    kind: str
+    key: str
+    expires_at: float
+    epoch: float = 0
+    
+    def encode(self) -> str:
+        return f"{self.kind}|{self.key}|{self.epoch:.6f}|{self.expires_at:.0f}"
+    
+    @classmethod
+    def decode(cls, raw: Any) -> "Revocation":
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        kind, key, epoch, expires_at = raw.split("|")
+        return cls(kind=kind, key=key, expires_at=float(expires_at), epoch=float(epoch))
+
+
+class RevocationBackend:
+    """Shares revocations between instances."""
+    
+    async def publish(self, revocation: Revocation) -> None:
+        """Make a revocation visible to every instance."""
+    
+    async def snapshot(self) -> List[Revocation]:
+        """Revocations that have not expired yet, for a starting instance."""
+        return []
+    
+    async def listen(self, apply: Callable[[Revocation], None]) -> None:
+        """Call apply for revocations published by other instances; runs until cancelled."""
+    
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryRevocationBackend(RevocationBackend):
+    """Single-process deployments: nothing to share."""
+
+
+class RedisRevocationBackend(RevocationBackend):
+    """Backend sharing revocations through Redis.
+    
+    Live revocations live in a sorted set scored by expiry, which starting
+    instances load, and are announced on a pub/sub channel. Errors are
+    logged; the local denylist is updated regardless.
+    """
+    
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "revoked"):
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.key = prefix
+        self.channel = f"{prefix}:events"
+    
+    async def publish(self, revocation: Revocation) -> None:
+        member = revocation.encode()
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.zadd(self.key, {member: revocation.expires_at})
+                pipe.zremrangebyscore(self.key, "-inf", time.time())
+                pipe.publish(self.channel, member)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to publish token revocation: {str(e)}")
+    
+    async def snapshot(self) -> List[Revocation]:
+        try:
+            members = await self.client.zrangebyscore(self.key, time.time(), "+inf")
+        except Exception as e:
+            logger.warning(f"Failed to load token revocations: {str(e)}")
+            return []
+        return [Revocation.decode(member) for member in members]
+    
+    async def listen(self, apply: Callable[[Revocation], None]) -> None:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    apply(Revocation.decode(message["data"]))
+        finally:
+            await pubsub.close()
+    
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class RevocationList:
+    """Denylist checked on every token verification.
+    
+    Lookups are two dict probes and never leave the process. Entries expire
+    with the tokens they cover and are swept from a heap ordered by expiry.
+    """
+    
+    def __init__(self, backend: Optional[RevocationBackend] = None, sweep_interval: float = 60):
+        self.backend = backend or InMemoryRevocationBackend()
+        self.sweep_interval = sweep_interval
+        # jti -> expires_at
+        self._jtis: Dict[str, float] = {}
+        # user id -> (epoch, expires_at); tokens issued before epoch are revoked
+        self._epochs: Dict[str, Tuple[float, float]] = {}
+        self._expiry: List[Tuple[float, str, str]] = []
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._listener: Optional[asyncio.Task] = None
+    
+    def is_revoked(self, payload: Mapping[str, Any]) -> bool:
+        """Whether a decoded token has been revoked."""
+        self._maybe_sweep()
+        
+        jti = payload.get("jti")
+        revoked = jti is not None and jti in self._jtis
+        if not revoked:
+            epoch = self._epochs.get(payload.get("sub"))
+            revoked = epoch is not None and payload.get("iat", 0) < epoch[0]
+        
+        if revoked:
+            REVOKED_TOKEN_REJECTIONS.inc()
+        return revoked
+    
+    async def revoke_token(self, payload: Mapping[str, Any]) -> None:
+        """Revoke one token until it expires; tokens without a jti cannot be revoked singly."""
+        jti = payload.get("jti")
+        if jti is None:
+            return
+        await self._revoke(Revocation(kind=JTI, key=jti, expires_at=float(payload["exp"])))
+    
+    async def revoke_user(self, user_id: Any, ttl: Optional[int] = None) -> None:
+        """Revoke every token issued to a user so far.
+        
+        ttl must cover the longest-lived token that may still be out there.
+        The epoch is sub-second, like access and refresh token iat, so a
+        login right after this call is not caught by it.
+        """
+        now = time.time()
+        ttl = settings.REVOCATION_EPOCH_TTL if ttl is None else ttl
+        await self._revoke(Revocation(kind=USER, key=str(user_id), expires_at=now + ttl, epoch=now))
+    
+    async def _revoke(self, revocation: Revocation) -> None:
+        self.apply(revocation)
+        TOKEN_REVOCATIONS.labels(kind=revocation.kind).inc()
+        await self.backend.publish(revocation)
+    
+    def apply(self, revocation: Revocation) -> None:
+        """Add a revocation to the local denylist."""
+        if revocation.expires_at <= time.time():
+            return
+        if revocation.kind == JTI:
+            self._jtis[revocation.key] = revocation.expires_at
+        elif revocation.kind == USER:
+            current = self._epochs.get(revocation.key)
+            if current is not None and current[0] >= revocation.epoch:
+                return
+            self._epochs[revocation.key] = (revocation.epoch, revocation.expires_at)
+        else:
+            return
+        heapq.heappush(self._expiry, (revocation.expires_at, revocation.kind, revocation.key))
+    
+    def _maybe_sweep(self) -> None:
+        """Drop entries whose tokens have expired."""
+        monotonic_now = time.monotonic()
+        if monotonic_now < self._next_sweep:
+            return
+        self._next_sweep = monotonic_now + self.sweep_interval
+        
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, kind, key = heapq.heappop(self._expiry)
+            if kind == JTI:
+                if self._jtis.get(key) == expires_at:
+                    del self._jtis[key]
+            elif key in self._epochs and self._epochs[key][1] == expires_at:
+                # A later revoke_user replaced the entry and has its own heap item
+                del self._epochs[key]
+    
+    async def start(self) -> None:
+        """Load live revocations and follow other instances."""
+        for revocation in await self.backend.snapshot():
+            self.apply(revocation)
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="revocation-listener")
+    
+    async def _listen(self) -> None:
+        while True:
+            try:
+                await self.backend.listen(self.apply)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token revocation listener failed, reconnecting: {str(e)}")
+                await asyncio.sleep(1)
+    
+    async def close(self) -> None:
+        """Stop following other instances and release backend resources."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self.backend.close()
+    
+    def clear(self) -> None:
+        """Forget every local revocation."""
+        self._jtis.clear()
+        self._epochs.clear()
+        self._expiry.clear()
+    
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._epochs)
+
+
+def create_revocation_list() -> RevocationList:
+    """Build the revocation list configured by REVOCATION_BACKEND."""
+    if settings.REVOCATION_BACKEND == "redis":
+        backend = RedisRevocationBackend(url=settings.REDIS_URL)
+    else:
+        backend = InMemoryRevocationBackend()
+    return RevocationList(backend, sweep_interval=settings.REVOCATION_SWEEP_INTERVAL)
+
+
+# Global revocation list instance
+revocation_list = create_revocation_list()
@@ -3,15 +3,25 @@ Security utilities for SkillForge AI User Service
 JWT tokens, password hashing, permissions, etc.
 """
 
+import asyncio
+import hashlib
 import secrets
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Union
 from uuid import UUID
 import jwt
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from passlib.handlers.bcrypt import bcrypt
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
+from app.core.keys import signing_keys
+from app.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_QUEUE_WAIT, PASSWORD_HASH_REJECTED
+from app.core.rate_limit import RateLimiter, rate_limiter
+from app.core.revocation import revocation_list
 from app.models.user_simple import UserRole
 
 settings = get_settings()
@@ -20,6 +30,11 @@ settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _issued_at() -> float:
+    """Sub-second iat, so revoke_user separates a re-login from tokens of the same second."""
+    return round(time.time(), 6)
+
+
 def create_access_token(
     subject: Union[str, UUID], 
     expires_delta: Optional[timedelta] = None,
@@ -35,17 +50,14 @@ def create_access_token(
         "exp": expire,
         "sub": str(subject),
         "type": "access",
-        "iat": datetime.utcnow(),
+        "iat": _issued_at(),
+        "jti": secrets.token_urlsafe(16),  # JWT ID for token revocation
     }
     
     if additional_claims:
         to_encode.update(additional_claims)
     
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.SECRET_KEY, 
-        algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = signing_keys.encode(to_encode)
     return encoded_jwt
 
 
@@ -63,15 +75,11 @@ def create_refresh_token(
         "exp": expire,
         "sub": str(subject),
         "type": "refresh",
-        "iat": datetime.utcnow(),
+        "iat": _issued_at(),
         "jti": secrets.token_urlsafe(32),  # JWT ID for token invalidation
     }
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = signing_keys.encode(to_encode)
     return encoded_jwt
 
 
@@ -84,13 +92,10 @@ def create_email_verification_token(email: str) -> str:
         "sub": email,
         "type": "email_verification",
         "iat": datetime.utcnow(),
+        "jti": secrets.token_urlsafe(16),  # every link is distinct, even within a second
     }
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = signing_keys.encode(to_encode)
     return encoded_jwt
 
 
@@ -103,33 +108,60 @@ def create_password_reset_token(email: str) -> str:
         "sub": email,
         "type": "password_reset",
         "iat": datetime.utcnow(),
+        "jti": secrets.token_urlsafe(16),  # every link is distinct, even within a second
     }
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = signing_keys.encode(to_encode)
     return encoded_jwt
 
 
-def verify_token(token: str, expected_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    """Verify and decode JWT token."""
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        
-        # Check token type if specified
-        if expected_type and payload.get("type") != expected_type:
-            return None
-        
+def token_digest(token: str) -> bytes:
+    """SHA-256 of a token; sessions are stored and looked up by this, never the token itself."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+# Decoded claims keyed by token digest, each kept until its token expires
+verified_token_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, name="verified_token")
+
+
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Check a token's signature and expiry and return its claims; None if invalid.
+    
+    Repeat presentations of a token are served from verified_token_cache,
+    skipping the signature check and JSON decoding until the token expires.
+    """
+    key = token_digest(token)
+    payload = verified_token_cache.get(key)
+    if payload is not None:
         return payload
-        
+    
+    try:
+        payload = signing_keys.decode(token)
     except jwt.PyJWTError:
         return None
+    
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0 and verified_token_cache.max_size:
+        verified_token_cache.set(key, payload, ttl=ttl)
+    return payload
+
+
+def verify_token(token: str, expected_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Verify and decode JWT token."""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    
+    # Check token type if specified
+    if expected_type and payload.get("type") != expected_type:
+        return None
+    
+    # Checked on every call, cached or not, so revocation takes effect at once
+    if revocation_list.is_revoked(payload):
+        return None
+    
+    # Callers get their own copy of the shared cached claims
+    return dict(payload)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -142,6 +174,133 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Async password hashing
+class PasswordHashingBusyError(HTTPException):
+    """Raised when the password hashing queue is full."""
+    
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+
+
+def _timed_call(func, *args):
+    """Run func in a worker and report when it started and finished."""
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic()
+
+
+class PasswordHasher:
+    """Bounded worker pool running bcrypt off the event loop."""
+    
+    def __init__(self, executor_type: str = "thread", max_workers: int = 4, max_queue: int = 32):
+        self.executor_type = executor_type
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self.stats = {
+            "calls": 0,
+            "rejected": 0,
+            "queue_wait_seconds": 0.0,
+            "hash_seconds": 0.0,
+        }
+    
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use."""
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of hashing jobs running or waiting for a worker."""
+        return self._in_flight
+    
+    async def _run(self, operation: str, func, *args):
+        """Submit a job, shedding load when the queue is full."""
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self.stats["rejected"] += 1
+            PASSWORD_HASH_REJECTED.inc()
+            raise PasswordHashingBusyError()
+        
+        self._in_flight += 1
+        submitted = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+        
+        queue_wait = max(0.0, started - submitted)
+        self.stats["calls"] += 1
+        self.stats["queue_wait_seconds"] += queue_wait
+        self.stats["hash_seconds"] += finished - started
+        PASSWORD_HASH_QUEUE_WAIT.labels(operation).observe(queue_wait)
+        PASSWORD_HASH_DURATION.labels(operation).observe(finished - started)
+        return result
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password in the worker pool."""
+        return await self._run("hash", get_password_hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in the worker pool."""
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+    
+    async def hash_many(self, passwords: List[str]) -> List[Union[str, Exception]]:
+        """Hash a batch with at most max_workers jobs in flight.
+        
+        Leaves queue room for interactive logins; failures such as load
+        shedding are returned in place of the hash.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def hash_one(password: str) -> str:
+            async with semaphore:
+                return await self.hash(password)
+        
+        return await asyncio.gather(
+            *(hash_one(password) for password in passwords),
+            return_exceptions=True
+        )
+    
+    def shutdown(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
 def generate_random_password(length: int = 12) -> str:
     """Generate a random password."""
     return secrets.token_urlsafe(length)
@@ -223,19 +382,106 @@ ROLE_PERMISSIONS = {
 }
 
 
-def get_user_permissions(role: UserRole, is_superuser: bool = False) -> list[str]:
-    """Get permissions for a user role."""
+class PermissionSet:
+    """Immutable set of permissions stored as an integer bitmask.
+    
+    Membership tests and unions are single integer operations; unknown
+    permission names are never members.
+    """
+    
+    __slots__ = ("mask",)
+    
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+    
+    @classmethod
+    def from_names(cls, names: Optional[Iterable[str]]) -> "PermissionSet":
+        """Compile permission names, ignoring ones this service does not define."""
+        mask = 0
+        for name in names or ():
+            mask |= PERMISSION_BITS.get(name, 0)
+        return cls(mask)
+    
+    def __contains__(self, permission: str) -> bool:
+        return bool(self.mask & PERMISSION_BITS.get(permission, 0))
+    
+    def __or__(self, other: "PermissionSet") -> "PermissionSet":
+        return PermissionSet(self.mask | other.mask)
+    
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, bit in PERMISSION_BITS.items() if self.mask & bit)
+    
+    def __len__(self) -> int:
+        return bin(self.mask).count("1")
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, PermissionSet) and self.mask == other.mask
+    
+    def __hash__(self) -> int:
+        return hash(self.mask)
+    
+    def __repr__(self) -> str:
+        return f"PermissionSet({sorted(self)!r})"
+    
+    def names(self) -> List[str]:
+        """Permission names in declaration order."""
+        return list(self)
+
+
+# One bit per permission constant, in declaration order
+PERMISSION_BITS: Dict[str, int] = {
+    value: 1 << index
+    for index, value in enumerate(
+        value for name, value in vars(Permissions).items()
+        if name.isupper() and isinstance(value, str)
+    )
+}
+
+ALL_PERMISSIONS = PermissionSet((1 << len(PERMISSION_BITS)) - 1)
+NO_PERMISSIONS = PermissionSet()
+
+# ROLE_PERMISSIONS compiled once at import
+ROLE_PERMISSION_SETS: Dict[UserRole, PermissionSet] = {
+    role: PermissionSet.from_names(permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
+def get_permission_set(
+    role: UserRole,
+    is_superuser: bool = False,
+    extra: Optional[PermissionSet] = None
+) -> PermissionSet:
+    """Effective permissions for a role, plus any per-company grants."""
     if is_superuser:
-        # Superuser has all permissions
-        return list(vars(Permissions).values())
+        return ALL_PERMISSIONS
     
-    return ROLE_PERMISSIONS.get(role, [])
+    permissions = ROLE_PERMISSION_SETS.get(role, NO_PERMISSIONS)
+    if extra is not None and extra.mask:
+        permissions = permissions | extra
+    return permissions
 
 
-def check_permission(user_role: UserRole, required_permission: str, is_superuser: bool = False) -> bool:
+def get_user_permissions(role: UserRole, is_superuser: bool = False) -> list[str]:
+    """Get permissions for a user role."""
+    return get_permission_set(role, is_superuser).names()
+
+
+def check_permission(
+    user_role: UserRole,
+    required_permission: str,
+    is_superuser: bool = False,
+    extra: Optional[PermissionSet] = None
+) -> bool:
     """Check if user has required permission."""
-    user_permissions = get_user_permissions(user_role, is_superuser)
-    return required_permission in user_permissions
+    bit = PERMISSION_BITS.get(required_permission, 0)
+    if is_superuser:
+        return bool(bit)
+    
+    mask = ROLE_PERMISSION_SETS.get(user_role, NO_PERMISSIONS).mask
+    if extra is not None:
+        mask |= extra.mask
+    return bool(mask & bit)
 
 
 # Security headers
@@ -264,51 +510,6 @@ def add_security_headers(headers: Dict[str, str]) -> Dict[str, str]:
     return headers
 
 
-# Rate limiting utilities
-class RateLimiter:
-    """Simple in-memory rate limiter."""
-    
-    def __init__(self):
-        self._attempts = {}
-        self._reset_times = {}
-    
-    def is_allowed(self, key: str, limit: int, window: int) -> bool:
-        """Check if request is within rate limit."""
-        now = datetime.utcnow()
-        
-        # Reset counter if window has passed
-        if key in self._reset_times and now > self._reset_times[key]:
-            self._attempts[key] = 0
-            self._reset_times[key] = now + timedelta(seconds=window)
-        
-        # Initialize if not exists
-        if key not in self._attempts:
-            self._attempts[key] = 0
-            self._reset_times[key] = now + timedelta(seconds=window)
-        
-        # Check limit
-        if self._attempts[key] >= limit:
-            return False
-        
-        # Increment counter
-        self._attempts[key] += 1
-        return True
-    
-    def get_remaining(self, key: str, limit: int) -> int:
-        """Get remaining attempts."""
-        current = self._attempts.get(key, 0)
-        return max(0, limit - current)
-    
-    def reset(self, key: str) -> None:
-        """Reset rate limit for key."""
-        self._attempts.pop(key, None)
-        self._reset_times.pop(key, None)
-
-
-# Global rate limiter instance
-rate_limiter = RateLimiter()
-
-
 # Input validation and sanitization
 def sanitize_input(value: str, max_length: int = 255) -> str:
     """Sanitize user input."""
@@ -2,13 +2,29 @@
 CRUD package for SkillForge AI User Service
 """
 
-from .base import CRUDBase
+from .base import (
+    CRUDBase,
+    UnitOfWork,
+    ConflictPolicy,
+    BulkWriteResult,
+    InvalidCursorError,
+    encode_cursor,
+    decode_cursor
+)
+from .search import SearchConfig
 from .user import CRUDUser, CRUDUserSession, CRUDUserSettings, user, user_session, user_settings
 from .company import CRUDCompany, CRUDTeamMember, CRUDSubscription, company, team_member, subscription
 
 __all__ = [
     # Base CRUD
     "CRUDBase",
+    "UnitOfWork",
+    "ConflictPolicy",
+    "BulkWriteResult",
+    "InvalidCursorError",
+    "encode_cursor",
+    "decode_cursor",
+    "SearchConfig",
     
     # User CRUD classes
     "CRUDUser",
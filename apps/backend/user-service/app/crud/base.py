@@ -2,29 +2,255 @@
 Base CRUD operations for SkillForge AI User Service
 """
 
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Union
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Union, Tuple, Iterable
 from uuid import UUID
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import select, insert, update, delete, func, and_, or_, tuple_, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import SQLModel
+import logging
+
+from app.crud.search import SearchConfig, search_clause
+
+logger = logging.getLogger(__name__)
+
+# Bind parameters allowed per statement (PostgreSQL and SQLite both cap near 32k)
+MAX_BIND_PARAMS = 32000
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=SQLModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=SQLModel)
 
 
+class ConflictPolicy(str, Enum):
+    """What bulk_ingest does when a row collides on a unique column."""
+    ERROR = "error"
+    SKIP = "skip"
+    UPDATE = "update"
+
+
+@dataclass
+class BulkWriteResult:
+    """Per-row outcome of bulk_ingest, aligned with the input rows."""
+    
+    ids: List[Optional[UUID]] = field(default_factory=list)  # None when skipped
+    created: List[bool] = field(default_factory=list)
+    
+    @property
+    def inserted(self) -> int:
+        return sum(self.created)
+    
+    @property
+    def updated(self) -> int:
+        return sum(1 for id, created in zip(self.ids, self.created) if id and not created)
+    
+    @property
+    def skipped(self) -> int:
+        return sum(1 for id in self.ids if id is None)
+    
+    def extend(self, other: "BulkWriteResult") -> None:
+        self.ids.extend(other.ids)
+        self.created.extend(other.created)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode an opaque cursor back into a (created_at, id) keyset position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+async def _update_returning(db: AsyncSession, db_obj: SQLModel, values: Dict[str, Any]) -> SQLModel:
+    """Write values with ``UPDATE ... RETURNING`` and load the row back onto db_obj."""
+    table = type(db_obj).__table__
+    values = {name: value for name, value in values.items() if name in table.c}
+    if not values:
+        return db_obj
+    
+    result = await db.execute(
+        update(table)
+        .where(table.c.id == db_obj.id)
+        .values(**values)
+        .returning(*table.c)
+    )
+    row = result.mappings().one_or_none()
+    if row is not None:
+        for name, value in row.items():
+            set_committed_value(db_obj, name, value)
+    return db_obj
+
+
+class UnitOfWork:
+    """Stage field changes and inserts, then write them in one transaction.
+    
+    Changes staged for the same object are merged into a single
+    ``UPDATE ... RETURNING``, so no refresh SELECT is needed afterwards.
+    Usable as an async context manager that commits on success.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._updates: Dict[int, Tuple[SQLModel, Dict[str, Any]]] = {}
+        self._inserts: List[SQLModel] = []
+    
+    def update(self, db_obj: SQLModel, values: Dict[str, Any]) -> None:
+        """Stage field changes for an existing row."""
+        _, staged = self._updates.setdefault(id(db_obj), (db_obj, {}))
+        staged.update(values)
+    
+    def add(self, db_obj: SQLModel) -> None:
+        """Stage a new row for insertion."""
+        self._inserts.append(db_obj)
+    
+    async def flush(self) -> None:
+        """Send staged statements without committing."""
+        updates, self._updates = self._updates, {}
+        for db_obj, values in updates.values():
+            await _update_returning(self.db, db_obj, values)
+        
+        if self._inserts:
+            self.db.add_all(self._inserts)
+            self._inserts = []
+            await self.db.flush()
+    
+    async def commit(self) -> None:
+        """Flush staged statements and commit them together."""
+        try:
+            await self.flush()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+    
+    def discard(self) -> None:
+        """Drop everything staged so far."""
+        self._updates = {}
+        self._inserts = []
+    
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.commit()
+        else:
+            self.discard()
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base class for CRUD operations."""
     
+    # Row count above which get_page(estimate_total=True) reports the estimate
+    estimate_threshold: int = 10000
+    
+    # Full-text search setup; None searches with ILIKE only
+    search_config: Optional[SearchConfig] = None
+    
     def __init__(self, model: Type[ModelType]):
         """Initialize CRUD with model class."""
         self.model = model
     
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]] = None):
+        """Apply equality / IN filters to a query."""
+        if filters:
+            for field_name, field_value in filters.items():
+                if hasattr(self.model, field_name) and field_value is not None:
+                    field = getattr(self.model, field_name)
+                    if isinstance(field_value, list):
+                        query = query.where(field.in_(field_value))
+                    else:
+                        query = query.where(field == field_value)
+        return query
+    
+    def _apply_keyset(self, query, cursor: Optional[str], descending: bool = True, entity=None):
+        """Order by (created_at, id) and seek past the cursor position."""
+        entity = entity if entity is not None else self.model
+        key = tuple_(entity.created_at, entity.id)
+        if cursor:
+            created_at, id = decode_cursor(cursor)
+            position = tuple_(created_at, id)
+            query = query.where(key < position if descending else key > position)
+        
+        if descending:
+            return query.order_by(entity.created_at.desc(), entity.id.desc())
+        return query.order_by(entity.created_at.asc(), entity.id.asc())
+    
+    def _apply_ordering(self, query, order_by: Optional[str] = None, entity=None):
+        """Order by a field name (prefix with '-' for descending)."""
+        entity = entity if entity is not None else self.model
+        if order_by:
+            if order_by.startswith("-"):
+                order_field = getattr(entity, order_by[1:], None)
+                if order_field is not None:
+                    query = query.order_by(order_field.desc())
+            else:
+                order_field = getattr(entity, order_by, None)
+                if order_field is not None:
+                    query = query.order_by(order_field.asc())
+        else:
+            # Default ordering by created_at if available
+            if hasattr(entity, "created_at"):
+                query = query.order_by(entity.created_at.desc())
+        return query
+    
+    def _search_clause(self, db: AsyncSession, search_term: str, search_fields: List[str]):
+        """Build (condition, rank) for a search term on the session's database."""
+        return search_clause(
+            self.model,
+            self.search_config,
+            search_term,
+            search_fields,
+            db.get_bind().dialect.name
+        )
+    
+    def next_cursor(self, items: List[ModelType], limit: int) -> Optional[str]:
+        """Build the cursor for the page following items, if there may be one."""
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        return encode_cursor(last.created_at, last.id)
+    
     async def get(self, db: AsyncSession, id: UUID) -> Optional[ModelType]:
         """Get a single record by ID."""
         result = await db.execute(select(self.model).where(self.model.id == id))
         return result.scalar_one_or_none()
     
+    async def get_many(self, db: AsyncSession, ids: Iterable[UUID]) -> List[Optional[ModelType]]:
+        """Get records by ID in one ``IN`` query per MAX_BIND_PARAMS ids.
+        
+        The result is aligned with ids: the record for each id in input
+        order, or None where no row exists. Repeated ids are queried once.
+        """
+        ids = list(ids)
+        unique_ids = list(dict.fromkeys(ids))
+        found: Dict[UUID, ModelType] = {}
+        for start in range(0, len(unique_ids), MAX_BIND_PARAMS):
+            chunk = unique_ids[start:start + MAX_BIND_PARAMS]
+            result = await db.execute(select(self.model).where(self.model.id.in_(chunk)))
+            found.update((item.id, item) for item in result.scalars().all())
+        return [found.get(id) for id in ids]
+    
     async def get_by_field(
         self, 
         db: AsyncSession, 
@@ -42,35 +268,29 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         skip: int = 0,
         limit: int = 100,
         order_by: Optional[str] = None,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None
     ) -> List[ModelType]:
-        """Get multiple records with pagination and filtering."""
+        """Get multiple records with pagination and filtering.
+        
+        When ``cursor`` is given, keyset pagination on (created_at, id) is used
+        instead of OFFSET; only ``created_at`` ordering is supported then.
+        """
         query = select(self.model)
         
         # Apply filters
-        if filters:
-            for field_name, field_value in filters.items():
-                if hasattr(self.model, field_name) and field_value is not None:
-                    field = getattr(self.model, field_name)
-                    if isinstance(field_value, list):
-                        query = query.where(field.in_(field_value))
-                    else:
-                        query = query.where(field == field_value)
+        query = self._apply_filters(query, filters)
+        
+        # Keyset pagination
+        if cursor is not None:
+            if order_by not in (None, "created_at", "-created_at"):
+                raise InvalidCursorError("Cursor pagination only supports created_at ordering")
+            query = self._apply_keyset(query, cursor, descending=order_by != "created_at")
+            result = await db.execute(query.limit(limit))
+            return result.scalars().all()
         
         # Apply ordering
-        if order_by:
-            if order_by.startswith("-"):
-                order_field = getattr(self.model, order_by[1:], None)
-                if order_field:
-                    query = query.order_by(order_field.desc())
-            else:
-                order_field = getattr(self.model, order_by, None)
-                if order_field:
-                    query = query.order_by(order_field.asc())
-        else:
-            # Default ordering by created_at if available
-            if hasattr(self.model, "created_at"):
-                query = query.order_by(self.model.created_at.desc())
+        query = self._apply_ordering(query, order_by)
         
         # Apply pagination
         query = query.offset(skip).limit(limit)
@@ -87,24 +307,136 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         query = select(func.count(self.model.id))
         
         # Apply filters
-        if filters:
-            for field_name, field_value in filters.items():
-                if hasattr(self.model, field_name) and field_value is not None:
-                    field = getattr(self.model, field_name)
-                    if isinstance(field_value, list):
-                        query = query.where(field.in_(field_value))
-                    else:
-                        query = query.where(field == field_value)
+        query = self._apply_filters(query, filters)
         
         result = await db.execute(query)
         return result.scalar()
     
+    async def get_page(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        search_term: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        conditions: Optional[List[Any]] = None,
+        estimate_total: bool = False
+    ) -> Tuple[List[ModelType], int]:
+        """Get a page of records together with the total number of matches.
+        
+        The total is computed with ``count(*) over()`` in the same statement as
+        the page, so a list endpoint needs a single round trip. With
+        ``estimate_total`` the planner's row estimate is returned instead when
+        it is at least ``estimate_threshold`` rows.
+        """
+        query = self._apply_filters(select(self.model), filters)
+        rank = None
+        if search_term and search_fields:
+            search_condition, rank = self._search_clause(db, search_term, search_fields)
+            if search_condition is not None:
+                query = query.where(search_condition)
+        for condition in conditions or []:
+            query = query.where(condition)
+        
+        if cursor is not None and order_by not in (None, "created_at", "-created_at"):
+            raise InvalidCursorError("Cursor pagination only supports created_at ordering")
+        
+        # Search results are ranked unless the caller asked for an explicit order
+        ranked = rank is not None and order_by is None and cursor is None
+        
+        if estimate_total:
+            estimate = await self.estimate_count(db, query)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                if cursor is not None:
+                    query = self._apply_keyset(query, cursor, descending=order_by != "created_at")
+                elif ranked:
+                    query = self._apply_ordering(query.order_by(rank.desc()), None).offset(skip)
+                else:
+                    query = self._apply_ordering(query, order_by).offset(skip)
+                result = await db.execute(query.limit(limit))
+                return result.scalars().all(), estimate
+        
+        # Window count is evaluated over the filtered set, before the cursor
+        # predicate and LIMIT/OFFSET are applied in the outer query.
+        inner = query.add_columns(func.count().over().label("total_count"))
+        if ranked:
+            inner = inner.add_columns(rank.label("search_rank"))
+        inner = inner.subquery()
+        entity = aliased(self.model, inner)
+        page_query = select(entity, inner.c.total_count)
+        if cursor is not None:
+            page_query = self._apply_keyset(
+                page_query, cursor, descending=order_by != "created_at", entity=entity
+            )
+        elif ranked:
+            page_query = self._apply_ordering(
+                page_query.order_by(inner.c.search_rank.desc()), None, entity=entity
+            ).offset(skip)
+        else:
+            page_query = self._apply_ordering(page_query, order_by, entity=entity).offset(skip)
+        
+        result = await db.execute(page_query.limit(limit))
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total_count
+        
+        if skip == 0 and not cursor:
+            return [], 0
+        
+        # Past the last page: the window saw no rows, count separately
+        total = await db.execute(select(func.count()).select_from(query.subquery()))
+        return [], total.scalar()
+    
+    async def estimate_count(self, db: AsyncSession, query=None) -> Optional[int]:
+        """Estimate matching rows from PostgreSQL statistics.
+        
+        Uses ``pg_class.reltuples`` for an unfiltered table and the planner's
+        row estimate from ``EXPLAIN`` otherwise. Returns None when no estimate
+        is available (other databases, never-analyzed tables).
+        """
+        dialect = db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+        
+        try:
+            if query is None or query.whereclause is None:
+                result = await db.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                    {"table": self.model.__tablename__}
+                )
+                estimate = result.scalar()
+            else:
+                compiled = query.with_only_columns(self.model.id).compile(
+                    dialect=dialect,
+                    compile_kwargs={"literal_binds": True}
+                )
+                result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                estimate = plan[0]["Plan"]["Plan Rows"]
+        except Exception as e:
+            logger.warning(f"Row estimate failed for {self.model.__tablename__}: {str(e)}")
+            return None
+        
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+    
     async def create(
         self, 
         db: AsyncSession, 
-        obj_in: Union[CreateSchemaType, Dict[str, Any]]
+        obj_in: Union[CreateSchemaType, Dict[str, Any]],
+        commit: bool = True
     ) -> ModelType:
-        """Create a new record."""
+        """Create a new record.
+        
+        The INSERT fetches any server-generated values via RETURNING, so no
+        refresh is issued. With ``commit=False`` the row is only flushed.
+        """
         if isinstance(obj_in, dict):
             obj_data = obj_in
         else:
@@ -112,40 +444,84 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         
         db_obj = self.model(**obj_data)
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await db.flush()
+        if commit:
+            await db.commit()
         return db_obj
     
     async def update(
         self, 
         db: AsyncSession, 
         db_obj: ModelType, 
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True
     ) -> ModelType:
-        """Update an existing record."""
+        """Update an existing record with a single UPDATE ... RETURNING.
+        
+        With ``commit=False`` the change is sent but left for the caller to commit.
+        """
         if isinstance(obj_in, dict):
-            update_data = obj_in
+            update_data = dict(obj_in)
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
         
         # Update timestamp if available
         if hasattr(db_obj, "updated_at"):
-            from datetime import datetime
             update_data["updated_at"] = datetime.utcnow()
         
-        for field_name, field_value in update_data.items():
-            if hasattr(db_obj, field_name):
-                setattr(db_obj, field_name, field_value)
+        update_data = {
+            field_name: field_value
+            for field_name, field_value in update_data.items()
+            if hasattr(db_obj, field_name)
+        }
         
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await _update_returning(db, db_obj, update_data)
+        if commit:
+            await db.commit()
+        return db_obj
+    
+    def unit_of_work(self, db: AsyncSession) -> UnitOfWork:
+        """Start a unit of work for batching writes into one commit."""
+        return UnitOfWork(db)
+    
+    def stage_create(
+        self,
+        uow: UnitOfWork,
+        obj_in: Union[CreateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """Build a new record and stage it for insertion."""
+        if isinstance(obj_in, dict):
+            obj_data = obj_in
+        else:
+            obj_data = obj_in.model_dump(exclude_unset=True)
+        
+        db_obj = self.model(**obj_data)
+        uow.add(db_obj)
+        return db_obj
+    
+    def stage_update(
+        self,
+        uow: UnitOfWork,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """Stage field changes on an existing record."""
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        
+        if hasattr(db_obj, "updated_at"):
+            update_data["updated_at"] = datetime.utcnow()
+        
+        uow.update(db_obj, update_data)
         return db_obj
     
-    async def delete(self, db: AsyncSession, id: UUID) -> bool:
+    async def delete(self, db: AsyncSession, id: UUID, commit: bool = True) -> bool:
         """Delete a record by ID."""
         result = await db.execute(delete(self.model).where(self.model.id == id))
-        await db.commit()
+        if commit:
+            await db.commit()
         return result.rowcount > 0
     
     async def soft_delete(self, db: AsyncSession, id: UUID) -> Optional[ModelType]:
@@ -169,35 +545,32 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         search_fields: List[str],
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None
     ) -> List[ModelType]:
-        """Search records by term in specified fields."""
+        """Search records by term in specified fields, best matches first."""
         query = select(self.model)
         
         # Build search conditions
-        search_conditions = []
-        for field_name in search_fields:
-            if hasattr(self.model, field_name):
-                field = getattr(self.model, field_name)
-                search_conditions.append(field.ilike(f"%{search_term}%"))
-        
-        if search_conditions:
-            query = query.where(or_(*search_conditions))
+        search_condition, rank = self._search_clause(db, search_term, search_fields)
+        if search_condition is not None:
+            query = query.where(search_condition)
         
         # Apply additional filters
-        if filters:
-            for field_name, field_value in filters.items():
-                if hasattr(self.model, field_name) and field_value is not None:
-                    field = getattr(self.model, field_name)
-                    if isinstance(field_value, list):
-                        query = query.where(field.in_(field_value))
-                    else:
-                        query = query.where(field == field_value)
+        query = self._apply_filters(query, filters)
+        
+        # Keyset pagination
+        if cursor is not None:
+            query = self._apply_keyset(query, cursor)
+            result = await db.execute(query.limit(limit))
+            return result.scalars().all()
         
         # Apply pagination
         query = query.offset(skip).limit(limit)
         
-        # Default ordering by created_at if available
+        # Best matches first, newest first among equals
+        if rank is not None:
+            query = query.order_by(rank.desc())
         if hasattr(self.model, "created_at"):
             query = query.order_by(self.model.created_at.desc())
         
@@ -207,9 +580,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def bulk_create(
         self, 
         db: AsyncSession, 
-        objs_in: List[Union[CreateSchemaType, Dict[str, Any]]]
+        objs_in: List[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True
     ) -> List[ModelType]:
-        """Create multiple records in bulk."""
+        """Create multiple records in bulk without refreshing each one."""
         db_objs = []
         for obj_in in objs_in:
             if isinstance(obj_in, dict):
@@ -221,17 +595,17 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db_objs.append(db_obj)
         
         db.add_all(db_objs)
-        await db.commit()
-        
-        for db_obj in db_objs:
-            await db.refresh(db_obj)
+        await db.flush()
+        if commit:
+            await db.commit()
         
         return db_objs
     
     async def bulk_update(
         self,
         db: AsyncSession,
-        updates: List[Dict[str, Any]]
+        updates: List[Dict[str, Any]],
+        commit: bool = True
     ) -> int:
         """Bulk update records."""
         if not updates:
@@ -247,5 +621,180 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             update(self.model),
             updates
         )
-        await db.commit()
-        return result.rowcount
\ No newline at end of file
+        if commit:
+            await db.commit()
+        return result.rowcount
+    
+    async def bulk_ingest(
+        self,
+        db: AsyncSession,
+        rows: Iterable[Union[CreateSchemaType, Dict[str, Any]]],
+        chunk_size: int = 1000,
+        on_conflict: Optional[Dict[str, ConflictPolicy]] = None,
+        update_fields: Optional[List[str]] = None,
+        use_copy: bool = True,
+        commit: bool = True
+    ) -> BulkWriteResult:
+        """Insert many rows without building a session object per row.
+        
+        Rows are written in chunks: through asyncpg ``COPY`` when there is no
+        conflict policy, otherwise as multi-row ``INSERT ... ON CONFLICT ...
+        RETURNING id``. ``on_conflict`` maps unique columns to a policy; at most
+        one column may use UPDATE, which overwrites ``update_fields`` (default:
+        the columns the input rows supply; rows supplying different columns
+        are written in separate chunks, so omitted columns keep their values).
+        """
+        on_conflict = {k: ConflictPolicy(v) for k, v in (on_conflict or {}).items()}
+        update_columns = [k for k, v in on_conflict.items() if v == ConflictPolicy.UPDATE]
+        if len(update_columns) > 1:
+            raise ValueError("Only one unique column can use the UPDATE conflict policy")
+        
+        table = self.model.__table__
+        dialect = db.get_bind().dialect
+        chunk_size = max(1, min(chunk_size, MAX_BIND_PARAMS // len(table.c)))
+        copy = (
+            use_copy
+            and dialect.name == "postgresql"
+            and dialect.driver == "asyncpg"
+            and all(v == ConflictPolicy.ERROR for v in on_conflict.values())
+        )
+        
+        split_by_fields = bool(update_columns) and update_fields is None
+        result = BulkWriteResult()
+        chunk: List[Dict[str, Any]] = []
+        chunk_fields: frozenset = frozenset()
+        for row in rows:
+            prepared, supplied = self._prepare_row(row)
+            if chunk and split_by_fields and supplied != chunk_fields:
+                result.extend(await self._write_chunk(
+                    db, chunk, on_conflict, update_fields or sorted(chunk_fields), copy
+                ))
+                chunk = []
+            chunk.append(prepared)
+            chunk_fields = supplied
+            if len(chunk) >= chunk_size:
+                result.extend(await self._write_chunk(
+                    db, chunk, on_conflict, update_fields or sorted(chunk_fields), copy
+                ))
+                chunk = []
+        if chunk:
+            result.extend(await self._write_chunk(
+                db, chunk, on_conflict, update_fields or sorted(chunk_fields), copy
+            ))
+        
+        if commit:
+            await db.commit()
+        return result
+    
+    def _prepare_row(
+        self, row: Union[CreateSchemaType, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], frozenset]:
+        """Apply model defaults and reduce a row to table column values.
+        
+        Also returns the columns the row itself supplied, before defaults.
+        """
+        if not isinstance(row, dict):
+            row = row.model_dump(exclude_unset=True)
+        db_obj = self.model(**row)
+        columns = self.model.__table__.c
+        prepared = {column.key: getattr(db_obj, column.key) for column in columns}
+        return prepared, frozenset(key for key in row if key in columns)
+    
+    async def _write_chunk(
+        self,
+        db: AsyncSession,
+        chunk: List[Dict[str, Any]],
+        on_conflict: Dict[str, ConflictPolicy],
+        update_fields: List[str],
+        copy: bool
+    ) -> BulkWriteResult:
+        """Write one chunk and map written ids back onto its rows."""
+        if copy:
+            await self._copy_chunk(db, chunk)
+            return BulkWriteResult(ids=[r["id"] for r in chunk], created=[True] * len(chunk))
+        
+        table = self.model.__table__
+        update_column = next(
+            (k for k, v in on_conflict.items() if v == ConflictPolicy.UPDATE), None
+        )
+        skip_columns = [k for k, v in on_conflict.items() if v == ConflictPolicy.SKIP]
+        
+        # Keep the last row per conflict key; earlier duplicates count as skipped.
+        # NULLs never conflict, so rows without a key are all kept.
+        candidates = list(range(len(chunk)))
+        for column_name in on_conflict:
+            last_seen = {chunk[i][column_name]: i for i in candidates}
+            candidates = [
+                i for i in candidates
+                if chunk[i][column_name] is None or last_seen[chunk[i][column_name]] == i
+            ]
+        
+        # ON CONFLICT takes a single target; other SKIP columns are checked up front
+        conflict_target = update_column or (skip_columns[0] if skip_columns else None)
+        for column_name in skip_columns:
+            if column_name == conflict_target:
+                continue
+            values = [chunk[i][column_name] for i in candidates if chunk[i][column_name] is not None]
+            if values:
+                existing = set((await db.execute(
+                    select(table.c[column_name]).where(table.c[column_name].in_(values))
+                )).scalars().all())
+                candidates = [i for i in candidates if chunk[i][column_name] not in existing]
+        
+        ids: List[Optional[UUID]] = [None] * len(chunk)
+        created = [False] * len(chunk)
+        if not candidates:
+            return BulkWriteResult(ids=ids, created=created)
+        
+        stmt = self._dialect_insert(db).values([chunk[i] for i in candidates])
+        if update_column:
+            fields = [c for c in update_fields if c not in ("id", "created_at", update_column)]
+            # A no-op SET still lets RETURNING report the existing row
+            set_ = {name: stmt.excluded[name] for name in fields} or {
+                update_column: stmt.excluded[update_column]
+            }
+            if "updated_at" in table.c:
+                set_["updated_at"] = datetime.utcnow()
+            stmt = stmt.on_conflict_do_update(index_elements=[update_column], set_=set_)
+        elif skip_columns:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[conflict_target])
+        
+        key = update_column or "id"
+        returned = await db.execute(stmt.returning(table.c.id, table.c[key]))
+        written = {row_key: id for id, row_key in returned.all()}
+        for i in candidates:
+            written_id = written.get(chunk[i][key])
+            if written_id is not None:
+                ids[i] = written_id
+                created[i] = written_id == chunk[i]["id"]
+        return BulkWriteResult(ids=ids, created=created)
+    
+    def _dialect_insert(self, db: AsyncSession):
+        """INSERT construct supporting ON CONFLICT for the session's dialect."""
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            return postgresql.insert(self.model.__table__)
+        if dialect_name == "sqlite":
+            return sqlite.insert(self.model.__table__)
+        return insert(self.model.__table__)
+    
+    async def _copy_chunk(self, db: AsyncSession, chunk: List[Dict[str, Any]]) -> None:
+        """Stream a chunk through asyncpg's binary COPY protocol."""
+        table = self.model.__table__
+        connection = await db.connection()
+        dialect = connection.dialect
+        processors = [column.type.bind_processor(dialect) for column in table.c]
+        records = [
+            tuple(
+                processor(row[column.key]) if processor else row[column.key]
+                for column, processor in zip(table.c, processors)
+            )
+            for row in chunk
+        ]
+        
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=[column.name for column in table.c]
+        )
@@ -2,13 +2,14 @@
 Company CRUD operations for SkillForge AI User Service
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from datetime import datetime
 from sqlalchemy import select, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.crud.base import CRUDBase
+from app.crud.search import SearchConfig, register_search_ddl
 from app.models.company_simple import (
     CompanyProfile, 
     TeamMember, 
@@ -17,11 +18,27 @@ from app.models.company_simple import (
     IndustryType
 )
 from app.schemas.company import CompanyCreate, CompanyUpdate
+from app.core.cache import invalidate_company_access
+
+
+# Descriptions are long, so they only get full-text matching
+COMPANY_SEARCH = SearchConfig(
+    weighted_fields=(("name", "A"), ("description", "C")),
+    trigram_fields=("name",)
+)
+register_search_ddl(CompanyProfile.__table__, COMPANY_SEARCH)
 
 
 class CRUDCompany(CRUDBase[CompanyProfile, CompanyCreate, CompanyUpdate]):
     """CRUD operations for CompanyProfile model."""
     
+    search_fields = ["name", "description"]
+    search_config = COMPANY_SEARCH
+    
+    def skills_condition(self, skills: List[str]):
+        """Match companies focusing on any of the given skills."""
+        return CompanyProfile.skills_focus.op("&&")(skills)  # PostgreSQL array overlap
+    
     async def get_by_slug(self, db: AsyncSession, slug: str) -> Optional[CompanyProfile]:
         """Get company by slug."""
         result = await db.execute(
@@ -34,14 +51,16 @@ class CRUDCompany(CRUDBase[CompanyProfile, CompanyCreate, CompanyUpdate]):
         db: AsyncSession, 
         owner_id: UUID,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[CompanyProfile]:
         """Get companies owned by a user."""
         return await self.get_multi(
             db,
             skip=skip,
             limit=limit,
-            filters={"owner_id": owner_id}
+            filters={"owner_id": owner_id},
+            cursor=cursor
         )
     
     async def create(self, db: AsyncSession, obj_in: CompanyCreate, owner_id: UUID) -> CompanyProfile:
@@ -62,10 +81,29 @@ class CRUDCompany(CRUDBase[CompanyProfile, CompanyCreate, CompanyUpdate]):
         db_company = CompanyProfile(**company_data)
         db.add(db_company)
         await db.commit()
-        await db.refresh(db_company)
         
         return db_company
     
+    async def update(
+        self,
+        db: AsyncSession,
+        db_obj: CompanyProfile,
+        obj_in: Union[CompanyUpdate, Dict[str, Any]],
+        commit: bool = True
+    ) -> CompanyProfile:
+        """Update a company, dropping cached access decisions when it is (de)activated."""
+        was_active = db_obj.is_active
+        company = await super().update(db, db_obj, obj_in, commit=commit)
+        if company.is_active != was_active:
+            invalidate_company_access(company.id, db=db)
+        return company
+    
+    async def delete(self, db: AsyncSession, id: UUID, commit: bool = True) -> bool:
+        """Delete a company and its cached access decisions."""
+        deleted = await super().delete(db, id, commit=commit)
+        invalidate_company_access(id, db=db)
+        return deleted
+    
     async def _ensure_unique_slug(self, db: AsyncSession, base_slug: str) -> str:
         """Ensure slug is unique by appending numbers if necessary."""
         original_slug = base_slug
@@ -94,17 +132,18 @@ class CRUDCompany(CRUDBase[CompanyProfile, CompanyCreate, CompanyUpdate]):
         search_term: str,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None
     ) -> List[CompanyProfile]:
         """Search companies by name or description."""
-        search_fields = ["name", "description"]
         return await self.search(
             db,
             search_term,
-            search_fields,
+            self.search_fields,
             skip=skip,
             limit=limit,
-            filters=filters
+            filters=filters,
+            cursor=cursor
         )
     
     async def get_by_industry(
@@ -156,15 +195,21 @@ class CRUDCompany(CRUDBase[CompanyProfile, CompanyCreate, CompanyUpdate]):
         db: AsyncSession,
         skills: List[str],
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[CompanyProfile]:
         """Get companies by skills focus."""
         query = select(CompanyProfile).where(
             and_(
-                CompanyProfile.is_active.is_(True),
-                CompanyProfile.skills_focus.op("&&")(skills)  # PostgreSQL array overlap
+                CompanyProfile.is_active,  # bare, so PostgreSQL matches the partial index predicate
+                self.skills_condition(skills)
             )
-        ).offset(skip).limit(limit).order_by(CompanyProfile.created_at.desc())
+        )
+        
+        if cursor is not None:
+            query = self._apply_keyset(query, cursor).limit(limit)
+        else:
+            query = query.offset(skip).limit(limit).order_by(CompanyProfile.created_at.desc())
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -185,19 +230,56 @@ class CRUDTeamMember(CRUDBase[TeamMember, dict, dict]):
                 and_(
                     TeamMember.company_id == company_id,
                     TeamMember.user_id == user_id,
-                    TeamMember.is_active.is_(True)
+                    TeamMember.is_active
                 )
             )
         )
         return result.scalar_one_or_none()
     
+    async def get_company_with_membership(
+        self,
+        db: AsyncSession,
+        company_id: UUID,
+        user_id: UUID
+    ) -> Tuple[Optional[CompanyProfile], Optional[TeamMember]]:
+        """Load a company and the user's active membership in one query."""
+        result = await db.execute(
+            select(CompanyProfile, TeamMember)
+            .outerjoin(
+                TeamMember,
+                and_(
+                    TeamMember.company_id == CompanyProfile.id,
+                    TeamMember.user_id == user_id,
+                    TeamMember.is_active
+                )
+            )
+            .where(CompanyProfile.id == company_id)
+        )
+        row = result.first()
+        if row is None:
+            return None, None
+        return row[0], row[1]
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        db_obj: TeamMember,
+        obj_in: Union[Dict[str, Any], Any],
+        commit: bool = True
+    ) -> TeamMember:
+        """Update a membership and drop the member's cached access decision."""
+        member = await super().update(db, db_obj, obj_in, commit=commit)
+        invalidate_company_access(member.company_id, member.user_id, db=db)
+        return member
+    
     async def get_company_members(
         self,
         db: AsyncSession,
         company_id: UUID,
         skip: int = 0,
         limit: int = 100,
-        active_only: bool = True
+        active_only: bool = True,
+        cursor: Optional[str] = None
     ) -> List[TeamMember]:
         """Get all members of a company."""
         filters = {"company_id": company_id}
@@ -208,7 +290,8 @@ class CRUDTeamMember(CRUDBase[TeamMember, dict, dict]):
             db,
             skip=skip,
             limit=limit,
-            filters=filters
+            filters=filters,
+            cursor=cursor
         )
     
     async def get_user_companies(
@@ -257,7 +340,9 @@ class CRUDTeamMember(CRUDBase[TeamMember, dict, dict]):
             "invitation_accepted_at": datetime.utcnow() if not invited_by else None
         }
         
-        return await self.create(db, member_data)
+        member = await self.create(db, member_data)
+        invalidate_company_access(company_id, user_id, db=db)
+        return member
     
     async def accept_invitation(
         self, 
@@ -306,7 +391,8 @@ class CRUDTeamMember(CRUDBase[TeamMember, dict, dict]):
         company_id: UUID,
         role: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[TeamMember]:
         """Get company members by role."""
         return await self.get_multi(
@@ -317,7 +403,8 @@ class CRUDTeamMember(CRUDBase[TeamMember, dict, dict]):
                 "company_id": company_id,
                 "role": role,
                 "is_active": True
-            }
+            },
+            cursor=cursor
         )
 
 
@@ -408,13 +495,39 @@ class CRUDSubscription(CRUDBase[Subscription, dict, dict]):
         query = select(Subscription).where(
             and_(
                 Subscription.current_period_end <= datetime.utcnow(),
-                Subscription.is_active.is_(True)
+                Subscription.is_active
             )
         ).offset(skip).limit(limit)
         
         result = await db.execute(query)
         return result.scalars().all()
     
+    async def expire_batch(self, db: AsyncSession, batch_size: int) -> int:
+        """Deactivate up to batch_size lapsed subscriptions and commit; returns rows updated."""
+        from sqlalchemy import update
+        
+        now = datetime.utcnow()
+        lapsed_ids = (
+            select(Subscription.id)
+            .where(
+                and_(
+                    Subscription.is_active,
+                    Subscription.current_period_end <= now
+                )
+            )
+            .order_by(Subscription.current_period_end)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            update(Subscription)
+            .where(Subscription.id.in_(lapsed_ids))
+            .values(is_active=False, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+    
     async def get_subscriptions_by_plan(
         self,
         db: AsyncSession,
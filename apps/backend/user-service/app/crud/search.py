@@ -0,0 +1,111 @@
+"""
+Full-text search for SkillForge AI User Service
+PostgreSQL tsvector + pg_trgm matching with an ILIKE fallback for other databases
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import DDL, Table, case, event, func, literal, literal_column, or_
+
+# Words usable in a prefix tsquery; everything else is dropped
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchConfig:
+    """How a table is searched.
+    
+    ``weighted_fields`` feed the generated tsvector column (weights A-D);
+    ``trigram_fields`` get pg_trgm GIN indexes for fuzzy and infix matches.
+    """
+    
+    weighted_fields: Tuple[Tuple[str, str], ...]
+    trigram_fields: Tuple[str, ...]
+    vector_column: str = "search_vector"
+    text_config: str = "simple"
+    
+    def vector_expression(self) -> str:
+        """SQL for the generated tsvector column."""
+        return " || ".join(
+            f"setweight(to_tsvector('{self.text_config}', coalesce({name}, '')), '{weight}')"
+            for name, weight in self.weighted_fields
+        )
+    
+    def ddl(self, table_name: str) -> List[str]:
+        """Statements adding the search column and indexes to an existing table."""
+        statements = [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {self.vector_column} tsvector "
+            f"GENERATED ALWAYS AS ({self.vector_expression()}) STORED",
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{self.vector_column} "
+            f"ON {table_name} USING gin ({self.vector_column})",
+        ]
+        statements.extend(
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{name}_trgm "
+            f"ON {table_name} USING gin ({name} gin_trgm_ops)"
+            for name in self.trigram_fields
+        )
+        return statements
+
+
+def register_search_ddl(table: Table, config: SearchConfig) -> None:
+    """Add the search column and indexes whenever create_all builds table on PostgreSQL.
+    
+    Migrated databases get the same objects from the Alembic revision.
+    """
+    for statement in config.ddl(table.name):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+def prefix_tsquery(term: str) -> Optional[str]:
+    """Turn user input into 'word:* & word:*' so partial words match."""
+    words = _WORD.findall(term.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def search_clause(
+    model: Any,
+    config: Optional[SearchConfig],
+    term: str,
+    fields: List[str],
+    dialect_name: str
+) -> Tuple[Optional[Any], Optional[Any]]:
+    """Build (condition, rank) for a search term.
+    
+    On PostgreSQL with a config the condition is served by the GIN indexes:
+    a prefix tsquery against the tsvector column or a pg_trgm word
+    similarity / ILIKE match on the trigram fields. Elsewhere it falls back
+    to an ILIKE OR-chain ranked by prefix matches.
+    """
+    columns = [getattr(model, name) for name in fields if hasattr(model, name)]
+    
+    if config is not None and dialect_name == "postgresql":
+        trigram_columns = [getattr(model, name) for name in config.trigram_fields]
+        vector = literal_column(f"{model.__tablename__}.{config.vector_column}")
+        conditions = []
+        rank = literal(0.0)
+        
+        tsquery_text = prefix_tsquery(term)
+        if tsquery_text is not None:
+            tsquery = func.to_tsquery(config.text_config, tsquery_text)
+            conditions.append(vector.op("@@")(tsquery))
+            rank = rank + func.ts_rank_cd(vector, tsquery)
+        
+        for trigram_column in trigram_columns:
+            conditions.append(trigram_column.op("%>")(term))  # word_similarity above threshold
+            conditions.append(trigram_column.ilike(f"%{term}%"))
+        rank = rank + func.greatest(*[
+            func.word_similarity(term, func.coalesce(trigram_column, ""))
+            for trigram_column in trigram_columns
+        ])
+        return or_(*conditions), rank
+    
+    if not columns:
+        return None, None
+    condition = or_(*[col.ilike(f"%{term}%") for col in columns])
+    rank = case((or_(*[col.ilike(f"{term}%") for col in columns]), 1), else_=0)
+    return condition, rank
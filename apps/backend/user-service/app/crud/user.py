@@ -8,15 +8,32 @@ from sqlalchemy import select, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, UnitOfWork
+from app.crud.search import SearchConfig, register_search_ddl
 from app.models.user_simple import User, UserSession, UserSettings, UserRole, UserStatus
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, token_digest, verify_password_async
+from app.core.cache import invalidate_user
+
+
+# Names and usernames rank above email matches
+USER_SEARCH = SearchConfig(
+    weighted_fields=(("username", "A"), ("first_name", "A"), ("last_name", "A"), ("email", "B")),
+    trigram_fields=("username", "first_name", "last_name", "email")
+)
+register_search_ddl(User.__table__, USER_SEARCH)
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     """CRUD operations for User model."""
     
+    search_fields = ["first_name", "last_name", "username", "email"]
+    search_config = USER_SEARCH
+    
+    def skills_condition(self, skills: List[str]):
+        """Match users having any of the given skills."""
+        return User.skills.op("&&")(skills)  # PostgreSQL array overlap operator
+    
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         """Get user by email."""
         result = await db.execute(select(User).where(User.email == email))
@@ -27,8 +44,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         result = await db.execute(select(User).where(User.username == username))
         return result.scalar_one_or_none()
     
-    async def create(self, db: AsyncSession, obj_in: UserCreate) -> User:
-        """Create a new user with hashed password."""
+    def build_user_data(self, obj_in: UserCreate, hashed_password: str) -> Dict[str, Any]:
+        """Column values for a new user from the registration schema."""
         # Generate full name
         full_name = None
         if obj_in.first_name or obj_in.last_name:
@@ -37,19 +54,26 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         # Prepare user data
         user_data = obj_in.model_dump(exclude={"password", "confirm_password"})
         user_data.update({
-            "hashed_password": get_password_hash(obj_in.password),
+            "hashed_password": hashed_password,
             "full_name": full_name,
             "terms_accepted_at": datetime.utcnow(),
             "privacy_policy_accepted_at": datetime.utcnow(),
         })
+        return user_data
+    
+    async def create(self, db: AsyncSession, obj_in: UserCreate) -> User:
+        """Create a new user with hashed password."""
+        user_data = self.build_user_data(
+            obj_in, await get_password_hash_async(obj_in.password)
+        )
         
         db_user = User(**user_data)
         db.add(db_user)
-        await db.commit()
-        await db.refresh(db_user)
+        await db.flush()
         
-        # Create default user settings
-        await self.create_default_settings(db, db_user.id)
+        # Create default user settings in the same commit
+        await self.create_default_settings(db, db_user.id, commit=False)
+        await db.commit()
         
         return db_user
     
@@ -57,9 +81,16 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         self, 
         db: AsyncSession, 
         email: str, 
-        password: str
+        password: str,
+        uow: Optional[UnitOfWork] = None,
+        record_login: bool = True
     ) -> Optional[User]:
-        """Authenticate user with email and password."""
+        """Authenticate user with email and password.
+        
+        On success the login bookkeeping is staged on ``uow`` when given,
+        otherwise it is written immediately as a single UPDATE. Callers that
+        defer it to a background task pass record_login=False.
+        """
         user = await self.get_by_email(db, email)
         if not user:
             return None
@@ -69,14 +100,31 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             return None
         
         # Check password
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             # Increment failed login attempts
             await self.increment_failed_login_attempts(db, user)
             return None
         
+        if not record_login:
+            return user
+        
         # Reset failed login attempts and update last login
-        await self.reset_failed_login_attempts(db, user)
-        await self.update_last_login(db, user)
+        own_uow = uow is None
+        if own_uow:
+            uow = self.unit_of_work(db)
+        
+        self.stage_update(
+            uow,
+            user,
+            {
+                "failed_login_attempts": 0,
+                "account_locked_until": None,
+                "last_login_at": datetime.utcnow()
+            }
+        )
+        
+        if own_uow:
+            await uow.commit()
         
         return user
     
@@ -87,16 +135,18 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         new_password: str
     ) -> User:
         """Update user password."""
-        hashed_password = get_password_hash(new_password)
-        return await self.update(
+        hashed_password = await get_password_hash_async(new_password)
+        user = await self.update(
             db, 
             user, 
             {"hashed_password": hashed_password}
         )
+        invalidate_user(user.id)
+        return user
     
     async def verify_email(self, db: AsyncSession, user: User) -> User:
         """Mark user email as verified."""
-        return await self.update(
+        user = await self.update(
             db,
             user,
             {
@@ -105,6 +155,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 "status": UserStatus.ACTIVE
             }
         )
+        invalidate_user(user.id)
+        return user
     
     async def update_last_login(self, db: AsyncSession, user: User) -> User:
         """Update user's last login timestamp."""
@@ -156,7 +208,9 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         if is_superuser is not None:
             update_data["is_superuser"] = is_superuser
         
-        return await self.update(db, user, update_data)
+        user = await self.update(db, user, update_data)
+        invalidate_user(user.id)
+        return user
     
     async def update_status(
         self, 
@@ -170,7 +224,9 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         if is_active is not None:
             update_data["is_active"] = is_active
         
-        return await self.update(db, user, update_data)
+        user = await self.update(db, user, update_data)
+        invalidate_user(user.id)
+        return user
     
     async def activate_premium(
         self, 
@@ -233,17 +289,18 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         search_term: str,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None
     ) -> List[User]:
         """Search users by name, username, or email."""
-        search_fields = ["first_name", "last_name", "username", "email"]
         return await self.search(
             db,
             search_term,
-            search_fields,
+            self.search_fields,
             skip=skip,
             limit=limit,
-            filters=filters
+            filters=filters,
+            cursor=cursor
         )
     
     async def get_users_by_skills(
@@ -251,16 +308,22 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db: AsyncSession,
         skills: List[str],
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[User]:
         """Get users by skills."""
         query = select(User).where(
             and_(
-                User.is_active.is_(True),
+                User.is_active,  # bare, so PostgreSQL matches the partial index predicate
                 User.status == UserStatus.ACTIVE,
-                User.skills.op("&&")(skills)  # PostgreSQL array overlap operator
+                self.skills_condition(skills)
             )
-        ).offset(skip).limit(limit).order_by(User.created_at.desc())
+        )
+        
+        if cursor is not None:
+            query = self._apply_keyset(query, cursor).limit(limit)
+        else:
+            query = query.offset(skip).limit(limit).order_by(User.created_at.desc())
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -268,10 +331,21 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     async def create_default_settings(
         self, 
         db: AsyncSession, 
-        user_id: UUID
+        user_id: UUID,
+        commit: bool = True
     ) -> UserSettings:
         """Create default settings for a new user."""
-        settings_data = {
+        db_settings = UserSettings(**self.default_settings_data(user_id))
+        db.add(db_settings)
+        await db.flush()
+        if commit:
+            await db.commit()
+        
+        return db_settings
+    
+    def default_settings_data(self, user_id: UUID) -> Dict[str, Any]:
+        """Default settings values for a new user."""
+        return {
             "user_id": user_id,
             "theme": "light",
             "language": "en",
@@ -286,13 +360,6 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             "skill_recommendations": True,
             "custom_settings": {}
         }
-        
-        db_settings = UserSettings(**settings_data)
-        db.add(db_settings)
-        await db.commit()
-        await db.refresh(db_settings)
-        
-        return db_settings
 
 
 class CRUDUserSession(CRUDBase[UserSession, dict, dict]):
@@ -302,18 +369,22 @@ class CRUDUserSession(CRUDBase[UserSession, dict, dict]):
         self,
         db: AsyncSession,
         user_id: UUID,
-        session_token: str,
-        refresh_token: str,
+        session_token_digest: bytes,
+        refresh_token_digest: Optional[bytes],
         expires_at: datetime,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-        device_info: Optional[Dict[str, Any]] = None
+        device_info: Optional[Dict[str, Any]] = None,
+        uow: Optional[UnitOfWork] = None
     ) -> UserSession:
-        """Create a new user session."""
+        """Create a new user session, staged on ``uow`` when given.
+        
+        Only token digests (see token_digest) are stored, never the tokens.
+        """
         session_data = {
             "user_id": user_id,
-            "session_token": session_token,
-            "refresh_token": refresh_token,
+            "session_token_digest": session_token_digest,
+            "refresh_token_digest": refresh_token_digest,
             "expires_at": expires_at,
             "ip_address": ip_address,
             "user_agent": user_agent,
@@ -322,18 +393,27 @@ class CRUDUserSession(CRUDBase[UserSession, dict, dict]):
             "is_active": True
         }
         
+        if uow is not None:
+            return self.stage_create(uow, session_data)
         return await self.create(db, session_data)
     
+    async def digest_exists(self, db: AsyncSession, session_token_digest: bytes) -> bool:
+        """Whether any session, active or not, was created for this access token digest."""
+        result = await db.execute(
+            select(UserSession.id).where(UserSession.session_token_digest == session_token_digest)
+        )
+        return result.first() is not None
+    
     async def get_by_token(
         self, 
         db: AsyncSession, 
         session_token: str
     ) -> Optional[UserSession]:
-        """Get session by token."""
+        """Get active session by access token, through its digest."""
         result = await db.execute(
             select(UserSession).where(
                 and_(
-                    UserSession.session_token == session_token,
+                    UserSession.session_token_digest == token_digest(session_token),
                     UserSession.is_active.is_(True),
                     UserSession.expires_at > datetime.utcnow()
                 )
@@ -346,17 +426,37 @@ class CRUDUserSession(CRUDBase[UserSession, dict, dict]):
         db: AsyncSession, 
         refresh_token: str
     ) -> Optional[UserSession]:
-        """Get session by refresh token."""
+        """Get active session by refresh token, through its digest."""
         result = await db.execute(
             select(UserSession).where(
                 and_(
-                    UserSession.refresh_token == refresh_token,
+                    UserSession.refresh_token_digest == token_digest(refresh_token),
                     UserSession.is_active.is_(True)
                 )
             )
         )
         return result.scalar_one_or_none()
     
+    async def rotate_tokens(
+        self,
+        db: AsyncSession,
+        session: UserSession,
+        session_token: str,
+        refresh_token: str,
+        expires_at: datetime
+    ) -> UserSession:
+        """Point the session at a newly issued token pair."""
+        return await self.update(
+            db,
+            session,
+            {
+                "session_token_digest": token_digest(session_token),
+                "refresh_token_digest": token_digest(refresh_token),
+                "expires_at": expires_at,
+                "last_accessed_at": datetime.utcnow()
+            }
+        )
+    
     async def update_last_accessed(
         self, 
         db: AsyncSession, 
@@ -392,28 +492,48 @@ class CRUDUserSession(CRUDBase[UserSession, dict, dict]):
         """Deactivate all sessions for a user."""
         from sqlalchemy import update
         
+        # Same column filtering as update(): the session model may not track logout_at
+        values = {"is_active": False}
+        if hasattr(UserSession, "logout_at"):
+            values["logout_at"] = datetime.utcnow()
+        
         result = await db.execute(
             update(UserSession).where(
                 and_(
                     UserSession.user_id == user_id,
                     UserSession.is_active.is_(True)
                 )
-            ).values(
-                is_active=False,
-                logout_at=datetime.utcnow()
-            )
+            ).values(**values)
         )
         await db.commit()
         return result.rowcount
     
-    async def cleanup_expired_sessions(self, db: AsyncSession) -> int:
-        """Clean up expired sessions."""
+    async def cleanup_expired_sessions(self, db: AsyncSession, batch_size: int = 1000) -> int:
+        """Clean up expired sessions in primary-key batches; returns rows deleted."""
+        total = 0
+        while True:
+            deleted = await self.delete_expired_batch(db, batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+    
+    async def delete_expired_batch(self, db: AsyncSession, batch_size: int) -> int:
+        """Delete up to batch_size expired sessions, oldest first, and commit.
+        
+        A LIMITed subquery on the expires_at index picks the rows by primary
+        key, so each DELETE touches a bounded number of rows and locks.
+        """
         from sqlalchemy import delete
         
+        expired_ids = (
+            select(UserSession.id)
+            .where(UserSession.expires_at <= datetime.utcnow())
+            .order_by(UserSession.expires_at)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
         result = await db.execute(
-            delete(UserSession).where(
-                UserSession.expires_at <= datetime.utcnow()
-            )
+            delete(UserSession).where(UserSession.id.in_(expired_ids)).execution_options(synchronize_session=False)
         )
         await db.commit()
         return result.rowcount
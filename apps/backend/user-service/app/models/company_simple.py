@@ -5,6 +5,7 @@ Version temporaire pour éviter les erreurs SQLModel
 
 from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 from enum import Enum
 import uuid
@@ -38,6 +39,14 @@ class CompanyProfile(SQLModel, table=True):
     """Company profile simplifié pour éviter les erreurs SQLModel."""
     
     __tablename__ = "company_profiles"
+    __table_args__ = (
+        # Public and verified company listings, newest first (active only)
+        Index(
+            "ix_company_profiles_active_is_verified_created_at",
+            "is_verified", "created_at", "id",
+            postgresql_where=text("is_active")
+        ),
+    )
     
     # Primary Key
     id: uuid.UUID = Field(
@@ -81,6 +90,21 @@ class CompanyProfile(SQLModel, table=True):
 class TeamMember(SQLModel, table=True):
     """Team member association table."""
     __tablename__ = "team_members"
+    __table_args__ = (
+        # Membership checks on every company-scoped request (active only)
+        Index(
+            "ix_team_members_active_company_id_user_id",
+            "company_id", "user_id",
+            postgresql_where=text("is_active")
+        ),
+        # Member listings per company, newest first
+        Index(
+            "ix_team_members_company_id_is_active_created_at",
+            "company_id", "is_active", "created_at", "id"
+        ),
+        # Companies of a user
+        Index("ix_team_members_user_id_is_active", "user_id", "is_active"),
+    )
     
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -110,6 +134,16 @@ class TeamMember(SQLModel, table=True):
 class Subscription(SQLModel, table=True):
     """Subscription model for company plans."""
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        # Latest subscription of a company
+        Index("ix_subscriptions_company_id_created_at", "company_id", "created_at"),
+        # Expired subscription sweeps (active only)
+        Index(
+            "ix_subscriptions_active_current_period_end",
+            "current_period_end",
+            postgresql_where=text("is_active")
+        ),
+    )
     
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
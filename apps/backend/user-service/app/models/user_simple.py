@@ -5,6 +5,7 @@ Version temporaire pour éviter les erreurs SQLModel
 
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index, LargeBinary, text
 from sqlmodel import Field, SQLModel
 from enum import Enum
 import uuid
@@ -39,6 +40,17 @@ class User(SQLModel, table=True):
     """User model simplifié pour éviter les erreurs SQLModel."""
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Active user listings, newest first with (created_at, id) keyset paging;
+        # partial on PostgreSQL, where inactive users never reach the index
+        Index(
+            "ix_users_active_status_created_at",
+            "status", "created_at", "id",
+            postgresql_where=text("is_active")
+        ),
+        # Unfiltered admin listing
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     # Primary Key
     id: uuid.UUID = Field(
@@ -82,6 +94,15 @@ class User(SQLModel, table=True):
 class UserSession(SQLModel, table=True):
     """Session utilisateur pour tracking."""
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        # Logging out every session of a user
+        Index("ix_user_sessions_user_id_is_active", "user_id", "is_active"),
+        # Expired session cleanup
+        Index("ix_user_sessions_expires_at", "expires_at"),
+        # Token lookups by SHA-256 digest (32 bytes) instead of the full JWT
+        Index("ix_user_sessions_session_token_digest", "session_token_digest", unique=True),
+        Index("ix_user_sessions_refresh_token_digest", "refresh_token_digest", unique=True),
+    )
     
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -90,7 +111,8 @@ class UserSession(SQLModel, table=True):
         nullable=False
     )
     user_id: uuid.UUID = Field(foreign_key="users.id", nullable=False)
-    session_token: str = Field(nullable=False, index=True)
+    session_token_digest: bytes = Field(sa_type=LargeBinary(32), nullable=False)
+    refresh_token_digest: Optional[bytes] = Field(default=None, sa_type=LargeBinary(32), nullable=True)
     expires_at: datetime = Field(nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     is_active: bool = Field(default=True, nullable=False)
@@ -247,6 +247,7 @@ class CompanyListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 class CompanyPublicListResponse(BaseModel):
@@ -256,6 +257,7 @@ class CompanyPublicListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 class TeamMemberListResponse(BaseModel):
@@ -265,6 +267,7 @@ class TeamMemberListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 # Company verification schema
@@ -8,8 +8,11 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from uuid import UUID
 
+from app.core.config import get_settings
 from app.models.user_simple import UserRole, UserStatus, UserSkillLevel
 
+settings = get_settings()
+
 
 # Base schemas
 class UserBase(BaseModel):
@@ -158,6 +161,17 @@ class UserPublicResponse(BaseModel):
         from_attributes = True
 
 
+class UserBatchRequest(BaseModel):
+    """Schema for looking up several public profiles at once."""
+    ids: List[UUID] = Field(..., min_length=1, max_length=settings.USER_BATCH_MAX_IDS)
+
+
+class UserBatchResponse(BaseModel):
+    """Schema for batch lookup results, in request order."""
+    users: List[UserPublicResponse]
+    missing: List[UUID]
+
+
 class UserAdminResponse(UserResponse):
     """Schema for admin user response with additional fields."""
     is_superuser: bool
@@ -281,6 +295,7 @@ class UserListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 class UserPublicListResponse(BaseModel):
@@ -289,4 +304,5 @@ class UserPublicListResponse(BaseModel):
     total: int
     page: int
     size: int
-    pages: int
\ No newline at end of file
+    pages: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Background tasks package for SkillForge AI User Service
+"""
+
+from .queue import (
+    TaskQueue,
+    TaskBackend,
+    InlineTaskBackend,
+    AsyncioTaskBackend,
+    CeleryTaskBackend,
+    InMemoryIdempotencyStore,
+    RedisIdempotencyStore,
+    create_task_queue,
+    run_task,
+    task,
+    task_queue
+)
+from . import jobs  # noqa: F401 - registers the tasks
+
+__all__ = [
+    "TaskQueue",
+    "TaskBackend",
+    "InlineTaskBackend",
+    "AsyncioTaskBackend",
+    "CeleryTaskBackend",
+    "InMemoryIdempotencyStore",
+    "RedisIdempotencyStore",
+    "create_task_queue",
+    "run_task",
+    "task",
+    "task_queue",
+]
@@ -0,0 +1,121 @@
+"""
+Background tasks for SkillForge AI User Service
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import user as user_crud, user_session as session_crud
+from app.tasks.queue import task
+from app.utils import email as email_utils
+
+logger = logging.getLogger(__name__)
+audit_logger = logging.getLogger("app.audit")
+
+
+@task("auth.record_login")
+async def record_login(
+    db: AsyncSession,
+    *,
+    user_id: str,
+    logged_in_at: str,
+    session: Optional[Dict[str, Any]] = None
+) -> None:
+    """Write login bookkeeping in one commit.
+    
+    Login now stores its session row itself; ``session`` is still accepted so
+    tasks queued by earlier releases drain. Safe to redeliver: the user update
+    only assigns values, and a session whose digest is already stored is not
+    inserted again.
+    """
+    user = await user_crud.get(db, UUID(user_id))
+    if user is None:
+        return
+    
+    uow = user_crud.unit_of_work(db)
+    user_crud.stage_update(
+        uow,
+        user,
+        {
+            "failed_login_attempts": 0,
+            "account_locked_until": None,
+            "last_login_at": datetime.fromisoformat(logged_in_at)
+        }
+    )
+    digest = bytes.fromhex(session["session_token_digest"]) if session is not None else None
+    if digest is not None and not await session_crud.digest_exists(db, digest):
+        await session_crud.create_session(
+            db,
+            user_id=user.id,
+            session_token_digest=digest,
+            refresh_token_digest=bytes.fromhex(session["refresh_token_digest"]),
+            expires_at=datetime.fromisoformat(session["expires_at"]),
+            ip_address=session.get("ip_address"),
+            user_agent=session.get("user_agent"),
+            device_info=session.get("device_info"),
+            uow=uow
+        )
+    await uow.commit()
+
+
+async def _send(func: Callable[..., bool], *args) -> bool:
+    """Call an email helper without blocking the event loop on inline SMTP."""
+    if email_utils.email_dispatcher.running:
+        # Only queues the message, and the queue lives on this loop
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
+@task("email.verification", uses_db=False)
+async def send_verification_email(*, to_email: str, first_name: str, verification_token: str) -> bool:
+    """Send the email verification link."""
+    return await _send(email_utils.send_verification_email, to_email, first_name, verification_token)
+
+
+@task("email.welcome", uses_db=False)
+async def send_welcome_email(*, to_email: str, first_name: str) -> bool:
+    """Send the welcome email after verification."""
+    return await _send(email_utils.send_welcome_email, to_email, first_name)
+
+
+@task("email.password_reset", uses_db=False)
+async def send_password_reset_email(*, to_email: str, first_name: str, reset_token: str) -> bool:
+    """Send the password reset link."""
+    return await _send(email_utils.send_password_reset_email, to_email, first_name, reset_token)
+
+
+@task("email.team_invitation", uses_db=False)
+async def send_team_invitation_email(
+    *,
+    to_email: str,
+    first_name: str,
+    company_name: str,
+    message: Optional[str] = None
+) -> bool:
+    """Send a team invitation."""
+    return await _send(email_utils.send_team_invitation_email, to_email, first_name, company_name, message)
+
+
+@task("audit.record", uses_db=False)
+async def record_audit_event(
+    *,
+    action: str,
+    actor_id: Optional[str] = None,
+    target_id: Optional[str] = None,
+    occurred_at: Optional[str] = None,
+    details: Optional[Dict[str, Any]] = None
+) -> None:
+    """Write a structured audit record to the app.audit log."""
+    audit_logger.info(json.dumps({
+        "action": action,
+        "actor_id": actor_id,
+        "target_id": target_id,
+        "occurred_at": occurred_at or datetime.utcnow().isoformat(),
+        "details": details or {},
+    }))
@@ -0,0 +1,284 @@
+"""
+Scheduled maintenance for SkillForge AI User Service
+
+Deletes expired sessions and deactivates lapsed subscriptions in bounded
+batches with a pause between them, so cleanup never holds long locks or
+floods the WAL. Runs inside the app lifespan (MAINTENANCE_ENABLED) or on
+its own:
+
+    python -m app.tasks.maintenance          # run forever
+    python -m app.tasks.maintenance --once   # run every job once and exit
+
+With several processes only the holder of a PostgreSQL advisory lock
+runs jobs; other databases have a single process and skip the election.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import MAINTENANCE_DURATION, MAINTENANCE_ROWS
+from app.crud import subscription as subscription_crud, user_session as session_crud
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Processes one batch of at most batch_size rows; returns rows processed
+BatchStep = Callable[[AsyncSession, int], Awaitable[int]]
+
+
+@dataclass
+class MaintenanceJob:
+    """A batched job and how often it runs."""
+    
+    name: str
+    step: BatchStep
+    interval: float
+    next_run: float = 0.0
+
+
+@dataclass
+class JobResult:
+    """Outcome of one job run."""
+    
+    name: str
+    rows: int
+    batches: int
+    duration: float
+
+
+async def run_batched(
+    session_factory: Callable[[], AsyncSession],
+    step: BatchStep,
+    batch_size: int,
+    pause: float = 0.0,
+    max_batches: Optional[int] = None
+) -> tuple:
+    """Call step until it returns a short batch; returns (rows, batches).
+    
+    Every batch gets its own session and commit; pause seconds between
+    batches throttle the write rate and max_batches caps one run.
+    """
+    rows = batches = 0
+    while max_batches is None or batches < max_batches:
+        async with session_factory() as db:
+            processed = await step(db, batch_size)
+        rows += processed
+        batches += 1
+        if processed < batch_size:
+            break
+        if pause:
+            await asyncio.sleep(pause)
+    return rows, batches
+
+
+class AdvisoryLock:
+    """Session-level PostgreSQL advisory lock held on a dedicated connection.
+    
+    The connection runs in autocommit so holding the lock never keeps a
+    transaction open; if it drops, PostgreSQL releases the lock and the
+    next check reports leadership lost.
+    """
+    
+    def __init__(self, engine: AsyncEngine, key: int):
+        self.engine = engine
+        self.key = key
+        self._conn: Optional[AsyncConnection] = None
+        self._held = False
+    
+    @property
+    def held(self) -> bool:
+        """Whether this process currently holds the lock."""
+        return self._held
+    
+    async def acquire(self) -> bool:
+        """Try to take or confirm the lock without waiting."""
+        if self.engine.dialect.name != "postgresql":
+            self._held = True
+            return True
+        
+        if self._conn is not None:
+            try:
+                await self._conn.execute(text("SELECT 1"))
+                return True
+            except Exception as e:
+                logger.warning(f"Maintenance leadership lost: {str(e)}")
+                await self._drop()
+        
+        conn = await self.engine.connect()
+        try:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = (
+                await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key})
+            ).scalar()
+        except Exception:
+            await conn.close()
+            raise
+        
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        self._held = True
+        logger.info("Acquired maintenance leadership")
+        return True
+    
+    async def release(self) -> None:
+        """Give up the lock."""
+        if self._conn is not None:
+            try:
+                await self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            except Exception as e:
+                logger.warning(f"Failed to release maintenance lock: {str(e)}")
+        await self._drop()
+    
+    async def _drop(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._held = False
+
+
+def default_jobs() -> List[MaintenanceJob]:
+    """Jobs configured by the MAINTENANCE_* and *_INTERVAL settings."""
+    return [
+        MaintenanceJob(
+            name="expired_sessions",
+            step=session_crud.delete_expired_batch,
+            interval=settings.SESSION_CLEANUP_INTERVAL,
+        ),
+        MaintenanceJob(
+            name="expired_subscriptions",
+            step=subscription_crud.expire_batch,
+            interval=settings.SUBSCRIPTION_EXPIRY_INTERVAL,
+        ),
+    ]
+
+
+class MaintenanceScheduler:
+    """Runs due maintenance jobs every tick while holding leadership."""
+    
+    def __init__(
+        self,
+        jobs: Optional[List[MaintenanceJob]] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        engine: Optional[AsyncEngine] = None,
+        tick: float = 30.0,
+        batch_size: int = 1000,
+        batch_pause: float = 0.1,
+        max_batches: Optional[int] = None,
+        lock_key: int = 0
+    ):
+        if session_factory is None or engine is None:
+            from app.core.database import SessionLocal, get_engine
+            session_factory = session_factory or SessionLocal
+            engine = engine or get_engine()
+        self.jobs = jobs if jobs is not None else default_jobs()
+        self.session_factory = session_factory
+        self.lock = AdvisoryLock(engine, lock_key)
+        self.tick = tick
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.max_batches = max_batches
+        self._task: Optional[asyncio.Task] = None
+    
+    async def run_job(self, job: MaintenanceJob) -> JobResult:
+        """Run one job now and record the outcome."""
+        started = time.monotonic()
+        rows, batches = await run_batched(
+            self.session_factory, job.step, self.batch_size, self.batch_pause, self.max_batches
+        )
+        duration = time.monotonic() - started
+        
+        MAINTENANCE_ROWS.labels(job=job.name).inc(rows)
+        MAINTENANCE_DURATION.labels(job=job.name).observe(duration)
+        logger.info(f"Maintenance {job.name}: {rows} rows in {batches} batches, {duration:.2f}s")
+        return JobResult(name=job.name, rows=rows, batches=batches, duration=duration)
+    
+    async def run_due(self) -> List[JobResult]:
+        """Run the jobs whose interval has elapsed, if this process is the leader."""
+        if not await self.lock.acquire():
+            return []
+        
+        results = []
+        for job in self.jobs:
+            now = time.monotonic()
+            if job.next_run > now:
+                continue
+            job.next_run = now + job.interval
+            try:
+                results.append(await self.run_job(job))
+            except Exception as e:
+                logger.error(f"Maintenance {job.name} failed: {str(e)}")
+        return results
+    
+    async def run_once(self) -> List[JobResult]:
+        """Run every job immediately, ignoring intervals."""
+        for job in self.jobs:
+            job.next_run = 0.0
+        return await self.run_due()
+    
+    async def run_forever(self) -> None:
+        """Tick until cancelled."""
+        try:
+            while True:
+                try:
+                    await self.run_due()
+                except Exception as e:
+                    logger.error(f"Maintenance tick failed: {str(e)}")
+                await asyncio.sleep(self.tick)
+        finally:
+            await self.lock.release()
+    
+    def start(self) -> None:
+        """Run in the background of the current event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever(), name="maintenance-scheduler")
+    
+    async def stop(self) -> None:
+        """Cancel the background loop and release leadership."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def create_scheduler() -> MaintenanceScheduler:
+    """Build the scheduler from settings."""
+    return MaintenanceScheduler(
+        tick=settings.MAINTENANCE_TICK_SECONDS,
+        batch_size=settings.MAINTENANCE_BATCH_SIZE,
+        batch_pause=settings.MAINTENANCE_BATCH_PAUSE,
+        max_batches=settings.MAINTENANCE_MAX_BATCHES,
+        lock_key=settings.MAINTENANCE_LOCK_ID,
+    )
+
+
+async def main(once: bool = False) -> None:
+    """Standalone entry point."""
+    scheduler = create_scheduler()
+    if once:
+        try:
+            for result in await scheduler.run_once():
+                print(f"{result.name}: {result.rows} rows in {result.batches} batches, {result.duration:.2f}s")
+        finally:
+            await scheduler.lock.release()
+        return
+    await scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    parser = argparse.ArgumentParser(description="Run SkillForge AI user service maintenance jobs")
+    parser.add_argument("--once", action="store_true", help="run every job once and exit")
+    asyncio.run(main(once=parser.parse_args().once))
@@ -0,0 +1,318 @@
+"""
+Background task queue for SkillForge AI User Service
+
+Side effects that do not shape the response (login bookkeeping, emails,
+audit records) are enqueued by name with JSON-serializable arguments and
+run after the response by one of three backends:
+
+- ``asyncio``: in-process workers draining a bounded queue
+- ``celery``: a Celery worker fed through Redis (see app.tasks.worker)
+- ``inline``: runs the task during enqueue; used by the test suite
+
+An optional idempotency key suppresses duplicate enqueues within
+TASK_IDEMPOTENCY_TTL seconds.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Celery task that runs registered tasks by name
+CELERY_TASK_NAME = "user_service.run_task"
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    """A registered task; uses_db tasks receive a fresh session first."""
+    
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    uses_db: bool = True
+
+
+_registry: Dict[str, TaskSpec] = {}
+
+
+def task(name: str, uses_db: bool = True):
+    """Register an async function as a named background task."""
+    def decorator(func):
+        _registry[name] = TaskSpec(name=name, func=func, uses_db=uses_db)
+        return func
+    
+    return decorator
+
+
+def get_task(name: str) -> TaskSpec:
+    """Registered task by name; raises KeyError for unknown names."""
+    try:
+        return _registry[name]
+    except KeyError:
+        raise KeyError(f"Unknown task: {name}") from None
+
+
+async def run_task(name: str, kwargs: Dict[str, Any], session_factory: Optional[Callable] = None) -> Any:
+    """Run a registered task now, in its own database session when it needs one."""
+    spec = get_task(name)
+    if not spec.uses_db:
+        return await spec.func(**kwargs)
+    
+    if session_factory is None:
+        from app.core.database import SessionLocal
+        session_factory = SessionLocal
+    async with session_factory() as db:
+        return await spec.func(db, **kwargs)
+
+
+class IdempotencyStore(ABC):
+    """Remembers claimed idempotency keys for a while."""
+    
+    @abstractmethod
+    async def claim(self, key: str, ttl: int) -> bool:
+        """Claim key; False when it was already claimed and has not expired."""
+    
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Forget key so the task can be enqueued again."""
+    
+    async def close(self) -> None:
+        """Release resources."""
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Per-process key store; enough for the asyncio and inline backends."""
+    
+    def __init__(self, max_keys: int = 100000, ttl: int = 300):
+        self._keys = TTLCache(max_size=max_keys, ttl=ttl)
+    
+    async def claim(self, key: str, ttl: int) -> bool:
+        if self._keys.get(key) is not None:
+            return False
+        self._keys.set(key, True, ttl=ttl)
+        return True
+    
+    async def release(self, key: str) -> None:
+        self._keys.invalidate(key)
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Key store shared by every process through SET NX; errors fail open."""
+    
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "task:"):
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+    
+    async def claim(self, key: str, ttl: int) -> bool:
+        try:
+            return bool(await self.client.set(f"{self.prefix}{key}", 1, nx=True, ex=ttl))
+        except Exception as e:
+            logger.warning(f"Idempotency check failed, enqueueing anyway: {str(e)}")
+            return True
+    
+    async def release(self, key: str) -> None:
+        try:
+            await self.client.delete(f"{self.prefix}{key}")
+        except Exception as e:
+            logger.warning(f"Failed to release idempotency key {key}: {str(e)}")
+    
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class TaskBackend(ABC):
+    """Executes enqueued tasks."""
+    
+    session_factory: Optional[Callable] = None
+    
+    @abstractmethod
+    async def submit(self, name: str, kwargs: Dict[str, Any]) -> None:
+        """Hand a task over for execution."""
+    
+    async def start(self) -> None:
+        """Start workers, if any."""
+    
+    async def close(self) -> None:
+        """Finish or hand off pending work and release resources."""
+    
+    async def _run_logged(self, name: str, kwargs: Dict[str, Any]) -> None:
+        """Run a task, logging instead of raising failures."""
+        try:
+            await run_task(name, kwargs, self.session_factory)
+        except Exception as e:
+            logger.error(f"Background task {name} failed: {str(e)}")
+
+
+class InlineTaskBackend(TaskBackend):
+    """Runs each task to completion inside enqueue."""
+    
+    def __init__(self, raise_errors: bool = False):
+        self.raise_errors = raise_errors
+    
+    async def submit(self, name: str, kwargs: Dict[str, Any]) -> None:
+        if self.raise_errors:
+            await run_task(name, kwargs, self.session_factory)
+        else:
+            await self._run_logged(name, kwargs)
+
+
+class AsyncioTaskBackend(TaskBackend):
+    """In-process workers draining a bounded queue.
+    
+    A full queue makes enqueue wait rather than drop work. Tasks pending at
+    shutdown get up to drain_timeout seconds to finish.
+    """
+    
+    def __init__(self, workers: int = 4, queue_size: int = 10000, drain_timeout: float = 10.0):
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.drain_timeout = drain_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    @property
+    def running(self) -> bool:
+        """Whether workers are consuming the queue."""
+        return bool(self._tasks)
+    
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"task-worker-{index}")
+            for index in range(self.workers)
+        ]
+    
+    async def submit(self, name: str, kwargs: Dict[str, Any]) -> None:
+        if not self.running:
+            # Scripts and one-off commands never start the workers
+            await self._run_logged(name, kwargs)
+            return
+        await self._queue.put((name, kwargs))
+    
+    async def join(self) -> None:
+        """Wait until every queued task has run."""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def _worker(self) -> None:
+        while True:
+            name, kwargs = await self._queue.get()
+            try:
+                await self._run_logged(name, kwargs)
+            finally:
+                self._queue.task_done()
+    
+    async def close(self) -> None:
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Task queue stopped with {self._queue.qsize()} tasks pending")
+        
+        for worker in self._tasks:
+            worker.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+class CeleryTaskBackend(TaskBackend):
+    """Publishes tasks to Celery; app.tasks.worker executes them."""
+    
+    def __init__(self, celery_app: Any = None):
+        if celery_app is None:
+            from app.tasks.worker import celery_app
+        self.celery_app = celery_app
+    
+    async def submit(self, name: str, kwargs: Dict[str, Any]) -> None:
+        # Publishing talks to the broker synchronously
+        await asyncio.to_thread(
+            self.celery_app.send_task, CELERY_TASK_NAME, args=[name, kwargs]
+        )
+
+
+class TaskQueue:
+    """Enqueue named tasks on the configured backend."""
+    
+    def __init__(
+        self,
+        backend: TaskBackend,
+        idempotency: Optional[IdempotencyStore] = None,
+        idempotency_ttl: int = 300
+    ):
+        self.backend = backend
+        self.idempotency = idempotency or InMemoryIdempotencyStore(ttl=idempotency_ttl)
+        self.idempotency_ttl = idempotency_ttl
+    
+    @property
+    def session_factory(self) -> Optional[Callable]:
+        """Session factory tasks run with; defaults to the app's SessionLocal."""
+        return self.backend.session_factory
+    
+    @session_factory.setter
+    def session_factory(self, factory: Optional[Callable]) -> None:
+        self.backend.session_factory = factory
+    
+    async def enqueue(self, name: str, idempotency_key: Optional[str] = None, **kwargs: Any) -> bool:
+        """Defer a task; False when it was a duplicate or could not be handed over.
+        
+        Arguments are converted to JSON types (UUIDs and datetimes become
+        strings), so every backend sees the same payload.
+        """
+        get_task(name)
+        payload = jsonable_encoder(kwargs)
+        
+        key = f"{name}:{idempotency_key}" if idempotency_key else None
+        if key is not None and not await self.idempotency.claim(key, self.idempotency_ttl):
+            logger.debug(f"Skipping duplicate task {key}")
+            return False
+        
+        try:
+            await self.backend.submit(name, payload)
+        except Exception as e:
+            if key is not None:
+                await self.idempotency.release(key)
+            logger.error(f"Failed to enqueue task {name}: {str(e)}")
+            return False
+        return True
+    
+    async def start(self) -> None:
+        """Start the backend's workers."""
+        await self.backend.start()
+    
+    async def close(self) -> None:
+        """Drain the backend and release resources."""
+        await self.backend.close()
+        await self.idempotency.close()
+
+
+def create_task_queue() -> TaskQueue:
+    """Build the task queue configured by TASK_BACKEND; tests always run inline."""
+    backend_name = "inline" if settings.is_testing else settings.TASK_BACKEND
+    ttl = settings.TASK_IDEMPOTENCY_TTL
+    
+    if backend_name == "celery":
+        return TaskQueue(CeleryTaskBackend(), RedisIdempotencyStore(url=settings.REDIS_URL), ttl)
+    if backend_name == "inline":
+        return TaskQueue(InlineTaskBackend(), idempotency_ttl=ttl)
+    return TaskQueue(
+        AsyncioTaskBackend(workers=settings.TASK_WORKERS, queue_size=settings.TASK_QUEUE_SIZE),
+        idempotency_ttl=ttl
+    )
+
+
+# Global task queue instance
+task_queue = create_task_queue()
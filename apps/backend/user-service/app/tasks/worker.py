@@ -0,0 +1,49 @@
+"""
+Celery worker for SkillForge AI User Service background tasks
+
+Used when TASK_BACKEND=celery. Start with:
+    celery -A app.tasks.worker worker --loglevel=info
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from celery import Celery
+
+from app.core.config import get_settings
+from app.tasks import jobs  # noqa: F401 - registers the tasks
+from app.tasks.queue import CELERY_TASK_NAME, run_task
+
+settings = get_settings()
+
+celery_app = Celery("user_service", broker=settings.CELERY_BROKER_URL or settings.REDIS_URL)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    # Redelivered if the worker dies mid-task; every task must be safe to repeat
+    # (auth.record_login skips sessions it already stored)
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+)
+
+# One loop per worker process so pooled database connections stay usable
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
+@celery_app.task(
+    name=CELERY_TASK_NAME,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=settings.TASK_MAX_RETRIES,
+)
+def execute(name: str, kwargs: Dict[str, Any]) -> None:
+    """Run a registered task by name."""
+    _event_loop().run_until_complete(run_task(name, kwargs))
@@ -4,6 +4,7 @@ Test configuration and fixtures for SkillForge AI User Service
 
 import asyncio
 import pytest
+import pytest_asyncio
 from typing import AsyncGenerator, Generator
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
@@ -12,6 +13,11 @@ from sqlalchemy.pool import StaticPool
 from app.core.database import get_session
 from app.models.base import SQLModel
 from app.core.config import get_settings
+from app.tests.query_budget import (  # noqa: F401 - registers the query budget plugin
+    pytest_configure,
+    pytest_runtest_call,
+    query_budget
+)
 
 # Test database URL (use in-memory SQLite for tests)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -39,6 +45,33 @@ TestSessionLocal = async_sessionmaker(
 )
 
 
+@pytest_asyncio.fixture
+async def engine():
+    """Fresh in-memory SQLite database per test, with every table created."""
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Session factory over the per-test database."""
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def session(session_factory) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the per-test database."""
+    async with session_factory() as db:
+        yield db
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -94,6 +127,10 @@ def client(override_get_db) -> Generator[TestClient, None, None]:
     # Override the database dependency
     test_app.dependency_overrides[get_session] = override_get_db
     
+    # Deferred tasks run inline against the test database
+    from app.tasks import task_queue
+    task_queue.session_factory = TestSessionLocal
+    
     # Import and include only necessary routers for testing
     try:
         from app.api.v1 import api_router
@@ -0,0 +1,67 @@
+"""
+Query budget pytest plugin for SkillForge AI User Service
+
+Fails a test when the code under test issues more SQL statements than
+declared, either for the whole test::
+
+    @pytest.mark.query_budget(3)
+    async def test_invite_member(...): ...
+
+or for a block inside it::
+
+    async def test_invite_member(query_budget):
+        with query_budget(3):
+            await invite_team_member(...)
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from app.core.database import instrument_queries
+from app.core.profiling import profile_queries
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries): fail if the test issues more SQL statements"
+    )
+    # Every engine, including ones tests create themselves
+    instrument_queries(Engine)
+
+
+def check_budget(profile, max_queries: int, label: str = "block") -> None:
+    """Fail the current test if profile exceeds max_queries."""
+    if profile.count > max_queries:
+        pytest.fail(
+            f"Query budget exceeded in {label}: {profile.count} > {max_queries}\n"
+            f"{profile.summary()}",
+            pytrace=False
+        )
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager factory enforcing a statement budget on a block."""
+    @contextmanager
+    def budget(max_queries: int):
+        with profile_queries() as profile:
+            yield profile
+        check_budget(profile, max_queries)
+    
+    return budget
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Enforce @pytest.mark.query_budget on the test body, not its fixtures."""
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    
+    with profile_queries() as profile:
+        outcome = yield
+    if outcome.excinfo is None:
+        check_budget(profile, marker.args[0], label=item.name)
@@ -6,6 +6,11 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.endpoints.auth import confirm_password_reset
+from app.core.revocation import RevocationList
+from app.core.security import create_access_token, create_password_reset_token, verify_token
+from app.models.user_simple import User
+from app.schemas.user import PasswordResetConfirm
 from app.tests.conftest import UserFactory, assert_response_error
 
 
@@ -322,4 +327,27 @@ class TestPasswordReset:
         
         # Should return success to prevent email enumeration
         assert response.status_code == 200
-        assert "password reset link has been sent" in response.json()["message"]
\ No newline at end of file
+        assert "password reset link has been sent" in response.json()["message"]
+    
+    @pytest.mark.asyncio
+    async def test_confirm_password_reset_revokes_tokens(self, session: AsyncSession, monkeypatch):
+        """Test tokens issued before a password reset stop verifying."""
+        revocations = RevocationList(sweep_interval=0)
+        monkeypatch.setattr("app.core.security.revocation_list", revocations)
+        monkeypatch.setattr("app.api.v1.endpoints.auth.revocation_list", revocations)
+        user = User(email="reset@example.com", username="reset", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        old_token = create_access_token(user.id)
+        
+        await confirm_password_reset(
+            PasswordResetConfirm(
+                token=create_password_reset_token(user.email),
+                new_password="NewSecureP@ss123",
+                confirm_new_password="NewSecureP@ss123"
+            ),
+            db=session
+        )
+        
+        assert verify_token(old_token) is None
+        assert verify_token(create_access_token(user.id)) is not None
@@ -0,0 +1,131 @@
+"""
+Bulk user import tests for SkillForge AI User Service
+"""
+
+import json
+import pytest
+
+from app.crud import user as user_crud, user_settings as settings_crud
+from app.models.user_simple import User
+from app.utils.bulk_import import (
+    iter_lines,
+    iter_csv_records,
+    iter_ndjson_records,
+    stream_user_import,
+)
+
+
+async def byte_stream(data: bytes, size: int = 7):
+    """Yield data in small chunks, splitting lines and characters arbitrarily."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(aiterator):
+    return [item async for item in aiterator]
+
+
+def ndjson_user(name: str, **overrides) -> str:
+    user = {
+        "email": f"{name}@example.com",
+        "username": name,
+        "password": "ImportPass123!",
+        "terms_accepted": True,
+        "privacy_policy_accepted": True,
+    }
+    user.update(overrides)
+    return json.dumps(user)
+
+
+class TestParsing:
+    """Test incremental CSV / NDJSON parsing."""
+    
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        """Test lines and multi-byte characters survive arbitrary chunking."""
+        data = "première\r\nseconde\nlast".encode()
+        
+        assert await collect(iter_lines(byte_stream(data, size=3))) == ["première", "seconde", "last"]
+    
+    @pytest.mark.asyncio
+    async def test_csv_records(self):
+        """Test header mapping, quoted newlines, list fields and column errors."""
+        data = (
+            'email,username,bio,skills\n'
+            'a@example.com,alice,"Line one\nline two","python;sql"\n'
+            'b@example.com,bob\n'
+        ).encode()
+        
+        records = await collect(iter_csv_records(iter_lines(byte_stream(data))))
+        
+        assert records[0] == (2, {
+            "email": "a@example.com",
+            "username": "alice",
+            "bio": "Line one\nline two",
+            "skills": ["python", "sql"],
+        })
+        assert records[1][0] == 4
+        assert isinstance(records[1][1], ValueError)
+    
+    @pytest.mark.asyncio
+    async def test_ndjson_records(self):
+        """Test blank lines are skipped and bad JSON is reported per line."""
+        data = b'{"a": 1}\n\n{broken\n'
+        
+        records = await collect(iter_ndjson_records(iter_lines(byte_stream(data))))
+        
+        assert records[0] == (1, {"a": 1})
+        assert records[1][0] == 3 and isinstance(records[1][1], ValueError)
+
+    
+    @pytest.mark.asyncio
+    async def test_invalid_utf8_fails_only_its_row(self):
+        """Test undecodable bytes become a per-row error instead of aborting the stream."""
+        ndjson = b'{"a": 1}\n{"a": "\xff"}\n{"a": 3}\n'
+        csv_data = b'email,username\na@example.com,al\xe9\nb@example.com,bob\n'
+        
+        ndjson_records = await collect(iter_ndjson_records(iter_lines(byte_stream(ndjson))))
+        csv_records = await collect(iter_csv_records(iter_lines(byte_stream(csv_data))))
+        
+        assert [line for line, _ in ndjson_records] == [1, 2, 3]
+        assert str(ndjson_records[1][1]) == "Invalid UTF-8"
+        assert str(csv_records[0][1]) == "Invalid UTF-8"
+        assert csv_records[1] == (3, {"email": "b@example.com", "username": "bob"})
+
+
+class TestStreamUserImport:
+    """Test the chunked import pipeline."""
+    
+    @pytest.mark.asyncio
+    async def test_per_row_report(self, session):
+        """Test created, failed and skipped rows are each reported."""
+        data = "\n".join([
+            ndjson_user("anna"),
+            ndjson_user("bad", email="not-an-email"),
+            ndjson_user("anna", email="other@example.com"),  # duplicate username
+            ndjson_user("carl"),
+        ]).encode()
+        records = iter_ndjson_records(iter_lines(byte_stream(data)))
+        
+        report = await collect(stream_user_import(session, records, chunk_size=2))
+        
+        statuses = {item["line"]: item["status"] for item in report if "line" in item}
+        assert statuses == {1: "created", 2: "failed", 3: "skipped", 4: "created"}
+        assert report[-1] == {"summary": {"created": 2, "skipped": 1, "failed": 1}}
+        
+        anna = await user_crud.get_by_username(session, "anna")
+        assert anna.hashed_password.startswith("$2")
+        assert await settings_crud.count(session) == 2
+        assert await user_crud.count(session) == 2
+    
+    @pytest.mark.asyncio
+    async def test_existing_users_skipped(self, session):
+        """Test rows matching existing users are skipped without hashing."""
+        session.add(User(email="dora@example.com", username="dora", hashed_password="x"))
+        await session.commit()
+        records = iter_ndjson_records(iter_lines(byte_stream(ndjson_user("dora").encode())))
+        
+        report = await collect(stream_user_import(session, records))
+        
+        assert report[0]["status"] == "skipped"
+        assert report[-1]["summary"]["skipped"] == 1
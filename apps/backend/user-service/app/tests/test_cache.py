@@ -0,0 +1,92 @@
+"""
+Cache tests for SkillForge AI User Service
+"""
+
+import time
+import pytest
+from fastapi import HTTPException
+
+from app.api.dependencies import get_current_user_snapshot
+from app.core.cache import TTLCache, UserSnapshot, user_cache
+from app.crud import user as user_crud
+from app.models.user_simple import User, UserStatus
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    yield
+    user_cache.clear()
+
+
+class TestTTLCache:
+    """Test the TTL + LRU cache."""
+    
+    def test_hit_and_miss_counters(self):
+        """Test lookups are counted as hits or misses."""
+        cache = TTLCache(max_size=10, ttl=60)
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+        assert cache.stats["hit_ratio"] == 0.5
+    
+    def test_entries_expire(self):
+        """Test entries are dropped once their TTL passes."""
+        cache = TTLCache(max_size=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used entry is evicted at capacity."""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+
+class TestUserSnapshotCache:
+    """Test the cached current-user dependency."""
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_served_from_cache(self, session):
+        """Test a second lookup does not need the database row."""
+        user = User(email="cache@example.com", username="cacheuser", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        token_data = {"sub": str(user.id)}
+        
+        snapshot = await get_current_user_snapshot(session, token_data)
+        assert isinstance(snapshot, UserSnapshot)
+        assert snapshot.email == "cache@example.com"
+        
+        await session.delete(user)
+        await session.commit()
+        
+        assert await get_current_user_snapshot(session, token_data) == snapshot
+        assert user_cache.stats["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_status_change_invalidates(self, session):
+        """Test deactivating a user evicts the cached snapshot."""
+        user = User(email="inval@example.com", username="invaluser", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        token_data = {"sub": str(user.id)}
+        
+        await get_current_user_snapshot(session, token_data)
+        await user_crud.update_status(session, user, UserStatus.INACTIVE, is_active=False)
+        
+        assert user_cache.get(user.id) is None
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user_snapshot(session, token_data)
+        assert exc_info.value.status_code == 401
@@ -0,0 +1,149 @@
+"""
+Company access decision cache tests for SkillForge AI User Service
+"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app.api.dependencies import get_company_access, get_user_company
+from app.core.cache import CompanyAccess, UserSnapshot, company_access_cache, invalidate_company_access
+from app.core.profiling import profile_queries
+from app.crud import company as company_crud, team_member as member_crud
+from app.models.company_simple import CompanyProfile
+from app.models.user_simple import User, UserRole
+
+
+@pytest.fixture(autouse=True)
+def clear_company_access_cache():
+    company_access_cache.clear()
+    yield
+    company_access_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def seeded(session_factory):
+    """A company with one manager member; returns (company_id, manager, outsider)."""
+    async with session_factory() as db:
+        manager = User(email="manager@example.com", username="manager", hashed_password="x")
+        outsider = User(email="outsider@example.com", username="outsider", hashed_password="x")
+        company = CompanyProfile(name="Acme", slug="acme")
+        db.add_all([manager, outsider, company])
+        await db.flush()
+        await member_crud.add_member(db, company_id=company.id, user_id=manager.id, role="manager")
+    
+    return company.id, snapshot(manager), snapshot(outsider)
+
+
+def snapshot(user: User) -> UserSnapshot:
+    return UserSnapshot(
+        id=user.id,
+        email=user.email,
+        role=UserRole.USER,
+        is_active=True,
+        is_verified=True,
+        is_superuser=False,
+    )
+
+
+class TestCompanyAccess:
+    """Test decision building and invalidation."""
+    
+    def test_decision_flags(self):
+        """Test members and managers are told apart."""
+        company = CompanyProfile(id=uuid.uuid4(), name="Acme", slug="acme", is_active=True)
+        user_id = uuid.uuid4()
+        
+        outsider = CompanyAccess.build(company, None, user_id)
+        member = CompanyAccess(company.id, user_id, True, False, uuid.uuid4(), "member")
+        manager = CompanyAccess(company.id, user_id, True, False, uuid.uuid4(), "manager")
+        
+        assert not outsider.allowed
+        assert member.allowed and not member.can_manage_members
+        assert manager.can_manage_members
+    
+    def test_invalidate_whole_company(self):
+        """Test company-wide invalidation keeps other companies' decisions."""
+        company_id, other_id = uuid.uuid4(), uuid.uuid4()
+        for user_id in (uuid.uuid4(), uuid.uuid4()):
+            company_access_cache.set((user_id, company_id), "decision")
+        company_access_cache.set((uuid.uuid4(), other_id), "decision")
+        
+        invalidate_company_access(company_id)
+        
+        assert len(company_access_cache) == 1
+        company_access_cache.clear()
+
+
+class TestCompanyAccessDependencies:
+    """Test query counts and invalidation through the dependencies."""
+    
+    @pytest.mark.asyncio
+    async def test_one_query_per_request(self, session_factory, seeded):
+        """Test a cold request costs one query and warm requests at most one."""
+        company_id, manager, _ = seeded
+        
+        async with session_factory() as db:
+            with profile_queries() as cold:
+                company = await get_user_company(company_id, db, manager)
+                access = await get_company_access(company_id, db, manager)
+        assert company.name == "Acme" and access.role == "manager"
+        assert cold.count == 1
+        
+        async with session_factory() as db:
+            with profile_queries() as warm_access:
+                await get_company_access(company_id, db, manager)
+            with profile_queries() as warm_company:
+                first = await get_user_company(company_id, db, manager)
+                second = await get_user_company(company_id, db, manager)
+        assert first is second
+        assert warm_access.count == 0
+        assert warm_company.count == 1
+    
+    @pytest.mark.asyncio
+    async def test_denied_then_added(self, session_factory, seeded):
+        """Test adding a member drops the cached denial."""
+        company_id, _, outsider = seeded
+        
+        async with session_factory() as db:
+            with pytest.raises(HTTPException) as exc_info:
+                await get_company_access(company_id, db, outsider)
+            assert exc_info.value.status_code == 403
+            
+            await member_crud.add_member(db, company_id=company_id, user_id=outsider.id, role="member")
+            access = await get_company_access(company_id, db, outsider)
+        
+        assert access.role == "member"
+    
+    @pytest.mark.asyncio
+    async def test_role_change_and_removal(self, session_factory, seeded):
+        """Test role updates and removal are seen by the next check."""
+        company_id, manager, _ = seeded
+        
+        async with session_factory() as db:
+            assert (await get_company_access(company_id, db, manager)).can_manage_members
+            member = await member_crud.get_by_company_and_user(db, company_id, manager.id)
+            
+            await member_crud.update_member_role(db, member, "member")
+            assert not (await get_company_access(company_id, db, manager)).can_manage_members
+            
+            await member_crud.remove_member(db, member)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_company_access(company_id, db, manager)
+            assert exc_info.value.status_code == 403
+    
+    @pytest.mark.asyncio
+    async def test_company_deactivation(self, session_factory, seeded):
+        """Test a deactivated company is no longer reachable through the cache."""
+        company_id, manager, _ = seeded
+        
+        async with session_factory() as db:
+            company = await get_user_company(company_id, db, manager)
+            await company_crud.update(db, company, {"is_active": False})
+        
+        async with session_factory() as db:
+            with pytest.raises(HTTPException) as exc_info:
+                await get_company_access(company_id, db, manager)
+        assert exc_info.value.status_code == 404
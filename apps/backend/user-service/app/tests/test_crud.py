@@ -0,0 +1,438 @@
+"""
+CRUD base tests for SkillForge AI User Service
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+from uuid import uuid4
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase, ConflictPolicy, UnitOfWork, InvalidCursorError, encode_cursor, decode_cursor
+from app.core.security import token_digest
+from app.models.user_simple import User, UserSession
+
+
+async def seed_users(db: AsyncSession, count: int):
+    """Insert users with distinct, increasing created_at values."""
+    base_time = datetime(2024, 1, 1)
+    users = [
+        User(
+            email=f"user{i}@example.com",
+            username=f"user{i}",
+            hashed_password="x",
+            first_name=f"User{i}",
+            created_at=base_time + timedelta(minutes=i // 2),  # pairs share created_at
+        )
+        for i in range(count)
+    ]
+    db.add_all(users)
+    await db.commit()
+    return users
+
+
+def record_statements(db: AsyncSession) -> List[str]:
+    """Collect SQL statements executed on the session's engine."""
+    statements = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestCursorCodec:
+    """Test opaque cursor encoding."""
+    
+    def test_round_trip(self):
+        """Test cursor encodes and decodes the keyset position."""
+        from uuid import uuid4
+        created_at, id = datetime(2024, 5, 1, 12, 30), uuid4()
+        
+        assert decode_cursor(encode_cursor(created_at, id)) == (created_at, id)
+    
+    def test_invalid_cursor(self):
+        """Test garbage cursors are rejected."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor")
+
+
+class TestKeysetPagination:
+    """Test cursor pagination in CRUDBase."""
+    
+    @pytest.mark.asyncio
+    async def test_get_multi_cursor_walks_all_rows(self, session):
+        """Test walking pages with cursors returns every row exactly once."""
+        await seed_users(session, 7)
+        crud = CRUDBase(User)
+        
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            page = await crud.get_multi(session, limit=3, cursor=cursor)
+            seen.extend(user.username for user in page)
+            cursor = crud.next_cursor(page, 3)
+        
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+        assert seen[-1] in ("user0", "user1")  # oldest rows come last
+    
+    @pytest.mark.asyncio
+    async def test_search_cursor(self, session):
+        """Test cursor pagination through search results."""
+        await seed_users(session, 5)
+        crud = CRUDBase(User)
+        
+        first = await crud.search(session, "user", ["username"], limit=2, cursor="")
+        second = await crud.search(
+            session, "user", ["username"], limit=2, cursor=crud.next_cursor(first, 2)
+        )
+        
+        assert len(first) == 2 and len(second) == 2
+        assert not {u.id for u in first} & {u.id for u in second}
+    
+    @pytest.mark.asyncio
+    async def test_cursor_rejects_other_ordering(self, session):
+        """Test cursor mode refuses orderings it cannot seek on."""
+        crud = CRUDBase(User)
+        
+        with pytest.raises(InvalidCursorError):
+            await crud.get_multi(session, order_by="username", cursor="")
+
+
+class TestGetMany:
+    """Test fetching records by a list of ids."""
+    
+    @pytest.mark.asyncio
+    async def test_one_query_in_input_order(self, session):
+        """Test results follow the input order, with None for missing ids."""
+        users = await seed_users(session, 4)
+        crud = CRUDBase(User)
+        missing = uuid4()
+        ids = [users[2].id, missing, users[0].id, users[2].id]
+        statements = record_statements(session)
+        
+        result = await crud.get_many(session, ids)
+        
+        assert len(statements) == 1
+        assert " IN " in statements[0]
+        assert [user.username if user else None for user in result] == ["user2", None, "user0", "user2"]
+    
+    @pytest.mark.asyncio
+    async def test_empty(self, session):
+        statements = record_statements(session)
+        
+        assert await CRUDBase(User).get_many(session, []) == []
+        assert statements == []
+
+
+class TestGetPage:
+    """Test combined page + total queries."""
+    
+    @pytest.mark.asyncio
+    async def test_items_and_total(self, session):
+        """Test get_page returns the page and the full filtered total."""
+        await seed_users(session, 7)
+        crud = CRUDBase(User)
+        
+        items, total = await crud.get_page(session, skip=2, limit=3, order_by="username")
+        
+        assert total == 7
+        assert [u.username for u in items] == ["user2", "user3", "user4"]
+    
+    @pytest.mark.asyncio
+    async def test_total_with_filters_and_search(self, session):
+        """Test the total honours filters and search terms."""
+        await seed_users(session, 12)
+        crud = CRUDBase(User)
+        
+        items, total = await crud.get_page(
+            session,
+            limit=2,
+            filters={"is_active": True},
+            search_term="user1",
+            search_fields=["username"],
+        )
+        
+        assert total == 3  # user1, user10, user11
+        assert len(items) == 2
+    
+    @pytest.mark.asyncio
+    async def test_total_with_cursor(self, session):
+        """Test the total is not narrowed by the cursor position."""
+        await seed_users(session, 7)
+        crud = CRUDBase(User)
+        
+        first, total = await crud.get_page(session, limit=3, cursor="")
+        second, second_total = await crud.get_page(
+            session, limit=3, cursor=crud.next_cursor(first, 3)
+        )
+        
+        assert total == second_total == 7
+        assert not {u.id for u in first} & {u.id for u in second}
+    
+    @pytest.mark.asyncio
+    async def test_total_past_end(self, session):
+        """Test an empty page past the end still reports the total."""
+        await seed_users(session, 4)
+        crud = CRUDBase(User)
+        
+        items, total = await crud.get_page(session, skip=10, limit=3)
+        
+        assert items == []
+        assert total == 4
+    
+    @pytest.mark.asyncio
+    async def test_estimate_unavailable_on_sqlite(self, session):
+        """Test estimates fall back to exact counts off PostgreSQL."""
+        await seed_users(session, 3)
+        crud = CRUDBase(User)
+        
+        assert await crud.estimate_count(session) is None
+        items, total = await crud.get_page(session, limit=2, estimate_total=True)
+        assert total == 3
+
+
+class TestUnitOfWork:
+    """Test batched writes through a unit of work."""
+    
+    @pytest.mark.asyncio
+    async def test_merged_update_and_insert_in_one_commit(self, session):
+        """Test staged changes become one UPDATE ... RETURNING plus one INSERT."""
+        (user,) = await seed_users(session, 1)
+        user_crud = CRUDBase(User)
+        session_crud = CRUDBase(UserSession)
+        statements = record_statements(session)
+        
+        async with user_crud.unit_of_work(session) as uow:
+            user_crud.stage_update(uow, user, {"first_name": "Staged"})
+            user_crud.stage_update(uow, user, {"bio": "Merged"})
+            new_session = session_crud.stage_create(uow, {
+                "user_id": user.id,
+                "session_token_digest": token_digest("access"),
+                "expires_at": datetime.utcnow() + timedelta(hours=1),
+            })
+        
+        writes = [s.split()[0] for s in statements if s.split()[0] in ("UPDATE", "INSERT", "SELECT")]
+        assert writes == ["UPDATE", "INSERT"]
+        assert "RETURNING" in statements[0]
+        assert (user.first_name, user.bio) == ("Staged", "Merged")
+        assert user.updated_at is not None
+        assert await session_crud.get(session, new_session.id) is not None
+    
+    @pytest.mark.asyncio
+    async def test_error_discards_staged_changes(self, session):
+        """Test nothing is written when the block raises."""
+        (user,) = await seed_users(session, 1)
+        user_crud = CRUDBase(User)
+        
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(session) as uow:
+                user_crud.stage_update(uow, user, {"first_name": "Never"})
+                raise RuntimeError("abort")
+        
+        await session.refresh(user)
+        assert user.first_name == "User0"
+
+
+class TestWriteRoundTrips:
+    """Benchmark statements per write against the old commit + refresh pattern."""
+    
+    @staticmethod
+    def round_trips(statements: List[str]) -> int:
+        return sum(1 for s in statements if s.split()[0] in ("SELECT", "INSERT", "UPDATE"))
+    
+    @pytest.mark.asyncio
+    async def test_create_and_update(self, session):
+        """Test create and update each cost one statement instead of two."""
+        crud = CRUDBase(User)
+        statements = record_statements(session)
+        
+        # Before: add/commit/refresh, then setattr/commit/refresh
+        legacy = User(email="legacy@example.com", username="legacy", hashed_password="x")
+        session.add(legacy)
+        await session.commit()
+        await session.refresh(legacy)
+        legacy.bio = "updated"
+        session.add(legacy)
+        await session.commit()
+        await session.refresh(legacy)
+        before = self.round_trips(statements)
+        statements.clear()
+        
+        user = await crud.create(
+            session, {"email": "new@example.com", "username": "newuser", "hashed_password": "x"}
+        )
+        await crud.update(session, user, {"bio": "updated"})
+        after = self.round_trips(statements)
+        
+        assert (before, after) == (4, 2)
+        assert "RETURNING" in statements[-1]
+        assert user.bio == "updated"
+    
+    @pytest.mark.asyncio
+    async def test_bulk_create(self, session):
+        """Test bulk_create no longer refreshes each row."""
+        crud = CRUDBase(User)
+        statements = record_statements(session)
+        
+        # Before: add_all/commit, then refresh every row
+        legacy = [
+            User(email=f"legacy{i}@example.com", username=f"legacy{i}", hashed_password="x")
+            for i in range(20)
+        ]
+        session.add_all(legacy)
+        await session.commit()
+        for user in legacy:
+            await session.refresh(user)
+        before = self.round_trips(statements)
+        statements.clear()
+        
+        users = await crud.bulk_create(session, [
+            {"email": f"bulk{i}@example.com", "username": f"bulk{i}", "hashed_password": "x"}
+            for i in range(20)
+        ])
+        after = self.round_trips(statements)
+        
+        assert (before, after) == (21, 1)
+        assert await crud.count(session) == 40
+        assert all(u.created_at is not None for u in users)
+    
+    @pytest.mark.asyncio
+    async def test_deferred_commit(self, session):
+        """Test commit=False leaves the transaction to the caller."""
+        crud = CRUDBase(User)
+        
+        user = await crud.create(
+            session,
+            {"email": "deferred@example.com", "username": "deferred", "hashed_password": "x"},
+            commit=False
+        )
+        await crud.update(session, user, {"bio": "pending"}, commit=False)
+        await session.rollback()
+        
+        assert await crud.count(session) == 0
+
+
+def user_rows(count: int, prefix: str = "bulk"):
+    """Plain dict rows for bulk ingestion."""
+    return [
+        {"email": f"{prefix}{i}@example.com", "username": f"{prefix}{i}", "hashed_password": "x"}
+        for i in range(count)
+    ]
+
+
+class TestBulkIngest:
+    """Test chunked multi-row inserts and upserts."""
+    
+    @pytest.mark.asyncio
+    async def test_chunked_insert(self, session):
+        """Test rows are written in one multi-row INSERT per chunk."""
+        crud = CRUDBase(User)
+        statements = record_statements(session)
+        
+        result = await crud.bulk_ingest(session, iter(user_rows(25)), chunk_size=10)
+        
+        assert sum(1 for s in statements if s.startswith("INSERT")) == 3
+        assert result.inserted == 25 and result.skipped == 0
+        assert await crud.count(session) == 25
+        assert (await crud.get(session, result.ids[7])).username == "bulk7"
+    
+    @pytest.mark.asyncio
+    async def test_skip_conflicts(self, session):
+        """Test SKIP leaves existing rows and in-batch duplicates alone."""
+        crud = CRUDBase(User)
+        await seed_users(session, 2)
+        rows = user_rows(3, prefix="user") + user_rows(1, prefix="user")  # user0..2, user0 again
+        
+        result = await crud.bulk_ingest(
+            session, rows, on_conflict={"email": ConflictPolicy.SKIP, "username": "skip"}
+        )
+        
+        assert result.created == [False, False, True, False]
+        assert result.skipped == 3
+        assert await crud.count(session) == 3
+    
+    @pytest.mark.asyncio
+    async def test_skip_does_not_swallow_error_columns(self, session):
+        """Test a SKIP column leaves conflicts on ERROR columns raising."""
+        crud = CRUDBase(User)
+        await seed_users(session, 1)
+        rows = [{"email": "other@example.com", "username": "user0", "hashed_password": "x"}]
+        
+        with pytest.raises(IntegrityError):
+            await crud.bulk_ingest(
+                session, rows, on_conflict={"email": ConflictPolicy.SKIP, "username": ConflictPolicy.ERROR}
+            )
+    
+    @pytest.mark.asyncio
+    async def test_skip_keeps_null_keys(self, session):
+        """Test rows with a NULL conflict key are not deduplicated against each other."""
+        crud = CRUDBase(UserSession)
+        (user,) = await seed_users(session, 1)
+        rows = [
+            {"user_id": user.id, "session_token_digest": token_digest(f"s{i}"), "expires_at": datetime.utcnow()}
+            for i in range(3)
+        ]
+        
+        result = await crud.bulk_ingest(
+            session, rows, on_conflict={"refresh_token_digest": ConflictPolicy.SKIP}
+        )
+        
+        assert result.created == [True, True, True]
+        assert await crud.count(session) == 3
+    
+    @pytest.mark.asyncio
+    async def test_update_conflicts(self, session):
+        """Test UPDATE overwrites the existing row and reports its id."""
+        crud = CRUDBase(User)
+        (existing,) = await seed_users(session, 1)
+        rows = [
+            {"email": "user0@example.com", "username": "user0", "hashed_password": "x", "bio": "upserted"},
+            {"email": "fresh@example.com", "username": "fresh", "hashed_password": "x"},
+        ]
+        
+        result = await crud.bulk_ingest(
+            session, rows, on_conflict={"email": ConflictPolicy.UPDATE}, update_fields=["bio"]
+        )
+        
+        assert result.ids[0] == existing.id
+        assert result.created == [False, True]
+        assert (result.inserted, result.updated) == (1, 1)
+        await session.refresh(existing)
+        assert existing.bio == "upserted"
+    
+    @pytest.mark.asyncio
+    async def test_update_keeps_omitted_columns(self, session):
+        """Test UPDATE without update_fields leaves columns the rows omit untouched."""
+        crud = CRUDBase(User)
+        (existing,) = await seed_users(session, 1)
+        existing.bio = "original bio"
+        existing.timezone = "Europe/Paris"
+        await session.commit()
+        rows = [
+            {"email": "user0@example.com", "username": "user0", "hashed_password": "x", "first_name": "Renamed"},
+            {"email": "user1@example.com", "username": "user1", "hashed_password": "x", "bio": "new bio"},
+        ]
+        
+        result = await crud.bulk_ingest(session, rows, on_conflict={"email": ConflictPolicy.UPDATE})
+        
+        assert result.ids[0] == existing.id
+        assert result.created == [False, True]
+        await session.refresh(existing)
+        assert existing.first_name == "Renamed"
+        assert existing.bio == "original bio"
+        assert existing.timezone == "Europe/Paris"
+    
+    @pytest.mark.asyncio
+    async def test_single_update_column(self, session):
+        """Test only one column may use the UPDATE policy."""
+        crud = CRUDBase(User)
+        
+        with pytest.raises(ValueError):
+            await crud.bulk_ingest(
+                session, user_rows(1), on_conflict={"email": "update", "username": "update"}
+            )
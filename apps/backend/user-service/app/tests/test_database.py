@@ -0,0 +1,70 @@
+"""
+Database engine and connection pool tests for SkillForge AI User Service
+"""
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import InstrumentedQueuePool, enable_idle_pre_ping, instrument_pool
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File-backed SQLite engine on the instrumented queue pool."""
+    return create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+    )
+
+
+class TestPoolInstrumentation:
+    """Test pool event listeners and checkout metrics."""
+    
+    @pytest.mark.asyncio
+    async def test_checkout_metrics(self, engine):
+        """Test checkouts, wait time, hold time and connection age are recorded."""
+        instrument_pool(engine)
+        checkouts = sample("db_pool_checkouts_total")
+        waits = sample("db_pool_checkout_wait_seconds_count")
+        holds = sample("db_pool_checkout_duration_seconds_count")
+        connects = sample("db_pool_connections_total", event="connect")
+        
+        for _ in range(3):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                assert sample("db_pool_checked_out") >= 1
+        await engine.dispose()
+        
+        assert sample("db_pool_checkouts_total") - checkouts == 3
+        assert sample("db_pool_checkout_wait_seconds_count") - waits == 3
+        assert sample("db_pool_checkout_duration_seconds_count") - holds == 3
+        assert sample("db_pool_connections_total", event="connect") - connects == 1
+    
+    @pytest.mark.asyncio
+    async def test_idle_pre_ping_replaces_dead_connection(self, engine, monkeypatch):
+        """Test an idle connection failing its ping is swapped for a fresh one."""
+        enable_idle_pre_ping(engine, idle_seconds=0)
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        
+        pings = []
+        
+        def failing_ping(dbapi_connection):
+            pings.append(dbapi_connection)
+            raise ConnectionError("server closed the connection")
+        
+        monkeypatch.setattr(engine.sync_engine.dialect, "do_ping", failing_ping)
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+        await engine.dispose()
+        
+        # Only the idle connection was pinged; its replacement was used as-is
+        assert len(pings) == 1
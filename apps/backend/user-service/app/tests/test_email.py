@@ -0,0 +1,280 @@
+"""
+Email delivery tests for SkillForge AI User Service
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.utils.email import EmailDispatcher, EmailService, SMTPConnectionPool
+from app.utils.email_templates import BUILTIN_TEMPLATES, TemplateRegistry
+
+
+class FakeSMTPServer:
+    """Minimal asyncio SMTP server recording delivered messages.
+    
+    Recipients starting with "reject" get a permanent 550; the first
+    temp_failures DATA commands get a transient 451.
+    """
+    
+    def __init__(self, temp_failures: int = 0):
+        self.temp_failures = temp_failures
+        self.messages = []
+        self.connections = 0
+        self.commands = []
+        self._server = None
+        self.port = None
+    
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+    
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        
+        async def reply(line):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+        
+        await reply("220 fake ESMTP")
+        recipients = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            self.commands.append(verb)
+            
+            if verb in ("EHLO", "HELO"):
+                await reply("250 fake")
+            elif verb == "MAIL":
+                recipients = []
+                await reply("250 OK")
+            elif verb == "RCPT":
+                if "<reject" in command:
+                    await reply("550 No such user")
+                else:
+                    recipients.append(command)
+                    await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := await reader.readline()) != b".\r\n":
+                    data.append(chunk)
+                if self.temp_failures:
+                    self.temp_failures -= 1
+                    await reply("451 Try again later")
+                else:
+                    self.messages.append(b"".join(data))
+                    await reply("250 Queued")
+            elif verb in ("RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Not implemented")
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def smtp_server():
+    """Fake SMTP server on a free local port."""
+    server = FakeSMTPServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+def make_dispatcher(port: int, **kwargs) -> EmailDispatcher:
+    pool = SMTPConnectionPool("127.0.0.1", port, tls=False, size=2, timeout=5)
+    options = {"workers": 2, "batch_size": 10, "backoff": 0.01}
+    options.update(kwargs)
+    return EmailDispatcher(EmailService(pool=pool), **options)
+
+
+def build(dispatcher: EmailDispatcher, recipients):
+    return [
+        dispatcher.service.build_message(to_email, "Hello", "<p>Hi</p>", "Hi")
+        for to_email in recipients
+    ]
+
+
+class TestEmailDispatcher:
+    """Test queued delivery against a fake SMTP server."""
+    
+    @pytest.mark.asyncio
+    async def test_bulk_send_reuses_pooled_connections(self, smtp_server):
+        """Test many messages go out over at most pool-size connections."""
+        dispatcher = make_dispatcher(smtp_server.port)
+        dispatcher.start()
+        try:
+            recipients = [f"user{i}@example.com" for i in range(45)]
+            assert await dispatcher.submit_many(build(dispatcher, recipients)) == 45
+            await dispatcher.join()
+        finally:
+            await dispatcher.stop()
+        
+        assert len(smtp_server.messages) == 45
+        assert dispatcher.stats["sent"] == 45
+        assert smtp_server.connections <= 2
+        assert smtp_server.commands.count("EHLO") == smtp_server.connections
+    
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_retried(self, smtp_server):
+        """Test a 451 reply retries only the unsent rest of the batch."""
+        smtp_server.temp_failures = 1
+        dispatcher = make_dispatcher(smtp_server.port, workers=1)
+        
+        await dispatcher.deliver(build(dispatcher, ["a@example.com", "b@example.com", "c@example.com"]))
+        
+        assert len(smtp_server.messages) == 3
+        assert dispatcher.stats == {"sent": 3, "failed": 0, "retried": 1, "dropped": 0}
+        await asyncio.to_thread(dispatcher.service.pool.close)
+    
+    @pytest.mark.asyncio
+    async def test_permanent_rejection_is_not_retried(self, smtp_server):
+        """Test a rejected recipient is dropped while the batch continues."""
+        dispatcher = make_dispatcher(smtp_server.port)
+        
+        await dispatcher.deliver(build(dispatcher, ["a@example.com", "reject@example.com", "b@example.com"]))
+        
+        assert len(smtp_server.messages) == 2
+        assert dispatcher.stats["failed"] == 1
+        assert dispatcher.stats["retried"] == 0
+        await asyncio.to_thread(dispatcher.service.pool.close)
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, smtp_server):
+        """Test persistent transient failures end as failed deliveries."""
+        smtp_server.temp_failures = 10
+        dispatcher = make_dispatcher(smtp_server.port, max_attempts=2)
+        
+        await dispatcher.deliver(build(dispatcher, ["a@example.com"]))
+        
+        assert smtp_server.messages == []
+        assert dispatcher.stats["failed"] == 1
+        assert dispatcher.stats["retried"] == 1
+        await asyncio.to_thread(dispatcher.service.pool.close)
+    
+    @pytest.mark.asyncio
+    async def test_submit_sheds_when_queue_full(self, smtp_server):
+        """Test submit never blocks the caller once the queue is full."""
+        dispatcher = make_dispatcher(smtp_server.port, queue_size=2)
+        dispatcher.start()
+        try:
+            results = [dispatcher.submit(msg) for msg in build(dispatcher, ["a@x.io", "b@x.io", "c@x.io"])]
+            await dispatcher.join()
+        finally:
+            await dispatcher.stop()
+        
+        assert results == [True, True, False]
+        assert dispatcher.stats["dropped"] == 1
+        assert len(smtp_server.messages) == 2
+
+
+class TestSMTPConnectionPool:
+    """Test connection reuse and replacement."""
+    
+    @pytest.mark.asyncio
+    async def test_idle_connection_is_checked_with_noop(self, smtp_server):
+        """Test connections idle past max_idle are verified before reuse."""
+        pool = SMTPConnectionPool("127.0.0.1", smtp_server.port, tls=False, max_idle=0)
+        service = EmailService(pool=pool)
+        
+        for to_email in ("a@example.com", "b@example.com"):
+            assert await asyncio.to_thread(service.send_email, to_email, "Hi", "<p>Hi</p>")
+        await asyncio.to_thread(pool.close)
+        
+        assert smtp_server.connections == 1
+        assert "NOOP" in smtp_server.commands
+        assert pool.stats["reuses"] == 1
+    
+    def test_unconfigured_service_reports_failure(self):
+        """Test sending without an SMTP host fails fast instead of raising."""
+        service = EmailService(pool=SMTPConnectionPool(None, None))
+        
+        assert not service.is_configured
+        assert service.send_email("a@example.com", "Hi", "<p>Hi</p>") is False
+
+
+class TestTemplateRegistry:
+    """Test compiled and cached email templates."""
+    
+    def make_registry(self, tmp_path, **kwargs) -> TemplateRegistry:
+        options = {"templates_dir": None, "bytecode_cache_dir": str(tmp_path / "bytecode")}
+        options.update(kwargs)
+        (tmp_path / "bytecode").mkdir(exist_ok=True)
+        return TemplateRegistry(**options)
+    
+    def test_compile_all_renders_fragments_once(self, tmp_path):
+        """Test every template compiles up front and partials are pre-rendered."""
+        registry = self.make_registry(tmp_path)
+        
+        assert registry.compile_all() == len(BUILTIN_TEMPLATES)
+        html = registry.render("verification_email.html", first_name="Ann", verification_url="https://x/v")
+        text = registry.render("verification_email.txt", first_name="Ann", verification_url="https://x/v")
+        
+        assert "<p>Best regards,<br>The SkillForge AI Team</p>" in html
+        assert text.rstrip().endswith("Best regards,\nThe SkillForge AI Team")
+    
+    def test_html_is_escaped_and_text_is_not(self, tmp_path):
+        """Test user-supplied values cannot inject markup into HTML emails."""
+        registry = self.make_registry(tmp_path)
+        context = {"first_name": "Ann", "company_name": "A&B", "message": "<script>", "invitation_url": "u"}
+        
+        assert "&lt;script&gt;" in registry.render("team_invitation.html", **context)
+        assert "<script>" in registry.render("team_invitation.txt", **context)
+    
+    def test_bytecode_cache_is_reused(self, tmp_path):
+        """Test a second registry loads compiled bytecode instead of compiling."""
+        self.make_registry(tmp_path).compile_all()
+        cached = list((tmp_path / "bytecode").iterdir())
+        assert len(cached) == len(BUILTIN_TEMPLATES)
+        
+        registry = self.make_registry(tmp_path)
+        registry.env.compile = lambda *args, **kwargs: pytest.fail("template recompiled")
+        registry.compile_all()
+        assert registry.render("welcome_email.txt", first_name="Ann").startswith("Hi Ann,")
+    
+    def test_render_batch_loads_template_once(self, tmp_path):
+        """Test fan-out rendering looks each template up a single time."""
+        registry = self.make_registry(tmp_path, use_bytecode_cache=False)
+        registry.compile_all()
+        lookups = []
+        original = registry.env.get_template
+        registry.env.get_template = lambda name, *args, **kwargs: lookups.append(name) or original(name, *args, **kwargs)
+        
+        rendered = registry.render_batch(
+            "team_invitation.txt",
+            [{"first_name": name} for name in ("Ann", "Bob", "Cy")],
+            shared={"company_name": "Acme", "message": "Join us", "invitation_url": "u"},
+        )
+        
+        assert [text.splitlines()[0] for text in rendered] == ["Hi Ann,", "Hi Bob,", "Hi Cy,"]
+        assert all("join Acme" in text for text in rendered)
+        assert lookups == []
+    
+    def test_files_override_builtins(self, tmp_path):
+        """Test a template file replaces the built-in of the same name."""
+        templates_dir = tmp_path / "templates"
+        templates_dir.mkdir()
+        (templates_dir / "welcome_email.txt").write_text("Hello {{ first_name }}! {{ fragments.signature_txt }}")
+        registry = self.make_registry(tmp_path, templates_dir=templates_dir)
+        
+        assert registry.render("welcome_email.txt", first_name="Ann") == (
+            "Hello Ann! Best regards,\nThe SkillForge AI Team"
+        )
+    
+    def test_fragments_must_be_static(self, tmp_path):
+        """Test a partial using variables is rejected at compile time."""
+        registry = self.make_registry(tmp_path, builtin={"_footer.html": "{{ name }}"})
+        
+        with pytest.raises(ValueError):
+            registry.compile_all()
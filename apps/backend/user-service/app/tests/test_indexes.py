@@ -0,0 +1,199 @@
+"""
+Index coverage tests for SkillForge AI User Service
+
+Runs EXPLAIN QUERY PLAN for the statements issued by each CRUD query path
+and asserts none of them falls back to a full table scan. This runs on
+SQLite, where the PostgreSQL partial index predicates do not apply: it
+checks the key columns serve each path, not that PostgreSQL picks the
+partial index.
+"""
+
+import importlib.util
+import re
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import (
+    user as user_crud,
+    user_session as session_crud,
+    company as company_crud,
+    team_member as member_crud,
+    subscription as subscription_crud,
+)
+from app.core.security import token_digest
+from app.models.base import SQLModel
+from app.models.company_simple import CompanyProfile, TeamMember, Subscription
+from app.models.user_simple import User, UserSession, UserStatus
+
+MIGRATION = Path(__file__).parents[2] / "alembic" / "versions" / "8b2d4e6f1a37_query_path_indexes.py"
+
+# "SCAN users" is a full table scan; "SCAN users USING INDEX ..." is an ordered index walk
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+TABLES = {table.name for table in SQLModel.metadata.sorted_tables}
+
+
+@pytest_asyncio.fixture
+async def session(session, engine):
+    """Seeded, analyzed per-test session."""
+    await seed(session)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+    return session
+
+
+async def seed(db: AsyncSession, users: int = 200, companies: int = 20):
+    now = datetime.utcnow()
+    user_rows = [
+        User(
+            email=f"user{i}@example.com",
+            username=f"user{i}",
+            hashed_password="x",
+            is_active=i % 10 != 0,
+            status=UserStatus.ACTIVE if i % 7 else UserStatus.SUSPENDED,
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(users)
+    ]
+    company_rows = [
+        CompanyProfile(name=f"Company {i}", slug=f"company-{i}", is_verified=i % 2 == 0)
+        for i in range(companies)
+    ]
+    db.add_all(user_rows + company_rows)
+    await db.flush()
+    
+    for i, user in enumerate(user_rows):
+        company = company_rows[i % companies]
+        db.add(TeamMember(company_id=company.id, user_id=user.id, is_active=i % 5 != 0))
+        db.add(UserSession(
+            user_id=user.id,
+            session_token_digest=token_digest(f"token-{i}"),
+            refresh_token_digest=token_digest(f"refresh-{i}"),
+            expires_at=now + timedelta(hours=i - 100),
+            is_active=i % 3 != 0,
+        ))
+    for i, company in enumerate(company_rows):
+        db.add(Subscription(
+            company_id=company.id,
+            plan_name="team",
+            current_period_end=now + timedelta(days=i - 10),
+        ))
+    await db.commit()
+    return user_rows, company_rows
+
+
+async def full_scans(db: AsyncSession, call) -> list:
+    """Run call, then EXPLAIN each statement it issued; return full-scanned tables."""
+    statements = []
+    sync_engine = db.bind.sync_engine
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("EXPLAIN"):
+            statements.append((statement, parameters))
+    
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await call()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+    
+    assert statements, "call issued no SQL"
+    scans = []
+    async with db.bind.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            for row in result.all():
+                match = FULL_SCAN.match(row[-1])
+                if match and match.group(1) in TABLES:
+                    scans.append((match.group(1), statement))
+    return scans
+
+
+def _predicate(where) -> str:
+    """Partial index predicate as SQL text, or None."""
+    return str(where) if where is not None else None
+
+
+class TestQueryPathIndexes:
+    """Test each CRUD query path is served by an index."""
+    
+    @pytest.mark.asyncio
+    async def test_no_full_scans(self, session):
+        """Test no CRUD query path scans a whole table."""
+        user = await user_crud.get_by_username(session, "user1")
+        member = (await member_crud.get_user_companies(session, user.id))[0]
+        company_id = member.company_id
+        now = datetime.utcnow()
+        
+        calls = {
+            "user.get": lambda: user_crud.get(session, user.id),
+            "user.get_by_email": lambda: user_crud.get_by_email(session, "user1@example.com"),
+            "user.get_by_username": lambda: user_crud.get_by_username(session, "user1"),
+            "user.get_active_users": lambda: user_crud.get_active_users(session, limit=20),
+            "user.get_multi": lambda: user_crud.get_multi(session, limit=20),
+            "user.get_page": lambda: user_crud.get_page(
+                session, limit=20, filters={"is_active": True, "status": UserStatus.ACTIVE}
+            ),
+            "session.get_by_token": lambda: session_crud.get_by_token(session, "token-150"),
+            "session.get_by_refresh_token": lambda: session_crud.get_by_refresh_token(session, "refresh-150"),
+            "session.active_for_user": lambda: session_crud.get_multi(
+                session, filters={"user_id": user.id, "is_active": True}
+            ),
+            "session.cleanup_expired_sessions": lambda: session_crud.cleanup_expired_sessions(session),
+            "company.get_by_slug": lambda: company_crud.get_by_slug(session, "company-1"),
+            "company.get_verified_companies": lambda: company_crud.get_verified_companies(
+                session, limit=10
+            ),
+            "member.get_by_company_and_user": lambda: member_crud.get_by_company_and_user(
+                session, company_id, user.id
+            ),
+            "member.get_company_members": lambda: member_crud.get_company_members(
+                session, company_id, limit=10
+            ),
+            "member.get_user_companies": lambda: member_crud.get_user_companies(session, user.id),
+            "member.get_members_by_role": lambda: member_crud.get_members_by_role(
+                session, company_id, "member"
+            ),
+            "subscription.get_by_company": lambda: subscription_crud.get_by_company(
+                session, company_id
+            ),
+            "subscription.get_expired_subscriptions": lambda: (
+                subscription_crud.get_expired_subscriptions(session)
+            ),
+        }
+        
+        failures = {}
+        for name, call in calls.items():
+            scans = await full_scans(session, call)
+            if scans:
+                failures[name] = scans
+        
+        assert not failures, f"Full table scans: {failures}"
+    
+    def test_migration_matches_models(self):
+        """Test the Alembic revision creates exactly the models' composite and partial indexes."""
+        spec = importlib.util.spec_from_file_location("index_migration", MIGRATION)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+        
+        declared = {
+            index.name: (
+                table.name,
+                tuple(column.name for column in index.columns),
+                _predicate(index.dialect_options["postgresql"]["where"]),
+            )
+            for table in SQLModel.metadata.sorted_tables
+            for index in table.indexes
+        }
+        
+        for name, table, columns, where in migration.INDEXES:
+            assert declared[name] == (table, tuple(columns), where)
+        covered = {
+            name for name, (_, columns, where) in declared.items() if len(columns) > 1 or where
+        }
+        assert covered <= {name for name, _, _, _ in migration.INDEXES}
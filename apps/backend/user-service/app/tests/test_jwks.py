@@ -0,0 +1,226 @@
+"""
+Asymmetric token signing, JWKS and client verifier tests for SkillForge AI User Service
+"""
+
+import hashlib
+import hmac
+import json
+import time
+import uuid
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from fastapi.testclient import TestClient
+
+from app.client import JWKSVerifier, TokenVerificationError
+from app.core.cache import TTLCache
+from app.core import keys as keys_module
+from app.core.keys import KeyConfigurationError, KeyRing, SigningKey, create_key_ring, load_keys
+from app.core.security import create_access_token, create_refresh_token, verify_token
+
+
+@pytest.fixture
+def key_ring(monkeypatch):
+    """Fresh ES256 key ring used by token creation and verification."""
+    ring = KeyRing([SigningKey.generate("ES256", kid="first")], active_kid="first")
+    monkeypatch.setattr("app.core.security.signing_keys", ring)
+    monkeypatch.setattr("app.core.security.verified_token_cache", TTLCache(max_size=0))
+    return ring
+
+
+class TestKeyRing:
+    """Test signing with key ids and rotation."""
+    
+    @pytest.mark.parametrize("algorithm", ["ES256", "EdDSA"])
+    def test_sign_and_verify(self, algorithm):
+        key = SigningKey.generate(algorithm)
+        ring = KeyRing([key], active_kid=key.kid)
+        
+        token = ring.encode({"sub": "user", "exp": int(time.time()) + 60})
+        
+        assert jwt.get_unverified_header(token) == {"alg": algorithm, "kid": key.kid, "typ": "JWT"}
+        assert ring.decode(token)["sub"] == "user"
+        assert ring.jwks()["keys"][0]["kid"] == key.thumbprint()
+    
+    def test_rotation(self, key_ring):
+        """Test tokens signed before a rotation verify until the old key is removed."""
+        user_id = uuid.uuid4()
+        old_token = create_access_token(user_id)
+        
+        key_ring.rotate(SigningKey.generate("EdDSA", kid="second"))
+        new_token = create_access_token(user_id)
+        
+        assert jwt.get_unverified_header(new_token)["kid"] == "second"
+        assert verify_token(old_token) is not None
+        assert verify_token(new_token) is not None
+        assert [key["kid"] for key in key_ring.jwks()["keys"]] == ["first", "second"]
+        
+        key_ring.remove("first")
+        
+        assert verify_token(old_token) is None
+        assert verify_token(new_token) is not None
+        with pytest.raises(KeyConfigurationError):
+            key_ring.remove("second")
+    
+    def test_rejects_forged_and_legacy_tokens(self, key_ring):
+        """Test tokens without a known kid, or HMAC-signed with the public key, are rejected."""
+        claims = {"sub": "user", "type": "access", "exp": int(time.time()) + 60}
+        public_pem = key_ring.active.public_key.public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        
+        assert verify_token(jwt.encode(claims, "secret", algorithm="HS256")) is None
+        assert verify_token(jwt.encode(claims, "secret", algorithm="HS256", headers={"kid": "other"})) is None
+        
+        # jwt.encode refuses PEM keys as HMAC secrets, so sign by hand
+        header = jwt.utils.base64url_encode(json.dumps({"alg": "HS256", "kid": "first"}).encode())
+        body = jwt.utils.base64url_encode(json.dumps(claims).encode())
+        signature = jwt.utils.base64url_encode(
+            hmac.new(public_pem, header + b"." + body, hashlib.sha256).digest()
+        )
+        assert verify_token((header + b"." + body + b"." + signature).decode()) is None
+    
+    def test_accepts_hs256_while_migrating(self, key_ring):
+        key_ring.secret = "legacy-secret"
+        claims = {"sub": "user", "type": "access", "exp": int(time.time()) + 60}
+        
+        assert verify_token(jwt.encode(claims, "legacy-secret", algorithm="HS256"))["sub"] == "user"
+    
+    def test_load_keys(self, tmp_path):
+        """Test private keys sign and public-only keys only verify."""
+        signing = SigningKey.generate("ES256")
+        retired = SigningKey.generate("EdDSA")
+        (tmp_path / "2026-10.pem").write_bytes(signing.private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+        (tmp_path / "2026-04.pem").write_bytes(retired.public_key.public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+        
+        keys = load_keys(str(tmp_path))
+        
+        assert [(key.kid, key.algorithm, key.private_key is not None) for key in keys] == [
+            ("2026-04", "EdDSA", False),
+            ("2026-10", "ES256", True),
+        ]
+        with pytest.raises(KeyConfigurationError):
+            KeyRing(keys, active_kid="2026-04")
+
+
+class TestCreateKeyRing:
+    """Test the key ring built from settings."""
+    
+    def test_hs256_by_default(self):
+        ring = create_key_ring()
+        
+        assert ring.active is None
+        assert ring.jwks() == {"keys": []}
+    
+    def test_requires_keys_outside_development(self, monkeypatch):
+        """Test a per-process generated key is refused where tokens must be shared."""
+        monkeypatch.setattr(keys_module.settings, "ALGORITHM", "ES256")
+        monkeypatch.setattr(keys_module.settings, "JWT_KEYS_DIR", None)
+        
+        assert create_key_ring().active.algorithm == "ES256"
+        
+        monkeypatch.setattr(keys_module.settings, "ENVIRONMENT", "production")
+        with pytest.raises(KeyConfigurationError):
+            create_key_ring()
+
+
+class TestJWKSEndpoint:
+    """Test /.well-known/jwks.json."""
+    
+    def test_cache_headers_and_etag(self, key_ring, monkeypatch):
+        import main
+        monkeypatch.setattr(main, "signing_keys", key_ring)
+        client = TestClient(main.app, base_url="http://localhost")
+        
+        response = client.get("/.well-known/jwks.json")
+        
+        assert response.status_code == 200
+        assert response.json() == key_ring.jwks()
+        assert response.headers["cache-control"] == f"public, max-age={main.settings.JWKS_CACHE_MAX_AGE}"
+        
+        etag = response.headers["etag"]
+        assert client.get("/.well-known/jwks.json", headers={"If-None-Match": etag}).status_code == 304
+        
+        key_ring.add(SigningKey.generate("EdDSA"))
+        changed = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert len(changed.json()["keys"]) == 2
+
+
+class FakeJWKSServer:
+    """Serves a key ring's JWKS through httpx.MockTransport and counts requests."""
+    
+    def __init__(self, ring: KeyRing, max_age: int = 300):
+        self.ring = ring
+        self.max_age = max_age
+        self.requests = []
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        body, etag = self.ring.jwks_document()
+        headers = {"Cache-Control": f"public, max-age={self.max_age}", "ETag": etag}
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, content=body, headers={**headers, "Content-Type": "application/json"})
+    
+    def verifier(self, **kwargs) -> JWKSVerifier:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return JWKSVerifier("http://user-service/.well-known/jwks.json", client=client, **kwargs)
+
+
+class TestJWKSVerifier:
+    """Test downstream verification against the published keys."""
+    
+    @pytest.mark.asyncio
+    async def test_verifies_with_cached_keys(self, key_ring):
+        server = FakeJWKSServer(key_ring)
+        verifier = server.verifier()
+        user_id = uuid.uuid4()
+        
+        for _ in range(3):
+            claims = await verifier.verify(create_access_token(user_id))
+            assert claims["sub"] == str(user_id)
+        
+        assert len(server.requests) == 1
+        with pytest.raises(TokenVerificationError):
+            await verifier.verify(create_refresh_token(user_id))
+        with pytest.raises(TokenVerificationError):
+            await verifier.verify(create_access_token(user_id)[:-4] + "AAAA")
+    
+    @pytest.mark.asyncio
+    async def test_refetches_on_unknown_kid(self, key_ring):
+        """Test a rotation is picked up early, but unknown kids cannot force a refetch storm."""
+        server = FakeJWKSServer(key_ring)
+        verifier = server.verifier(min_refresh_interval=0)
+        await verifier.verify(create_access_token(uuid.uuid4()))
+        
+        key_ring.rotate(SigningKey.generate("EdDSA", kid="second"))
+        claims = await verifier.verify(create_access_token(uuid.uuid4()))
+        
+        assert claims["type"] == "access"
+        assert len(server.requests) == 2
+        
+        verifier.min_refresh_interval = 3600
+        forged = jwt.encode({"sub": "x"}, "k", algorithm="HS256", headers={"kid": "unknown"})
+        for _ in range(3):
+            with pytest.raises(TokenVerificationError):
+                await verifier.verify(forged)
+        assert len(server.requests) == 2
+    
+    @pytest.mark.asyncio
+    async def test_revalidates_with_etag(self, key_ring):
+        server = FakeJWKSServer(key_ring, max_age=0)
+        verifier = server.verifier()
+        token = create_access_token(uuid.uuid4())
+        
+        await verifier.verify(token)
+        await verifier.verify(token)
+        
+        assert len(server.requests) == 2
+        assert server.requests[1].headers["if-none-match"] == key_ring.jwks_document()[1]
@@ -0,0 +1,127 @@
+"""
+Maintenance scheduler tests for SkillForge AI User Service
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.crud import subscription as subscription_crud, user_session as session_crud
+from app.core.security import token_digest
+from app.models.company_simple import Subscription
+from app.models.user_simple import UserSession
+from app.tasks.maintenance import AdvisoryLock, MaintenanceJob, MaintenanceScheduler, run_batched
+
+
+async def add_sessions(session_factory, expired: int, active: int) -> None:
+    now = datetime.utcnow()
+    async with session_factory() as db:
+        for index in range(expired + active):
+            offset = -timedelta(minutes=index + 1) if index < expired else timedelta(hours=1)
+            db.add(UserSession(user_id=uuid.uuid4(), session_token_digest=token_digest(f"token-{index}"), expires_at=now + offset))
+        await db.commit()
+
+
+async def count(session_factory, query) -> int:
+    async with session_factory() as db:
+        return (await db.execute(query)).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_run_batched_deletes_in_chunks(session_factory, monkeypatch):
+    """Expired sessions go in batch_size chunks with a pause between full batches."""
+    await add_sessions(session_factory, expired=25, active=3)
+    pauses = []
+    
+    async def fake_sleep(seconds):
+        pauses.append(seconds)
+    
+    monkeypatch.setattr("app.tasks.maintenance.asyncio.sleep", fake_sleep)
+    rows, batches = await run_batched(session_factory, session_crud.delete_expired_batch, 10, pause=0.5)
+    
+    assert (rows, batches) == (25, 3)
+    assert pauses == [0.5, 0.5]
+    assert await count(session_factory, select(func.count()).select_from(UserSession)) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_batched_stops_at_max_batches(session_factory):
+    await add_sessions(session_factory, expired=25, active=0)
+    
+    rows, batches = await run_batched(session_factory, session_crud.delete_expired_batch, 10, max_batches=2)
+    
+    assert (rows, batches) == (20, 2)
+    assert await count(session_factory, select(func.count()).select_from(UserSession)) == 5
+
+
+@pytest.mark.asyncio
+async def test_expire_batch_deactivates_lapsed_subscriptions(session_factory):
+    now = datetime.utcnow()
+    async with session_factory() as db:
+        for days in (-3, -2, -1, 5):
+            db.add(Subscription(
+                company_id=uuid.uuid4(),
+                plan_name="pro",
+                current_period_end=now + timedelta(days=days),
+            ))
+        await db.commit()
+    
+    async with session_factory() as db:
+        assert await subscription_crud.expire_batch(db, 2) == 2
+    async with session_factory() as db:
+        assert await subscription_crud.expire_batch(db, 2) == 1
+    async with session_factory() as db:
+        assert await subscription_crud.expire_batch(db, 2) == 0
+    
+    active = select(func.count()).select_from(Subscription).where(Subscription.is_active.is_(True))
+    assert await count(session_factory, active) == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_reports_rows_and_respects_intervals(engine, session_factory):
+    await add_sessions(session_factory, expired=4, active=1)
+    scheduler = MaintenanceScheduler(
+        jobs=[MaintenanceJob("expired_sessions", session_crud.delete_expired_batch, interval=3600)],
+        session_factory=session_factory,
+        engine=engine,
+        batch_size=3,
+        batch_pause=0,
+    )
+    
+    results = await scheduler.run_due()
+    assert [(r.name, r.rows, r.batches) for r in results] == [("expired_sessions", 4, 2)]
+    assert results[0].duration >= 0
+    
+    # Not due again for an hour
+    assert await scheduler.run_due() == []
+    
+    assert [r.rows for r in await scheduler.run_once()] == [0]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_keeps_going_after_job_failure(engine, session_factory):
+    async def broken(db, batch_size):
+        raise RuntimeError("boom")
+    
+    async def noop(db, batch_size):
+        return 0
+    
+    scheduler = MaintenanceScheduler(
+        jobs=[MaintenanceJob("broken", broken, interval=60), MaintenanceJob("noop", noop, interval=60)],
+        session_factory=session_factory,
+        engine=engine,
+    )
+    
+    assert [r.name for r in await scheduler.run_once()] == ["noop"]
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_is_always_held_without_postgres(engine):
+    lock = AdvisoryLock(engine, key=1)
+    
+    assert await lock.acquire() is True
+    assert lock.held
+    await lock.release()
+    assert not lock.held
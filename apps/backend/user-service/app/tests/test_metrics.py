@@ -0,0 +1,119 @@
+"""
+Prometheus metrics tests for SkillForge AI User Service
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.cache import TTLCache
+from app.core.database import instrument_queries
+from app.core.metrics import MetricsMiddleware, current_query_stats, render_metrics
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_queries(engine)
+    return engine
+
+
+@pytest.fixture
+def metrics_app(engine):
+    """Minimal app wired like main.py: metrics outside a BaseHTTPMiddleware."""
+    app = FastAPI()
+    seen = {}
+    
+    @app.middleware("http")
+    async def passthrough(request: Request, call_next):
+        return await call_next(request)
+    
+    app.add_middleware(MetricsMiddleware)
+    
+    @app.get("/things/{thing_id}")
+    async def read_thing(thing_id: int):
+        async with engine.connect() as conn:
+            for _ in range(thing_id):
+                await conn.execute(text("SELECT 1"))
+        seen["queries"] = current_query_stats().count
+        return {"id": thing_id}
+    
+    app.state.seen = seen
+    return app
+
+
+class TestMetricsMiddleware:
+    """Test request latency, in-flight and per-request SQL metrics."""
+    
+    @pytest.mark.asyncio
+    async def test_route_template_labels(self, metrics_app):
+        """Test latency is labelled by route template, not the raw path."""
+        route = "/things/{thing_id}"
+        before = sample("http_request_duration_seconds_count", method="GET", route=route, status="200")
+        
+        async with AsyncClient(app=metrics_app, base_url="http://test") as client:
+            for thing_id in (1, 2, 3):
+                assert (await client.get(f"/things/{thing_id}")).status_code == 200
+            assert (await client.get("/nowhere")).status_code == 404
+        
+        after = sample("http_request_duration_seconds_count", method="GET", route=route, status="200")
+        assert after - before == 3
+        assert sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+        assert REGISTRY.get_sample_value(
+            "http_request_duration_seconds_count", {"method": "GET", "route": "/things/3", "status": "200"}
+        ) is None
+        assert sample("http_requests_in_progress", method="GET") == 0
+    
+    @pytest.mark.asyncio
+    async def test_queries_counted_per_request(self, metrics_app):
+        """Test SQL statements are attributed to the request that ran them."""
+        route = "/things/{thing_id}"
+        count = sample("db_queries_per_request_count", route=route)
+        total = sample("db_queries_per_request_sum", route=route)
+        
+        async with AsyncClient(app=metrics_app, base_url="http://test") as client:
+            await client.get("/things/4")
+        
+        assert metrics_app.state.seen["queries"] == 4
+        assert sample("db_queries_per_request_count", route=route) - count == 1
+        assert sample("db_queries_per_request_sum", route=route) - total == 4
+    
+    @pytest.mark.asyncio
+    async def test_queries_outside_requests(self, engine):
+        """Test statements outside a request are still timed."""
+        before = sample("db_query_duration_seconds_count")
+        
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        
+        assert current_query_stats() is None
+        assert sample("db_query_duration_seconds_count") - before == 1
+
+
+class TestCollectors:
+    """Test cache and exposition metrics."""
+    
+    def test_named_cache_lookups(self):
+        """Test named caches export hits and misses."""
+        cache = TTLCache(max_size=10, ttl=60, name="test_metrics")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        
+        assert sample("cache_lookups_total", cache="test_metrics", result="hit") == 1
+        assert sample("cache_lookups_total", cache="test_metrics", result="miss") == 1
+    
+    def test_render_metrics(self):
+        """Test exposition uses the Prometheus text format."""
+        body, content_type = render_metrics()
+        
+        assert content_type.startswith("text/plain")
+        assert b"http_request_duration_seconds" in body
+        assert b"password_hash_duration_seconds" in body
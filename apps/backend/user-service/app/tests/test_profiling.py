@@ -0,0 +1,99 @@
+"""
+SQL query profiler tests for SkillForge AI User Service
+"""
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.crud import user as user_crud
+from app.core.profiling import QueryProfilerMiddleware, fingerprint, profile_queries
+from app.models.user_simple import User
+
+
+class TestFingerprint:
+    """Test statement normalization."""
+    
+    def test_values_are_normalized(self):
+        """Test literals, bind styles and IN lists collapse to one fingerprint."""
+        statements = [
+            "SELECT * FROM users WHERE id = $1 AND email = 'a@example.com'",
+            "SELECT *  FROM users\n WHERE id = 42 AND email = 'o''brien@example.com'",
+            "SELECT * FROM users WHERE id = %(id_1)s AND email = ?",
+        ]
+        
+        assert len({fingerprint(statement) for statement in statements}) == 1
+        assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == fingerprint(
+            "SELECT 1 FROM t WHERE id IN ($1, $2)"
+        )
+    
+    def test_casts_are_kept(self):
+        """Test ::type casts are not mistaken for named parameters."""
+        assert fingerprint("SELECT skills::text FROM users") == "SELECT skills::text FROM users"
+
+
+class TestQueryProfile:
+    """Test statement attribution."""
+    
+    @pytest.mark.asyncio
+    async def test_nested_profiles(self, session):
+        """Test statements are attributed to every active profile."""
+        with profile_queries() as outer:
+            await session.execute(text("SELECT 1"))
+            with profile_queries() as inner:
+                for user_id in range(3):
+                    await session.execute(text(f"SELECT {user_id}"))
+        
+        assert outer.count == 4
+        assert inner.count == 3
+        assert inner.repeated(3) == [("SELECT ?", 3)]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.query_budget(2)
+    async def test_paged_listing_within_budget(self, session):
+        """Test a batched insert and a counted page take one statement each."""
+        session.add_all([
+            User(email=f"user{i}@example.com", username=f"user{i}", hashed_password="x")
+            for i in range(5)
+        ])
+        await session.flush()
+        
+        items, total = await user_crud.get_page(session, limit=2)
+        
+        assert len(items) == 2 and total == 5
+    
+    @pytest.mark.asyncio
+    async def test_budget_exceeded_fails(self, session, query_budget):
+        """Test exceeding a budget fails with the repeated statements listed."""
+        with pytest.raises(pytest.fail.Exception) as exc_info:
+            with query_budget(2):
+                for email in ("a@example.com", "b@example.com", "c@example.com"):
+                    await user_crud.get_by_email(session, email=email)
+        
+        assert "3 > 2" in str(exc_info.value)
+        assert "3x SELECT" in str(exc_info.value)
+
+
+class TestQueryProfilerMiddleware:
+    """Test per-request reporting."""
+    
+    @pytest.mark.asyncio
+    async def test_headers_and_n_plus_one_warning(self, session, caplog):
+        """Test query headers are set and repeated statements are logged."""
+        app = FastAPI()
+        app.add_middleware(QueryProfilerMiddleware, repeat_threshold=3)
+        
+        @app.get("/members")
+        async def list_members():
+            for email in ("a@example.com", "b@example.com", "c@example.com"):
+                await user_crud.get_by_email(session, email=email)
+            return []
+        
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/members")
+        
+        assert response.headers["X-DB-Query-Count"] == "3"
+        assert response.headers["X-DB-Repeated-Queries"] == "1"
+        assert float(response.headers["X-DB-Query-Time"]) >= 0
+        assert "Possible N+1 in GET /members" in caplog.text
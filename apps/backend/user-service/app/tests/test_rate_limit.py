@@ -0,0 +1,167 @@
+"""
+Rate limiter tests for SkillForge AI User Service
+"""
+
+import time
+import pytest
+
+from app.core.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimiter,
+    RedisRateLimitBackend,
+)
+
+
+class FakePipeline:
+    """Minimal stand-in for a redis.asyncio transaction pipeline."""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+    
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args) for name, args in self.calls]
+
+
+class FakeRedis:
+    """In-memory subset of the redis.asyncio client used by the limiter."""
+    
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+    
+    async def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+    
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+    
+    async def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+    
+    async def delete(self, key):
+        self.data.pop(key, None)
+    
+    async def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+    
+    async def close(self):
+        pass
+
+
+def test_incomplete_backend_rejected():
+    """Test a backend missing part of the interface fails at construction."""
+    class HitOnly(RateLimitBackend):
+        async def hit(self, key, limit, window):
+            pass
+    
+    with pytest.raises(TypeError):
+        HitOnly()
+
+
+class TestInMemoryBackend:
+    """Test the per-process sliding-window backend."""
+    
+    @pytest.mark.asyncio
+    async def test_limit_enforced(self):
+        """Test hits beyond the limit are rejected with a retry hint."""
+        limiter = RateLimiter(InMemoryRateLimitBackend())
+        
+        results = [await limiter.hit("ip", limit=3, window=60) for _ in range(4)]
+        
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[0].remaining == 2
+        assert 1 <= results[-1].retry_after <= 60
+    
+    @pytest.mark.asyncio
+    async def test_previous_window_weighted(self, monkeypatch):
+        """Test hits from the previous window still count, decaying over time."""
+        backend = InMemoryRateLimitBackend()
+        clock = [1000.0]
+        monkeypatch.setattr(time, "time", lambda: clock[0])
+        
+        for _ in range(10):
+            assert (await backend.hit("ip", limit=10, window=100)).allowed
+        
+        clock[0] = 1110.0  # 10% into next window: previous counts 9
+        assert (await backend.hit("ip", limit=10, window=100)).allowed
+        assert not (await backend.hit("ip", limit=10, window=100)).allowed
+        
+        clock[0] = 1160.0  # previous now counts 4
+        assert (await backend.hit("ip", limit=10, window=100)).allowed
+    
+    @pytest.mark.asyncio
+    async def test_key_cap_and_sweep(self, monkeypatch):
+        """Test the key cap evicts LRU keys and the sweep drops idle ones."""
+        backend = InMemoryRateLimitBackend(max_keys=2, sweep_interval=0)
+        for key in ("a", "b", "c"):
+            await backend.hit(key, limit=5, window=1)
+        assert len(backend) == 2
+        
+        real_time = time.time()
+        monkeypatch.setattr(time, "time", lambda: real_time + 10)
+        await backend.hit("d", limit=5, window=1)
+        assert len(backend) == 1
+
+
+class TestRedisBackend:
+    """Test the shared Redis backend against a fake client."""
+    
+    @pytest.mark.asyncio
+    async def test_limit_shared_across_limiters(self):
+        """Test two limiters on one Redis share the same counters."""
+        redis = FakeRedis()
+        first = RateLimiter(RedisRateLimitBackend(client=redis))
+        second = RateLimiter(RedisRateLimitBackend(client=redis))
+        
+        assert await first.is_allowed("ip", limit=2, window=60)
+        assert await second.is_allowed("ip", limit=2, window=60)
+        assert not await first.is_allowed("ip", limit=2, window=60)
+        assert all(ttl == 120 for ttl in redis.ttls.values())
+    
+    @pytest.mark.asyncio
+    async def test_rejected_hits_not_counted(self):
+        """Test rejected hits are rolled back and reset clears the key."""
+        redis = FakeRedis()
+        limiter = RateLimiter(RedisRateLimitBackend(client=redis))
+        
+        for _ in range(5):
+            await limiter.hit("ip", limit=1, window=60)
+        assert list(redis.data.values()) == [1]
+        
+        await limiter.reset("ip")
+        assert await limiter.is_allowed("ip", limit=1, window=60)
+    
+    @pytest.mark.asyncio
+    async def test_fails_open(self):
+        """Test Redis errors allow the request instead of failing it."""
+        class BrokenRedis(FakeRedis):
+            def pipeline(self, transaction=True):
+                raise ConnectionError("redis down")
+        
+        limiter = RateLimiter(RedisRateLimitBackend(client=BrokenRedis()))
+        
+        assert await limiter.is_allowed("ip", limit=1, window=60)
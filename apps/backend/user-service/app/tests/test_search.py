@@ -0,0 +1,96 @@
+"""
+Search tests for SkillForge AI User Service
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import user as user_crud, company as company_crud
+from app.crud.company import COMPANY_SEARCH
+from app.crud.search import prefix_tsquery, search_clause
+from app.crud.user import USER_SEARCH
+from app.models.user_simple import User
+
+MIGRATION = Path(__file__).parents[2] / "alembic" / "versions" / "3f1a9c2b7d10_search_vectors.py"
+
+
+async def seed(db: AsyncSession):
+    db.add_all([
+        User(email="ada@example.com", username="lovelace", first_name="Ada", hashed_password="x"),
+        User(email="grace@example.com", username="grace_h", first_name="Grace", last_name="Nadal", hashed_password="x"),
+        User(email="alan@example.com", username="turing", first_name="Alan", hashed_password="x"),
+    ])
+    await db.commit()
+
+
+class TestSearchClause:
+    """Test query construction."""
+    
+    def test_prefix_tsquery(self):
+        """Test input is reduced to prefix-matched words."""
+        assert prefix_tsquery("Ada  Love") == "ada:* & love:*"
+        assert prefix_tsquery("o'brien & !") == "o:* & brien:*"
+        assert prefix_tsquery("@!") is None
+    
+    def test_postgresql_uses_indexed_operators(self):
+        """Test PostgreSQL matches through tsvector and trigram operators."""
+        condition, rank = search_clause(User, USER_SEARCH, "ada", [], "postgresql")
+        sql = str(select(User.id).where(condition).order_by(rank.desc()).compile(
+            dialect=postgresql.dialect()
+        ))
+        
+        assert "users.search_vector @@ to_tsquery" in sql
+        assert "users.username %" in sql  # %> (escaped for pyformat drivers)
+        assert "ts_rank_cd" in sql and "word_similarity" in sql
+        assert "ILIKE" in sql
+    
+    def test_migration_matches_configs(self):
+        """Test the Alembic revision builds the same vectors as create_all."""
+        spec = importlib.util.spec_from_file_location("search_migration", MIGRATION)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+        
+        assert migration.USERS_VECTOR == USER_SEARCH.vector_expression()
+        assert migration.COMPANIES_VECTOR == COMPANY_SEARCH.vector_expression()
+        assert set(migration.TRIGRAM_INDEXES) == (
+            {("users", name) for name in USER_SEARCH.trigram_fields}
+            | {("company_profiles", name) for name in COMPANY_SEARCH.trigram_fields}
+        )
+
+
+class TestSqliteFallback:
+    """Test ILIKE search with prefix ranking on SQLite."""
+    
+    @pytest.mark.asyncio
+    async def test_search_users_ranks_prefix_matches_first(self, session):
+        """Test prefix matches outrank infix matches."""
+        await seed(session)
+        
+        users = await user_crud.search_users(session, "ada")
+        
+        assert [user.username for user in users] == ["lovelace", "grace_h"]
+    
+    @pytest.mark.asyncio
+    async def test_get_page_ranked(self, session):
+        """Test paged search is ranked and counted."""
+        await seed(session)
+        
+        users, total = await user_crud.get_page(
+            session,
+            limit=1,
+            search_term="ada",
+            search_fields=user_crud.search_fields
+        )
+        
+        assert total == 2
+        assert users[0].username == "lovelace"
+    
+    @pytest.mark.asyncio
+    async def test_search_companies(self, session):
+        """Test company search falls back to ILIKE on name and description."""
+        assert await company_crud.search_companies(session, "acme") == []
@@ -0,0 +1,338 @@
+"""
+Security utilities tests for SkillForge AI User Service
+"""
+
+import asyncio
+import time
+import timeit
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from app.api.dependencies import require_permission
+from app.core.cache import REQUEST_ACCESS_KEY, CompanyAccess, TTLCache, UserSnapshot
+from app.core.revocation import Revocation, RevocationBackend, RevocationList
+from app.core.security import (
+    ALL_PERMISSIONS,
+    PasswordHasher,
+    PasswordHashingBusyError,
+    PermissionSet,
+    Permissions,
+    ROLE_PERMISSIONS,
+    check_permission,
+    create_access_token,
+    create_refresh_token,
+    get_password_hash,
+    get_user_permissions,
+    verify_password,
+    verify_token,
+)
+from app.models.user_simple import UserRole
+
+
+class TestPasswordHasher:
+    """Test the async password hashing pool."""
+    
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        """Test hashing and verifying through the worker pool."""
+        hasher = PasswordHasher(max_workers=2, max_queue=2)
+        try:
+            hashed = await hasher.hash("TestPassword123!")
+            
+            assert verify_password("TestPassword123!", hashed)
+            assert await hasher.verify("TestPassword123!", hashed) is True
+            assert await hasher.verify("WrongPassword123!", hashed) is False
+            assert hasher.stats["calls"] == 3
+            assert hasher.stats["hash_seconds"] > 0
+            assert hasher.in_flight == 0
+        finally:
+            hasher.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_queue_full_sheds_load(self):
+        """Test that jobs beyond workers + queue are rejected with 503."""
+        hasher = PasswordHasher(max_workers=1, max_queue=1)
+        hashed = get_password_hash("TestPassword123!")
+        try:
+            results = await asyncio.gather(
+                *[hasher.verify("TestPassword123!", hashed) for _ in range(4)],
+                return_exceptions=True
+            )
+            
+            rejected = [r for r in results if isinstance(r, PasswordHashingBusyError)]
+            assert len(rejected) == 2
+            assert rejected[0].status_code == 503
+            assert hasher.stats["rejected"] == 2
+            assert results[:2] == [True, True]
+        finally:
+            hasher.shutdown()
+
+
+class TestPermissionSet:
+    """Test compiled permission bitsets."""
+    
+    def test_roles_match_permission_lists(self):
+        """Test every role's compiled set equals its declared list."""
+        for role, permissions in ROLE_PERMISSIONS.items():
+            assert get_user_permissions(role) == permissions
+            for permission in permissions:
+                assert check_permission(role, permission)
+        
+        assert not check_permission(UserRole.USER, Permissions.USER_WRITE)
+        assert not check_permission(UserRole.ADMIN, "unknown:perm")
+    
+    def test_superuser_has_only_declared_permissions(self):
+        """Test superusers get every permission constant and nothing else."""
+        permissions = get_user_permissions(UserRole.USER, is_superuser=True)
+        
+        assert len(permissions) == len(ALL_PERMISSIONS) == 15
+        assert all(not name.startswith("__") for name in permissions)
+        assert check_permission(UserRole.USER, Permissions.SYSTEM_ADMIN, is_superuser=True)
+    
+    def test_company_grants_combine_with_role(self):
+        """Test per-company grants extend the role's permissions."""
+        grants = PermissionSet.from_names([Permissions.TEAM_WRITE, "not-a-permission"])
+        
+        assert Permissions.TEAM_WRITE in grants
+        assert len(grants) == 1
+        assert not check_permission(UserRole.USER, Permissions.TEAM_WRITE)
+        assert check_permission(UserRole.USER, Permissions.TEAM_WRITE, extra=grants)
+        assert check_permission(UserRole.USER, Permissions.USER_READ, extra=grants)
+    
+    @pytest.mark.asyncio
+    async def test_company_scoped_dependency(self):
+        """Test require_permission reads grants from the company access decision."""
+        company_id = uuid.uuid4()
+        user = UserSnapshot(
+            id=uuid.uuid4(),
+            email="member@example.com",
+            role=UserRole.USER,
+            is_active=True,
+            is_verified=True,
+            is_superuser=False,
+        )
+        member = SimpleNamespace(id=uuid.uuid4(), role="member", permissions=[Permissions.TEAM_WRITE])
+        company = SimpleNamespace(id=company_id, is_active=True)
+        access = CompanyAccess.build(company, member, user.id)
+        # Request-scoped decision, so no query is needed
+        db = SimpleNamespace(info={REQUEST_ACCESS_KEY: {(user.id, company_id): access}})
+        
+        assert await require_permission(Permissions.TEAM_WRITE, company_scoped=True)(company_id, db, user) is user
+        with pytest.raises(HTTPException) as exc_info:
+            await require_permission(Permissions.TEAM_DELETE, company_scoped=True)(company_id, db, user)
+        assert exc_info.value.status_code == 403
+    
+    def test_check_microbenchmark(self):
+        """Test bitset checks beat the previous list-based lookup."""
+        def legacy_check(role, permission, is_superuser):
+            if is_superuser:
+                return permission in list(vars(Permissions).values())
+            return permission in ROLE_PERMISSIONS.get(role, [])
+        
+        cases = [
+            (UserRole.ADMIN, Permissions.SYSTEM_ADMIN, False),
+            (UserRole.USER, Permissions.SYSTEM_ADMIN, True),
+        ]
+        for role, permission, is_superuser in cases:
+            legacy = min(timeit.repeat(
+                lambda: legacy_check(role, permission, is_superuser), number=20000, repeat=5
+            ))
+            compiled = min(timeit.repeat(
+                lambda: check_permission(role, permission, is_superuser), number=20000, repeat=5
+            ))
+            assert compiled < legacy, f"{role} superuser={is_superuser}: {compiled:.4f}s vs {legacy:.4f}s"
+
+
+class TestVerifiedTokenCache:
+    """Test verify_token's cache of decoded claims."""
+    
+    @pytest.fixture
+    def token_cache(self, monkeypatch):
+        cache = TTLCache(max_size=100, name="verified_token")
+        monkeypatch.setattr("app.core.security.verified_token_cache", cache)
+        return cache
+    
+    def test_repeat_verification_skips_decoding(self, token_cache, monkeypatch):
+        """Test only the first presentation of a token is decoded."""
+        token = create_access_token(uuid.uuid4())
+        decoded = []
+        real_decode = jwt.decode
+        monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: decoded.append(1) or real_decode(*args, **kwargs))
+        
+        first = verify_token(token, expected_type="access")
+        second = verify_token(token, expected_type="access")
+        
+        assert first == second
+        assert len(decoded) == 1
+        assert (token_cache.hits, token_cache.misses) == (1, 1)
+        assert verify_token(token, expected_type="refresh") is None
+    
+    def test_invalid_tokens_are_not_cached(self, token_cache):
+        token = create_access_token(uuid.uuid4())
+        
+        assert verify_token(token[:-2] + "xx") is None
+        assert len(token_cache) == 0
+    
+    def test_callers_cannot_change_cached_claims(self, token_cache):
+        token = create_access_token(uuid.uuid4())
+        
+        verify_token(token)["sub"] = "someone-else"
+        
+        assert verify_token(token)["sub"] != "someone-else"
+    
+    def test_entries_expire_with_token(self, token_cache):
+        """Test a cached token stops verifying once it expires."""
+        # exp is truncated to whole seconds, so leave a full second of margin
+        token = create_access_token(uuid.uuid4(), expires_delta=timedelta(seconds=2))
+        assert verify_token(token) is not None
+        
+        time.sleep(jwt.decode(token, options={"verify_signature": False})["exp"] - time.time() + 0.1)
+        
+        assert verify_token(token) is None
+    
+    @pytest.mark.asyncio
+    async def test_revocation_applies_to_cached_tokens(self, token_cache, monkeypatch):
+        """Test revoking a token rejects it even though its claims are cached."""
+        revocations = RevocationList()
+        monkeypatch.setattr("app.core.security.revocation_list", revocations)
+        token = create_access_token(uuid.uuid4())
+        payload = verify_token(token)
+        
+        await revocations.revoke_token(payload)
+        
+        assert len(token_cache) == 1
+        assert verify_token(token) is None
+    
+    def test_cached_verification_is_faster(self, monkeypatch):
+        """Microbenchmark: repeat verification of one token, cached vs decoded every time."""
+        token = create_access_token(uuid.uuid4(), additional_claims={"email": "a@example.com", "role": "user"})
+        
+        monkeypatch.setattr("app.core.security.verified_token_cache", TTLCache(max_size=0))
+        uncached = min(timeit.repeat(lambda: verify_token(token, "access"), number=2000, repeat=5))
+        
+        monkeypatch.setattr("app.core.security.verified_token_cache", TTLCache(max_size=100))
+        cached = min(timeit.repeat(lambda: verify_token(token, "access"), number=2000, repeat=5))
+        
+        assert cached < uncached, f"cached {cached:.4f}s vs uncached {uncached:.4f}s"
+
+
+class FakeRevocationBus:
+    """Shared store plus pub/sub, standing in for Redis."""
+    
+    def __init__(self):
+        self.stored = []
+        self.subscribers = []
+    
+    def backend(self):
+        bus = self
+        
+        class Backend(RevocationBackend):
+            async def publish(self, revocation):
+                bus.stored.append(revocation.encode())
+                for queue in bus.subscribers:
+                    queue.put_nowait(revocation.encode())
+            
+            async def snapshot(self):
+                return [Revocation.decode(raw) for raw in bus.stored]
+            
+            async def listen(self, apply):
+                queue = asyncio.Queue()
+                bus.subscribers.append(queue)
+                while True:
+                    apply(Revocation.decode(await queue.get()))
+        
+        return Backend()
+
+
+class TestRevocation:
+    """Test the token revocation denylist."""
+    
+    @pytest.fixture
+    def revocations(self, monkeypatch):
+        revocations = RevocationList(sweep_interval=0)
+        monkeypatch.setattr("app.core.security.revocation_list", revocations)
+        return revocations
+    
+    @pytest.mark.asyncio
+    async def test_revoke_token(self, revocations):
+        """Test a revoked token fails verification while others still pass."""
+        user_id = uuid.uuid4()
+        revoked = create_access_token(user_id)
+        other = create_access_token(user_id)
+        
+        await revocations.revoke_token(verify_token(revoked, expected_type="access"))
+        
+        assert verify_token(revoked, expected_type="access") is None
+        assert verify_token(other, expected_type="access") is not None
+    
+    @pytest.mark.asyncio
+    async def test_revoke_user(self, revocations):
+        """Test revoking a user rejects tokens issued up to now, not later ones."""
+        user_id = uuid.uuid4()
+        access = create_access_token(user_id)
+        refresh = create_refresh_token(user_id)
+        
+        await revocations.revoke_user(user_id)
+        
+        assert verify_token(access) is None
+        assert verify_token(refresh) is None
+        assert not revocations.is_revoked({"sub": str(user_id), "iat": int(time.time()) + 5})
+        assert verify_token(create_access_token(uuid.uuid4())) is not None
+    
+    @pytest.mark.asyncio
+    async def test_login_right_after_revoke_user(self, revocations):
+        """Test tokens issued in the same second as logout-all, but after it, stay valid."""
+        user_id = uuid.uuid4()
+        old = create_access_token(user_id)
+        
+        await revocations.revoke_user(user_id)
+        access = create_access_token(user_id)
+        refresh = create_refresh_token(user_id)
+        
+        assert verify_token(old) is None
+        assert verify_token(access) is not None
+        assert verify_token(refresh, expected_type="refresh") is not None
+    
+    @pytest.mark.asyncio
+    async def test_entries_expire_with_tokens(self, revocations):
+        """Test entries are swept once the tokens they cover have expired."""
+        revocations.apply(Revocation(kind="jti", key="short", expires_at=time.time() + 0.01))
+        await revocations.revoke_token({"jti": "long", "exp": time.time() + 3600})
+        revocations.apply(Revocation(kind="jti", key="stale", expires_at=time.time() - 1))
+        assert len(revocations) == 2
+        
+        await asyncio.sleep(0.02)
+        
+        assert not revocations.is_revoked({"jti": "short"})
+        assert revocations.is_revoked({"jti": "long"})
+        assert len(revocations) == 1
+    
+    @pytest.mark.asyncio
+    async def test_synchronized_across_instances(self):
+        """Test revocations reach running instances and instances started later."""
+        bus = FakeRevocationBus()
+        first, second = RevocationList(bus.backend()), RevocationList(bus.backend())
+        await first.start()
+        await second.start()
+        try:
+            await asyncio.sleep(0)
+            await first.revoke_token({"jti": "abc", "exp": time.time() + 60})
+            await second.revoke_user("user-1")
+            await asyncio.sleep(0)
+            
+            assert second.is_revoked({"jti": "abc"})
+            assert first.is_revoked({"sub": "user-1", "iat": int(time.time()) - 1})
+            
+            late = RevocationList(bus.backend())
+            await late.start()
+            assert late.is_revoked({"jti": "abc"})
+            assert late.is_revoked({"sub": "user-1", "iat": 0})
+            await late.close()
+        finally:
+            await first.close()
+            await second.close()
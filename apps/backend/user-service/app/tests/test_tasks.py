@@ -0,0 +1,307 @@
+"""
+Background task queue tests for SkillForge AI User Service
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.security import token_digest
+from app.crud import user as user_crud, user_session as session_crud
+from app.models.user_simple import User
+from app.tasks import (
+    AsyncioTaskBackend,
+    CeleryTaskBackend,
+    InlineTaskBackend,
+    TaskQueue,
+    task,
+)
+from app.tasks.queue import CELERY_TASK_NAME, IdempotencyStore, TaskBackend
+
+calls = []
+
+
+@task("tests.record", uses_db=False)
+async def record_call(**kwargs):
+    calls.append(kwargs)
+
+
+@task("tests.fail", uses_db=False)
+async def fail(**kwargs):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_incomplete_backends_rejected():
+    """Test backends missing part of their interface fail at construction."""
+    class NoSubmit(TaskBackend):
+        pass
+    
+    class ClaimOnly(IdempotencyStore):
+        async def claim(self, key, ttl):
+            return True
+    
+    with pytest.raises(TypeError):
+        NoSubmit()
+    with pytest.raises(TypeError):
+        ClaimOnly()
+
+
+class FakeCelery:
+    """Records published tasks."""
+    
+    def __init__(self):
+        self.sent = []
+    
+    def send_task(self, name, args=None, kwargs=None):
+        self.sent.append((name, args))
+
+
+class TestTaskQueue:
+    """Test enqueueing, payloads and idempotency."""
+    
+    @pytest.mark.asyncio
+    async def test_inline_runs_with_json_payload(self):
+        """Test arguments reach the task as JSON types."""
+        queue = TaskQueue(InlineTaskBackend(raise_errors=True))
+        user_id = uuid.uuid4()
+        
+        assert await queue.enqueue("tests.record", user_id=user_id, at=datetime(2026, 1, 2, 3, 4, 5))
+        
+        assert calls == [{"user_id": str(user_id), "at": "2026-01-02T03:04:05"}]
+    
+    @pytest.mark.asyncio
+    async def test_unknown_task_is_rejected_at_enqueue(self):
+        """Test typos fail in the request rather than in a worker."""
+        queue = TaskQueue(InlineTaskBackend())
+        
+        with pytest.raises(KeyError):
+            await queue.enqueue("tests.missing")
+    
+    @pytest.mark.asyncio
+    async def test_idempotency_key_suppresses_duplicates(self):
+        """Test a repeated key is skipped until the store forgets it."""
+        queue = TaskQueue(InlineTaskBackend())
+        
+        assert await queue.enqueue("tests.record", idempotency_key="k", n=1)
+        assert not await queue.enqueue("tests.record", idempotency_key="k", n=2)
+        assert await queue.enqueue("tests.record", idempotency_key="other", n=3)
+        
+        assert [call["n"] for call in calls] == [1, 3]
+    
+    @pytest.mark.asyncio
+    async def test_failed_submit_releases_key(self):
+        """Test a task that could not be handed over may be enqueued again."""
+        queue = TaskQueue(InlineTaskBackend(raise_errors=True))
+        
+        assert not await queue.enqueue("tests.fail", idempotency_key="k")
+        assert not await queue.enqueue("tests.fail", idempotency_key="k")
+        assert await queue.idempotency.claim("tests.fail:k", 60)
+
+
+class TestBackends:
+    """Test the asyncio and Celery backends."""
+    
+    @pytest.mark.asyncio
+    async def test_asyncio_backend_defers_and_drains(self):
+        """Test enqueue returns before the task runs and close drains the queue."""
+        backend = AsyncioTaskBackend(workers=2)
+        queue = TaskQueue(backend)
+        await queue.start()
+        
+        for n in range(5):
+            await queue.enqueue("tests.record", n=n)
+        await queue.enqueue("tests.fail")
+        assert calls == []
+        
+        await queue.close()
+        assert sorted(call["n"] for call in calls) == list(range(5))
+        assert not backend.running
+    
+    @pytest.mark.asyncio
+    async def test_celery_backend_publishes_by_name(self):
+        """Test tasks are published to the single generic Celery task."""
+        celery = FakeCelery()
+        queue = TaskQueue(CeleryTaskBackend(celery_app=celery))
+        
+        await queue.enqueue("tests.record", n=1)
+        
+        assert celery.sent == [(CELERY_TASK_NAME, ["tests.record", {"n": 1}])]
+        assert calls == []
+    
+    def test_celery_worker_runs_registered_task(self):
+        """Test the worker-side Celery task dispatches to the registry."""
+        from app.tasks.worker import execute
+        
+        execute.apply(args=["tests.record", {"n": 7}]).get()
+        
+        assert calls == [{"n": 7}]
+
+
+class TestJobs:
+    """Test the deferred side effects."""
+    
+    @pytest.mark.asyncio
+    async def test_record_login(self, session_factory):
+        """Test login bookkeeping is committed by the task in its own session."""
+        async with session_factory() as db:
+            user = User(email="a@example.com", username="a", hashed_password="x")
+            db.add(user)
+            await db.commit()
+        assert user.updated_at is None
+        
+        queue = TaskQueue(InlineTaskBackend(raise_errors=True))
+        queue.session_factory = session_factory
+        await queue.enqueue("auth.record_login", user_id=user.id, logged_in_at=datetime(2026, 10, 1, 12, 0))
+        
+        async with session_factory() as db:
+            stored = await user_crud.get(db, user.id)
+        assert stored.updated_at is not None
+    
+    @pytest.mark.asyncio
+    async def test_record_login_stores_token_digests(self, session_factory):
+        """Test the session row is found by its tokens but stores only their digests."""
+        async with session_factory() as db:
+            user = User(email="a@example.com", username="a", hashed_password="x")
+            db.add(user)
+            await db.commit()
+        
+        queue = TaskQueue(InlineTaskBackend(raise_errors=True))
+        queue.session_factory = session_factory
+        await queue.enqueue(
+            "auth.record_login",
+            user_id=user.id,
+            logged_in_at=datetime.utcnow(),
+            session={
+                "session_token_digest": token_digest("access-jwt").hex(),
+                "refresh_token_digest": token_digest("refresh-jwt").hex(),
+                "expires_at": datetime.utcnow() + timedelta(minutes=30),
+            }
+        )
+        
+        async with session_factory() as db:
+            by_access = await session_crud.get_by_token(db, "access-jwt")
+            by_refresh = await session_crud.get_by_refresh_token(db, "refresh-jwt")
+            assert await session_crud.get_by_token(db, "refresh-jwt") is None
+            
+            assert by_access is not None and by_access.id == by_refresh.id
+            assert by_access.session_token_digest == token_digest("access-jwt")
+            
+            await session_crud.rotate_tokens(
+                db, by_access, "access-2", "refresh-2", datetime.utcnow() + timedelta(minutes=30)
+            )
+            assert await session_crud.get_by_refresh_token(db, "refresh-jwt") is None
+            assert (await session_crud.get_by_refresh_token(db, "refresh-2")).id == by_access.id
+    
+    @pytest.mark.asyncio
+    async def test_record_login_redelivery(self, session_factory):
+        """Test a redelivered login task does not insert its session twice."""
+        async with session_factory() as db:
+            user = User(email="a@example.com", username="a", hashed_password="x")
+            db.add(user)
+            await db.commit()
+        
+        queue = TaskQueue(InlineTaskBackend(raise_errors=True))
+        queue.session_factory = session_factory
+        for _ in range(2):
+            await queue.enqueue(
+                "auth.record_login",
+                user_id=user.id,
+                logged_in_at=datetime.utcnow(),
+                session={
+                    "session_token_digest": token_digest("access-jwt").hex(),
+                    "refresh_token_digest": token_digest("refresh-jwt").hex(),
+                    "expires_at": datetime.utcnow() + timedelta(minutes=30),
+                }
+            )
+        
+        async with session_factory() as db:
+            sessions = await session_crud.get_multi(db, filters={"user_id": user.id})
+        assert len(sessions) == 1
+    
+    @pytest.mark.asyncio
+    async def test_logout_right_after_login(self, session_factory, monkeypatch):
+        """Test the login session is usable before the deferred bookkeeping runs."""
+        from types import SimpleNamespace
+        from starlette.requests import Request
+        from app.api.v1.endpoints import auth
+        from app.models.user_simple import UserRole
+        from app.schemas.user import UserLogin
+        
+        class HeldTaskBackend(TaskBackend):
+            """Accepts tasks without running them, like a busy worker."""
+            
+            def __init__(self):
+                self.submitted = []
+            
+            async def submit(self, name, kwargs):
+                self.submitted.append(name)
+        
+        async with session_factory() as db:
+            user = User(email="a@example.com", username="a", hashed_password="x")
+            db.add(user)
+            await db.commit()
+        
+        async def authenticate(db, email, password, record_login=True):
+            return SimpleNamespace(id=user.id, email=email, role=UserRole.USER, is_verified=True, is_active=True)
+        
+        backend = HeldTaskBackend()
+        monkeypatch.setattr(auth, "task_queue", TaskQueue(backend))
+        monkeypatch.setattr(auth.user_crud, "authenticate", authenticate)
+        request = Request({"type": "http", "headers": [], "client": ("127.0.0.1", 50000)})
+        async with session_factory() as db:
+            tokens = await auth.login(UserLogin(email="a@example.com", password="Secret123!"), request, db=db, _=None)
+            assert await session_crud.get_by_refresh_token(db, tokens["refresh_token"]) is not None
+            
+            await auth.logout(request, db=db, credentials=SimpleNamespace(credentials=tokens["access_token"]))
+        
+        assert backend.submitted == ["auth.record_login", "audit.record"]
+        async with session_factory() as db:
+            assert await session_crud.get_by_refresh_token(db, tokens["refresh_token"]) is None
+    
+    @pytest.mark.asyncio
+    async def test_resent_links_are_delivered(self, session_factory, monkeypatch):
+        """Test a second reset request sends its own link instead of being deduplicated."""
+        from app.api.v1.endpoints import auth
+        from app.schemas.user import PasswordResetRequest
+        from app.utils import email as email_utils
+        
+        sent = []
+        monkeypatch.setattr(
+            email_utils,
+            "send_password_reset_email",
+            lambda to_email, first_name, token: sent.append(token) or True
+        )
+        monkeypatch.setattr(auth, "task_queue", TaskQueue(InlineTaskBackend(raise_errors=True)))
+        async with session_factory() as db:
+            db.add(User(email="a@example.com", username="a", hashed_password="x"))
+            await db.commit()
+            
+            for _ in range(2):
+                await auth.request_password_reset(PasswordResetRequest(email="a@example.com"), db=db, _=None)
+        
+        assert len(sent) == 2
+        assert sent[0] != sent[1]
+    
+    @pytest.mark.asyncio
+    async def test_email_task_uses_email_helper(self, monkeypatch):
+        """Test email tasks call the module helpers off the event loop."""
+        from app.utils import email as email_utils
+        
+        sent = []
+        monkeypatch.setattr(
+            email_utils,
+            "send_welcome_email",
+            lambda to_email, first_name: sent.append((to_email, first_name)) or True
+        )
+        queue = TaskQueue(InlineTaskBackend(raise_errors=True))
+        
+        await queue.enqueue("email.welcome", to_email="a@example.com", first_name="Ann")
+        
+        assert sent == [("a@example.com", "Ann")]
@@ -2,10 +2,24 @@
 User endpoint tests for SkillForge AI User Service
 """
 
+import uuid
+from datetime import datetime
+
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies import get_current_admin_user, get_db
+from app.api.v1.endpoints.users import get_user_public_profiles, router
+from app.core.cache import UserSnapshot, user_cache
+from app.core.config import get_settings
+from app.crud.base import encode_cursor
+from app.models.user_simple import User
+from app.schemas.user import UserBatchRequest
 from app.tests.conftest import UserFactory, assert_response_error, assert_user_response
 
 
@@ -270,6 +284,43 @@ class TestPublicUserProfiles:
                  for user in response_data["users"])
 
 
+class TestBatchPublicProfiles:
+    """Test batch lookup of public profiles."""
+    
+    @pytest_asyncio.fixture
+    async def session(self, session):
+        """Session seeded with two active users and an inactive one."""
+        session.add_all([
+            User(email=f"batch{i}@example.com", username=f"batch{i}", hashed_password="x", is_active=i != 2)
+            for i in range(3)
+        ])
+        await session.commit()
+        user_cache.clear()
+        yield session
+        user_cache.clear()
+    
+    @pytest.mark.asyncio
+    async def test_order_and_missing(self, session):
+        """Test profiles keep request order and unknown or inactive ids are reported once."""
+        users = {user.username: user for user in (await session.execute(select(User))).scalars()}
+        unknown = uuid.uuid4()
+        ids = [users["batch1"].id, unknown, users["batch0"].id, users["batch2"].id, users["batch1"].id]
+        
+        result = await get_user_public_profiles(UserBatchRequest(ids=ids), db=session)
+        
+        assert [user.username for user in result["users"]] == ["batch1", "batch0"]
+        assert result["missing"] == [unknown, users["batch2"].id]
+        assert user_cache.get(users["batch0"].id).email == "batch0@example.com"
+    
+    def test_id_limit(self):
+        ids = [uuid.uuid4() for _ in range(get_settings().USER_BATCH_MAX_IDS + 1)]
+        
+        with pytest.raises(ValidationError):
+            UserBatchRequest(ids=ids)
+        with pytest.raises(ValidationError):
+            UserBatchRequest(ids=[])
+
+
 class TestAdminUserEndpoints:
     """Test admin user management endpoints."""
     
@@ -294,6 +345,36 @@ class TestAdminUserEndpoints:
         
         assert_response_error(response, 403, "Not enough permissions")
     
+    @pytest.fixture
+    def admin_client(self, session):
+        """Client for the users router with an admin caller and the test session."""
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1/users")
+        app.dependency_overrides[get_db] = lambda: session
+        app.dependency_overrides[get_current_admin_user] = lambda: UserSnapshot(
+            id=uuid.uuid4(), email="admin@example.com", role="admin",
+            is_active=True, is_verified=True, is_superuser=True
+        )
+        return TestClient(app, base_url="http://localhost")
+    
+    def test_get_users_cursor_rejects_other_sort(self, admin_client):
+        """Test cursor pagination with a non created_at sort is a client error."""
+        cursor = encode_cursor(datetime.utcnow(), uuid.uuid4())
+        
+        response = admin_client.get(
+            "/api/v1/users/",
+            params={"cursor": cursor, "sort_by": "email", "status": "active"}
+        )
+        
+        assert_response_error(response, 400, "Cursor pagination only supports sorting by created_at")
+    
+    def test_get_users_status_filter_validated(self, admin_client):
+        """Test the status filter is read from the status query parameter."""
+        response = admin_client.get("/api/v1/users/", params={"status": "bogus"})
+        
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["query", "status"]
+    
     def test_get_user_by_id_admin(self, authenticated_admin_client, create_test_user):
         """Test getting user by ID as admin."""
         client, admin_user = authenticated_admin_client
@@ -2,15 +2,25 @@
 Utilities package for SkillForge AI User Service
 """
 
-from .email import send_email, send_verification_email, send_password_reset_email
+from .email import (
+    send_email,
+    send_bulk_email,
+    send_verification_email,
+    send_password_reset_email,
+    send_team_invitation_emails,
+    email_dispatcher
+)
 from .validators import validate_slug, validate_username, validate_phone_number
 from .helpers import generate_slug, format_name, parse_skills, sanitize_html
 
 __all__ = [
     # Email utilities
     "send_email",
+    "send_bulk_email",
     "send_verification_email", 
     "send_password_reset_email",
+    "send_team_invitation_emails",
+    "email_dispatcher",
     
     # Validators
     "validate_slug",
@@ -0,0 +1,250 @@
+"""
+Bulk user import for SkillForge AI User Service
+Streams CSV / NDJSON uploads into chunked bulk inserts with a per-row report
+"""
+
+import csv
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import password_hasher
+from app.crud import user as user_crud, user_settings as settings_crud, team_member as member_crud
+from app.crud.base import ConflictPolicy
+from app.models.user_simple import User
+from app.schemas.user import UserCreate
+from app.utils.helpers import parse_skills
+
+logger = logging.getLogger(__name__)
+
+# CSV columns holding lists, written as "a;b;c"
+LIST_FIELDS = ("skills", "interests")
+
+Record = Tuple[int, Any]
+
+# iter_lines decodes invalid UTF-8 to this; records containing it are reported as failed
+REPLACEMENT_CHARACTER = "\ufffd"
+INVALID_UTF8 = "Invalid UTF-8"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body.
+    
+    Invalid UTF-8 never raises, since the response is already streaming; it
+    decodes to REPLACEMENT_CHARACTER and the record parsers fail that row.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+    if buffer:
+        yield buffer.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """Yield (line number, object) per NDJSON line; parse errors are yielded as exceptions."""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        if REPLACEMENT_CHARACTER in line:
+            yield line_no, ValueError(INVALID_UTF8)
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, ValueError(f"Invalid JSON: {e.msg}")
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """Yield (line number, dict) per CSV row using the first row as header."""
+    header: Optional[List[str]] = None
+    pending = ""
+    line_no = start_line = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start_line = line_no
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue  # quoted field continues on the next line
+        
+        raw, pending = pending, ""
+        if not raw.strip():
+            continue
+        if REPLACEMENT_CHARACTER in raw and header is not None:
+            yield start_line, ValueError(INVALID_UTF8)
+            continue
+        values = next(csv.reader([raw]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        
+        if len(values) != len(header):
+            yield start_line, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        record = {name: value for name, value in zip(header, values) if value != ""}
+        for name in LIST_FIELDS:
+            if name in record:
+                record[name] = parse_skills(record[name])
+        yield start_line, record
+    
+    if pending:
+        yield start_line, ValueError("Unterminated quoted field")
+
+
+def _validation_errors(error: ValidationError) -> List[str]:
+    """Flatten pydantic errors into 'field: message' strings."""
+    return [
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    ]
+
+
+async def stream_user_import(
+    db: AsyncSession,
+    records: AsyncIterator[Record],
+    chunk_size: int = 500,
+    company_id: Optional[UUID] = None,
+    member_role: str = "member"
+) -> AsyncIterator[Dict[str, Any]]:
+    """Validate, hash and insert users chunk by chunk, yielding one result per row.
+    
+    The last item is a ``{"summary": ...}`` with counts per status.
+    """
+    summary = {"created": 0, "skipped": 0, "failed": 0}
+    chunk: List[Tuple[int, UserCreate]] = []
+    
+    async for line, record in records:
+        if isinstance(record, Exception):
+            summary["failed"] += 1
+            yield {"line": line, "status": "failed", "errors": [str(record)]}
+            continue
+        
+        try:
+            if isinstance(record, dict):
+                record.setdefault("confirm_password", record.get("password"))
+            chunk.append((line, UserCreate.model_validate(record)))
+        except ValidationError as e:
+            summary["failed"] += 1
+            yield {"line": line, "status": "failed", "errors": _validation_errors(e)}
+            continue
+        
+        if len(chunk) >= chunk_size:
+            async for result in _import_chunk(db, chunk, company_id, member_role):
+                summary[result["status"]] += 1
+                yield result
+            chunk = []
+    
+    if chunk:
+        async for result in _import_chunk(db, chunk, company_id, member_role):
+            summary[result["status"]] += 1
+            yield result
+    
+    yield {"summary": summary}
+
+
+async def _import_chunk(
+    db: AsyncSession,
+    chunk: List[Tuple[int, UserCreate]],
+    company_id: Optional[UUID],
+    member_role: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """Insert one chunk of validated users with their settings and memberships."""
+    # Drop rows that would collide before paying for bcrypt
+    emails = [user_in.email for _, user_in in chunk]
+    usernames = [user_in.username for _, user_in in chunk]
+    existing = await db.execute(
+        select(User.email, User.username).where(
+            or_(User.email.in_(emails), User.username.in_(usernames))
+        )
+    )
+    taken_emails, taken_usernames = set(), set()
+    for email, username in existing.all():
+        taken_emails.add(email)
+        taken_usernames.add(username)
+    
+    pending: List[Tuple[int, UserCreate]] = []
+    for line, user_in in chunk:
+        if user_in.email in taken_emails or user_in.username in taken_usernames:
+            yield {
+                "line": line,
+                "status": "skipped",
+                "email": user_in.email,
+                "errors": ["Email or username already exists"]
+            }
+            continue
+        taken_emails.add(user_in.email)
+        taken_usernames.add(user_in.username)
+        pending.append((line, user_in))
+    
+    hashes = await password_hasher.hash_many([user_in.password for _, user_in in pending])
+    rows: List[Tuple[int, UserCreate, Dict[str, Any]]] = []
+    for (line, user_in), hashed in zip(pending, hashes):
+        if isinstance(hashed, Exception):
+            yield {
+                "line": line,
+                "status": "failed",
+                "email": user_in.email,
+                "errors": ["Password hashing unavailable, retry later"]
+            }
+            continue
+        rows.append((line, user_in, user_crud.build_user_data(user_in, hashed)))
+    
+    if not rows:
+        return
+    
+    try:
+        written = await user_crud.bulk_ingest(
+            db,
+            [data for _, _, data in rows],
+            chunk_size=len(rows),
+            on_conflict={"email": ConflictPolicy.SKIP, "username": ConflictPolicy.SKIP},
+            commit=False
+        )
+        created_ids = [id for id, created in zip(written.ids, written.created) if created]
+        await settings_crud.bulk_ingest(
+            db,
+            [user_crud.default_settings_data(id) for id in created_ids],
+            commit=False
+        )
+        if company_id is not None:
+            await member_crud.bulk_ingest(
+                db,
+                [
+                    {"company_id": company_id, "user_id": id, "role": member_role}
+                    for id in created_ids
+                ],
+                commit=False
+            )
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Bulk import chunk failed: {str(e)}")
+        await db.rollback()
+        for line, user_in, _ in rows:
+            yield {
+                "line": line,
+                "status": "failed",
+                "email": user_in.email,
+                "errors": ["Database error while importing chunk"]
+            }
+        return
+    
+    for (line, user_in, _), id, created in zip(rows, written.ids, written.created):
+        if created:
+            yield {"line": line, "status": "created", "email": user_in.email, "id": str(id)}
+        else:
+            yield {
+                "line": line,
+                "status": "skipped",
+                "email": user_in.email,
+                "errors": ["Email or username already exists"]
+            }
@@ -1,167 +1,425 @@
 """
 Email utilities for SkillForge AI User Service
+
+Messages are handed to a background dispatcher that sends them in batches
+over a small pool of persistent SMTP connections, retrying transient
+failures with exponential backoff. Without a running dispatcher (scripts,
+tests) messages are sent inline.
 """
 
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
-from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+import queue
 import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
 
 from app.core.config import get_settings
+from app.core.metrics import EMAIL_DELIVERIES, EMAIL_QUEUE_DEPTH
+from app.utils.email_templates import TemplateRegistry, email_templates
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Email templates directory
-TEMPLATES_DIR = Path(__file__).parent / "templates"
 
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a delivery error is worth retrying (4xx replies, dropped connections)."""
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    # SMTPException subclasses OSError; only socket-level errors are transient here
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
 
-class EmailService:
-    """Email service for sending emails."""
+
+class SMTPConnectionPool:
+    """Persistent, authenticated SMTP connections shared between threads.
     
-    def __init__(self):
-        self.smtp_host = settings.SMTP_HOST
-        self.smtp_port = settings.SMTP_PORT
-        self.smtp_user = settings.SMTP_USER
-        self.smtp_password = settings.SMTP_PASSWORD
-        self.smtp_tls = settings.SMTP_TLS
-        self.from_email = settings.EMAILS_FROM_EMAIL or settings.SMTP_USER
-        self.from_name = settings.EMAILS_FROM_NAME or "SkillForge AI"
-        
-        # Setup Jinja2 environment for email templates
-        try:
-            self.jinja_env = Environment(
-                loader=FileSystemLoader(str(TEMPLATES_DIR))
-            )
-        except Exception:
-            # If templates directory doesn't exist, use string templates
-            self.jinja_env = None
-            logger.warning("Email templates directory not found, using fallback templates")
+    Connections are opened on demand, kept after use and checked with NOOP
+    once they have been idle for max_idle seconds. A connection that raised
+    while checked out is closed instead of being returned.
+    """
+    
+    def __init__(
+        self,
+        host: Optional[str],
+        port: Optional[int],
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        tls: bool = True,
+        size: int = 2,
+        max_idle: float = 60.0,
+        timeout: float = 10.0
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.tls = tls
+        self.size = max(1, size)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self.stats = {"connects": 0, "reuses": 0, "discards": 0}
     
-    def _get_smtp_connection(self):
-        """Get SMTP connection."""
-        if not all([self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_password]):
+    @property
+    def is_configured(self) -> bool:
+        """Whether there is a server to connect to."""
+        return bool(self.host and self.port)
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open, secure and authenticate a new connection."""
+        if not self.is_configured:
             raise ValueError("SMTP configuration is incomplete")
         
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
         try:
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            if self.smtp_tls:
+            if self.tls:
                 server.starttls()
-            server.login(self.smtp_user, self.smtp_password)
-            return server
-        except Exception as e:
-            logger.error(f"Failed to connect to SMTP server: {str(e)}")
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
             raise
+        self.stats["connects"] += 1
+        return server
     
-    def send_email(
+    def _discard(self, server: smtplib.SMTP) -> None:
+        """Close a connection without raising."""
+        self.stats["discards"] += 1
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def _checkout(self) -> smtplib.SMTP:
+        """Most recently used live connection, or a new one."""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            
+            if time.monotonic() - last_used < self.max_idle:
+                self.stats["reuses"] += 1
+                return server
+            try:
+                if server.noop()[0] == 250:
+                    self.stats["reuses"] += 1
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard(server)
+    
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """Borrow a connection, blocking while all size connections are in use."""
+        with self._slots:
+            server = self._checkout()
+            try:
+                yield server
+            except BaseException:
+                self._discard(server)
+                raise
+            self._idle.put((server, time.monotonic()))
+    
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(server)
+
+
+class EmailService:
+    """Email service for sending emails."""
+    
+    def __init__(
+        self,
+        pool: Optional[SMTPConnectionPool] = None,
+        templates: Optional[TemplateRegistry] = None
+    ):
+        self.from_email = settings.EMAILS_FROM_EMAIL or settings.SMTP_USER
+        self.from_name = settings.EMAILS_FROM_NAME or "SkillForge AI"
+        self.pool = pool or SMTPConnectionPool(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            user=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            tls=settings.SMTP_TLS,
+            size=settings.EMAIL_POOL_SIZE,
+            max_idle=settings.EMAIL_CONNECTION_MAX_IDLE,
+            timeout=settings.SMTP_TIMEOUT,
+        )
+        self.templates = templates or email_templates
+    
+    @property
+    def is_configured(self) -> bool:
+        """Whether SMTP delivery is configured."""
+        return self.pool.is_configured
+    
+    def build_message(
         self,
         to_email: str,
         subject: str,
         html_content: str,
         text_content: Optional[str] = None,
         attachments: Optional[List[Dict[str, Any]]] = None
-    ) -> bool:
-        """Send email."""
+    ) -> MIMEMultipart:
+        """Build a multipart message ready for delivery."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        
+        # Add text content
+        if text_content:
+            text_part = MIMEText(text_content, 'plain', 'utf-8')
+            msg.attach(text_part)
+        
+        # Add HTML content
+        html_part = MIMEText(html_content, 'html', 'utf-8')
+        msg.attach(html_part)
+        
+        # Add attachments if provided
+        if attachments:
+            for attachment in attachments:
+                # This would be implemented based on attachment requirements
+                pass
+        
+        return msg
+    
+    def send_message(self, msg: MIMEMultipart) -> bool:
+        """Send a built message now over a pooled connection (blocking)."""
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            
-            # Add text content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain', 'utf-8')
-                msg.attach(text_part)
-            
-            # Add HTML content
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(html_part)
-            
-            # Add attachments if provided
-            if attachments:
-                for attachment in attachments:
-                    # This would be implemented based on attachment requirements
-                    pass
-            
-            # Send email
-            with self._get_smtp_connection() as server:
+            with self.pool.connection() as server:
                 server.send_message(msg)
             
-            logger.info(f"Email sent successfully to {to_email}")
+            EMAIL_DELIVERIES.labels(result="sent").inc()
+            logger.info(f"Email sent successfully to {msg['To']}")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {str(e)}")
+            EMAIL_DELIVERIES.labels(result="failed").inc()
+            logger.error(f"Failed to send email to {msg['To']}: {str(e)}")
             return False
     
+    def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None
+    ) -> bool:
+        """Send email now; blocks, so request paths use the module-level send_email."""
+        try:
+            msg = self.build_message(to_email, subject, html_content, text_content, attachments)
+        except Exception as e:
+            logger.error(f"Failed to build email to {to_email}: {str(e)}")
+            return False
+        return self.send_message(msg)
+    
     def render_template(self, template_name: str, **kwargs) -> str:
         """Render email template."""
-        if self.jinja_env:
+        try:
+            return self.templates.render(template_name, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to render template {template_name}: {str(e)}")
+            return f"<p>Email template for {template_name} not found.</p>"
+    
+    def render_batch(
+        self,
+        template_name: str,
+        contexts: List[Dict[str, Any]],
+        shared: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """Render a template for many recipients with a single lookup."""
+        return self.templates.render_batch(template_name, contexts, shared)
+
+
+class EmailDispatcher:
+    """Queue of outgoing messages drained by background workers.
+    
+    Each worker takes up to batch_size queued messages and sends them over
+    one pooled connection in a thread. Transient failures retry the unsent
+    rest of the batch with exponential backoff; permanent rejections are
+    logged and dropped.
+    """
+    
+    def __init__(
+        self,
+        service: EmailService,
+        workers: int = 2,
+        queue_size: int = 1000,
+        batch_size: int = 50,
+        max_attempts: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0
+    ):
+        self.service = service
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stats_lock = threading.Lock()
+        self.stats = {"sent": 0, "failed": 0, "retried": 0, "dropped": 0}
+    
+    @property
+    def running(self) -> bool:
+        """Whether workers are accepting messages."""
+        return bool(self._tasks)
+    
+    def _record(self, result: str, count: int = 1) -> None:
+        """Count delivery outcomes; called from worker threads."""
+        with self._stats_lock:
+            self.stats[result] += count
+        EMAIL_DELIVERIES.labels(result=result).inc(count)
+    
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"email-dispatcher-{index}")
+            for index in range(self.workers)
+        ]
+    
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Drain the queue for up to timeout seconds, then stop the workers."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Email dispatcher stopped with {self._queue.qsize()} messages undelivered")
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self.service.pool.close)
+    
+    def submit(self, msg: MIMEMultipart) -> bool:
+        """Queue a message without waiting; False when the queue is full."""
+        if not self.running:
+            raise RuntimeError("Email dispatcher is not running")
+        try:
+            self._queue.put_nowait(msg)
+        except asyncio.QueueFull:
+            self._record("dropped")
+            logger.error(f"Email queue full, dropping message to {msg['To']}")
+            return False
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+    
+    async def submit_many(self, messages: Iterable[MIMEMultipart]) -> int:
+        """Queue messages, waiting for room instead of dropping them."""
+        if not self.running:
+            raise RuntimeError("Email dispatcher is not running")
+        count = 0
+        for msg in messages:
+            await self._queue.put(msg)
+            count += 1
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+        return count
+    
+    async def join(self) -> None:
+        """Wait until every queued message has been handled."""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def _worker(self) -> None:
+        """Take batches off the queue until cancelled."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+            
+            try:
+                await self.deliver(batch)
+            except Exception as e:
+                logger.error(f"Email batch delivery crashed: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def deliver(self, messages: List[MIMEMultipart]) -> None:
+        """Send messages now in batches, retrying transient failures."""
+        for offset in range(0, len(messages), self.batch_size):
+            pending = list(messages[offset:offset + self.batch_size])
+            retrying = AsyncRetrying(
+                stop=stop_after_attempt(self.max_attempts),
+                wait=wait_exponential(multiplier=self.backoff, max=self.max_backoff),
+                retry=retry_if_exception(_is_transient),
+                before_sleep=lambda state: self._record("retried"),
+                reraise=True,
+            )
             try:
-                template = self.jinja_env.get_template(template_name)
-                return template.render(**kwargs)
+                async for attempt in retrying:
+                    with attempt:
+                        await asyncio.to_thread(self._send_batch, pending)
             except Exception as e:
-                logger.error(f"Failed to render template {template_name}: {str(e)}")
-                return self._get_fallback_template(template_name, **kwargs)
-        else:
-            return self._get_fallback_template(template_name, **kwargs)
+                self._record("failed", len(pending))
+                logger.error(f"Giving up on {len(pending)} emails: {str(e)}")
     
-    def _get_fallback_template(self, template_name: str, **kwargs) -> str:
-        """Get fallback template if Jinja2 templates are not available."""
-        templates = {
-            "verification_email.html": f"""
-            <!DOCTYPE html>
-            <html>
-            <body>
-                <h2>Welcome to SkillForge AI!</h2>
-                <p>Hi {kwargs.get('first_name', 'there')},</p>
-                <p>Please click the link below to verify your email address:</p>
-                <p><a href="{kwargs.get('verification_url', '#')}">Verify Email</a></p>
-                <p>This link will expire in 24 hours.</p>
-                <p>If you didn't create this account, please ignore this email.</p>
-                <p>Best regards,<br>The SkillForge AI Team</p>
-            </body>
-            </html>
-            """,
-            "password_reset.html": f"""
-            <!DOCTYPE html>
-            <html>
-            <body>
-                <h2>Password Reset Request</h2>
-                <p>Hi {kwargs.get('first_name', 'there')},</p>
-                <p>You requested to reset your password. Click the link below:</p>
-                <p><a href="{kwargs.get('reset_url', '#')}">Reset Password</a></p>
-                <p>This link will expire in 1 hour.</p>
-                <p>If you didn't request this, please ignore this email.</p>
-                <p>Best regards,<br>The SkillForge AI Team</p>
-            </body>
-            </html>
-            """,
-            "team_invitation.html": f"""
-            <!DOCTYPE html>
-            <html>
-            <body>
-                <h2>Team Invitation</h2>
-                <p>Hi {kwargs.get('first_name', 'there')},</p>
-                <p>You've been invited to join <strong>{kwargs.get('company_name', 'a company')}</strong> on SkillForge AI.</p>
-                <p>Message: {kwargs.get('message', 'No message provided.')}</p>
-                <p><a href="{kwargs.get('invitation_url', '#')}">Accept Invitation</a></p>
-                <p>Best regards,<br>The SkillForge AI Team</p>
-            </body>
-            </html>
-            """
-        }
+    def _send_batch(self, pending: List[MIMEMultipart]) -> None:
+        """Send over one connection, removing messages from pending as they are handled.
         
-        return templates.get(template_name, f"<p>Email template for {template_name} not found.</p>")
+        A transient error leaves the unsent messages in pending for the retry.
+        """
+        with self.service.pool.connection() as server:
+            while pending:
+                msg = pending[0]
+                try:
+                    server.send_message(msg)
+                except Exception as e:
+                    if _is_transient(e):
+                        raise
+                    self._record("failed")
+                    logger.error(f"Email to {msg['To']} rejected: {str(e)}")
+                else:
+                    self._record("sent")
+                pending.pop(0)
 
 
 # Global email service instance
 email_service = EmailService()
 
+# Started by the application lifespan when SMTP is configured
+email_dispatcher = EmailDispatcher(
+    email_service,
+    workers=settings.EMAIL_WORKERS,
+    queue_size=settings.EMAIL_QUEUE_SIZE,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    backoff=settings.EMAIL_RETRY_BACKOFF,
+)
+
+
+def _dispatch(msg: MIMEMultipart) -> bool:
+    """Queue the message when the dispatcher runs, otherwise send it inline."""
+    if email_dispatcher.running:
+        return email_dispatcher.submit(msg)
+    return email_service.send_message(msg)
+
 
 def send_email(
     to_email: str,
@@ -170,7 +428,42 @@ def send_email(
     text_content: Optional[str] = None
 ) -> bool:
     """Send email using global email service."""
-    return email_service.send_email(to_email, subject, html_content, text_content)
+    return _dispatch(email_service.build_message(to_email, subject, html_content, text_content))
+
+
+async def _dispatch_many(messages: List[MIMEMultipart]) -> int:
+    """Queue messages with backpressure, or deliver them in batches inline."""
+    if email_dispatcher.running:
+        return await email_dispatcher.submit_many(messages)
+    await email_dispatcher.deliver(messages)
+    return len(messages)
+
+
+async def send_bulk_email(
+    recipients: Iterable[str],
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> int:
+    """Send one message per recipient in batches; returns the number queued or attempted."""
+    return await _dispatch_many([
+        email_service.build_message(to_email, subject, html_content, text_content)
+        for to_email in recipients
+    ])
+
+
+def _frontend_url(path: str) -> str:
+    """Absolute URL of a frontend page."""
+    base_url = settings.BACKEND_CORS_ORIGINS[0] if settings.BACKEND_CORS_ORIGINS else "http://localhost:3000"
+    return f"{base_url}{path}"
+
+
+def _render_pair(template_name: str, **context) -> Tuple[str, str]:
+    """Render the HTML and plain text parts of a template."""
+    return (
+        email_service.render_template(f"{template_name}.html", **context),
+        email_service.render_template(f"{template_name}.txt", **context),
+    )
 
 
 def send_verification_email(
@@ -180,33 +473,13 @@ def send_verification_email(
 ) -> bool:
     """Send email verification email."""
     try:
-        base_url = settings.BACKEND_CORS_ORIGINS[0] if settings.BACKEND_CORS_ORIGINS else "http://localhost:3000"
-        verification_url = f"{base_url}/verify-email?token={verification_token}"
-        
-        subject = "Verify your SkillForge AI account"
-        html_content = email_service.render_template(
-            "verification_email.html",
+        html_content, text_content = _render_pair(
+            "verification_email",
             first_name=first_name,
-            verification_url=verification_url
+            verification_url=_frontend_url(f"/verify-email?token={verification_token}")
         )
-        
-        text_content = f"""
-        Hi {first_name},
-        
-        Welcome to SkillForge AI!
-        
-        Please visit the following URL to verify your email address:
-        {verification_url}
-        
-        This link will expire in 24 hours.
-        
-        If you didn't create this account, please ignore this email.
-        
-        Best regards,
-        The SkillForge AI Team
-        """
-        
-        return email_service.send_email(to_email, subject, html_content, text_content)
+        subject = "Verify your SkillForge AI account"
+        return _dispatch(email_service.build_message(to_email, subject, html_content, text_content))
         
     except Exception as e:
         logger.error(f"Failed to send verification email: {str(e)}")
@@ -220,33 +493,13 @@ def send_password_reset_email(
 ) -> bool:
     """Send password reset email."""
     try:
-        base_url = settings.BACKEND_CORS_ORIGINS[0] if settings.BACKEND_CORS_ORIGINS else "http://localhost:3000"
-        reset_url = f"{base_url}/reset-password?token={reset_token}"
-        
-        subject = "Reset your SkillForge AI password"
-        html_content = email_service.render_template(
-            "password_reset.html",
+        html_content, text_content = _render_pair(
+            "password_reset",
             first_name=first_name,
-            reset_url=reset_url
+            reset_url=_frontend_url(f"/reset-password?token={reset_token}")
         )
-        
-        text_content = f"""
-        Hi {first_name},
-        
-        You requested to reset your SkillForge AI password.
-        
-        Please visit the following URL to reset your password:
-        {reset_url}
-        
-        This link will expire in 1 hour.
-        
-        If you didn't request this, please ignore this email.
-        
-        Best regards,
-        The SkillForge AI Team
-        """
-        
-        return email_service.send_email(to_email, subject, html_content, text_content)
+        subject = "Reset your SkillForge AI password"
+        return _dispatch(email_service.build_message(to_email, subject, html_content, text_content))
         
     except Exception as e:
         logger.error(f"Failed to send password reset email: {str(e)}")
@@ -261,82 +514,50 @@ def send_team_invitation_email(
 ) -> bool:
     """Send team invitation email."""
     try:
-        base_url = settings.BACKEND_CORS_ORIGINS[0] if settings.BACKEND_CORS_ORIGINS else "http://localhost:3000"
-        invitation_url = f"{base_url}/team-invitation"
-        
-        subject = f"Invitation to join {company_name} on SkillForge AI"
-        html_content = email_service.render_template(
-            "team_invitation.html",
+        html_content, text_content = _render_pair(
+            "team_invitation",
             first_name=first_name,
             company_name=company_name,
             message=message or "You've been invited to join the team!",
-            invitation_url=invitation_url
+            invitation_url=_frontend_url("/team-invitation")
         )
-        
-        text_content = f"""
-        Hi {first_name},
-        
-        You've been invited to join {company_name} on SkillForge AI.
-        
-        Message: {message or "You've been invited to join the team!"}
-        
-        Please visit the following URL to accept the invitation:
-        {invitation_url}
-        
-        Best regards,
-        The SkillForge AI Team
-        """
-        
-        return email_service.send_email(to_email, subject, html_content, text_content)
+        subject = f"Invitation to join {company_name} on SkillForge AI"
+        return _dispatch(email_service.build_message(to_email, subject, html_content, text_content))
         
     except Exception as e:
         logger.error(f"Failed to send team invitation email: {str(e)}")
         return False
 
 
+async def send_team_invitation_emails(
+    invitees: List[Tuple[str, str]],
+    company_name: str,
+    message: Optional[str] = None
+) -> int:
+    """Send invitations to many (email, first_name) pairs, loading the templates once."""
+    shared = {
+        "company_name": company_name,
+        "message": message or "You've been invited to join the team!",
+        "invitation_url": _frontend_url("/team-invitation"),
+    }
+    contexts = [{"first_name": first_name} for _, first_name in invitees]
+    html_parts = email_service.render_batch("team_invitation.html", contexts, shared)
+    text_parts = email_service.render_batch("team_invitation.txt", contexts, shared)
+    subject = f"Invitation to join {company_name} on SkillForge AI"
+    
+    return await _dispatch_many([
+        email_service.build_message(to_email, subject, html_content, text_content)
+        for (to_email, _), html_content, text_content in zip(invitees, html_parts, text_parts)
+    ])
+
+
 def send_welcome_email(to_email: str, first_name: str) -> bool:
     """Send welcome email to new users."""
     try:
+        html_content, text_content = _render_pair("welcome_email", first_name=first_name)
         subject = "Welcome to SkillForge AI!"
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body>
-            <h2>Welcome to SkillForge AI!</h2>
-            <p>Hi {first_name},</p>
-            <p>Welcome to SkillForge AI! We're excited to have you join our community.</p>
-            <p>Here are some things you can do to get started:</p>
-            <ul>
-                <li>Complete your profile</li>
-                <li>Add your skills and interests</li>
-                <li>Explore learning opportunities</li>
-                <li>Connect with companies</li>
-            </ul>
-            <p>If you have any questions, feel free to contact our support team.</p>
-            <p>Best regards,<br>The SkillForge AI Team</p>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Hi {first_name},
-        
-        Welcome to SkillForge AI! We're excited to have you join our community.
-        
-        Here are some things you can do to get started:
-        - Complete your profile
-        - Add your skills and interests
-        - Explore learning opportunities
-        - Connect with companies
-        
-        If you have any questions, feel free to contact our support team.
-        
-        Best regards,
-        The SkillForge AI Team
-        """
-        
-        return email_service.send_email(to_email, subject, html_content, text_content)
+        return _dispatch(email_service.build_message(to_email, subject, html_content, text_content))
         
     except Exception as e:
         logger.error(f"Failed to send welcome email: {str(e)}")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,247 @@
+"""
+Email templates for SkillForge AI User Service
+
+Built-in templates are compiled once into a shared registry; files in
+TEMPLATES_DIR with the same name override them. Partials whose names start
+with an underscore take no variables, so they are rendered once and exposed
+to every template through the ``fragments`` global.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from jinja2 import (
+    ChoiceLoader,
+    DictLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    meta,
+    select_autoescape,
+)
+from markupsafe import Markup
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Email templates directory
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+BUILTIN_TEMPLATES: Dict[str, str] = {
+    "_signature.html": "<p>Best regards,<br>The SkillForge AI Team</p>",
+    "_signature.txt": "Best regards,\nThe SkillForge AI Team",
+    "verification_email.html": """<!DOCTYPE html>
+<html>
+<body>
+    <h2>Welcome to SkillForge AI!</h2>
+    <p>Hi {{ first_name | default('there') }},</p>
+    <p>Please click the link below to verify your email address:</p>
+    <p><a href="{{ verification_url | default('#') }}">Verify Email</a></p>
+    <p>This link will expire in 24 hours.</p>
+    <p>If you didn't create this account, please ignore this email.</p>
+    {{ fragments.signature_html }}
+</body>
+</html>
+""",
+    "verification_email.txt": """Hi {{ first_name }},
+
+Welcome to SkillForge AI!
+
+Please visit the following URL to verify your email address:
+{{ verification_url }}
+
+This link will expire in 24 hours.
+
+If you didn't create this account, please ignore this email.
+
+{{ fragments.signature_txt }}
+""",
+    "password_reset.html": """<!DOCTYPE html>
+<html>
+<body>
+    <h2>Password Reset Request</h2>
+    <p>Hi {{ first_name | default('there') }},</p>
+    <p>You requested to reset your password. Click the link below:</p>
+    <p><a href="{{ reset_url | default('#') }}">Reset Password</a></p>
+    <p>This link will expire in 1 hour.</p>
+    <p>If you didn't request this, please ignore this email.</p>
+    {{ fragments.signature_html }}
+</body>
+</html>
+""",
+    "password_reset.txt": """Hi {{ first_name }},
+
+You requested to reset your SkillForge AI password.
+
+Please visit the following URL to reset your password:
+{{ reset_url }}
+
+This link will expire in 1 hour.
+
+If you didn't request this, please ignore this email.
+
+{{ fragments.signature_txt }}
+""",
+    "team_invitation.html": """<!DOCTYPE html>
+<html>
+<body>
+    <h2>Team Invitation</h2>
+    <p>Hi {{ first_name | default('there') }},</p>
+    <p>You've been invited to join <strong>{{ company_name | default('a company') }}</strong> on SkillForge AI.</p>
+    <p>Message: {{ message | default('No message provided.') }}</p>
+    <p><a href="{{ invitation_url | default('#') }}">Accept Invitation</a></p>
+    {{ fragments.signature_html }}
+</body>
+</html>
+""",
+    "team_invitation.txt": """Hi {{ first_name }},
+
+You've been invited to join {{ company_name }} on SkillForge AI.
+
+Message: {{ message }}
+
+Please visit the following URL to accept the invitation:
+{{ invitation_url }}
+
+{{ fragments.signature_txt }}
+""",
+    "welcome_email.html": """<!DOCTYPE html>
+<html>
+<body>
+    <h2>Welcome to SkillForge AI!</h2>
+    <p>Hi {{ first_name }},</p>
+    <p>Welcome to SkillForge AI! We're excited to have you join our community.</p>
+    <p>Here are some things you can do to get started:</p>
+    <ul>
+        <li>Complete your profile</li>
+        <li>Add your skills and interests</li>
+        <li>Explore learning opportunities</li>
+        <li>Connect with companies</li>
+    </ul>
+    <p>If you have any questions, feel free to contact our support team.</p>
+    {{ fragments.signature_html }}
+</body>
+</html>
+""",
+    "welcome_email.txt": """Hi {{ first_name }},
+
+Welcome to SkillForge AI! We're excited to have you join our community.
+
+Here are some things you can do to get started:
+- Complete your profile
+- Add your skills and interests
+- Explore learning opportunities
+- Connect with companies
+
+If you have any questions, feel free to contact our support team.
+
+{{ fragments.signature_txt }}
+""",
+}
+
+
+def _fragment_key(name: str) -> str:
+    """'_signature.html' -> 'signature_html'."""
+    return name.lstrip("_").replace(".", "_")
+
+
+class TemplateRegistry:
+    """Compiled email templates shared by every send.
+    
+    Templates are compiled at most once per process (and, with a bytecode
+    cache, once per deployment) and looked up from a dict afterwards;
+    the loaders are not consulted again unless auto_reload is on.
+    """
+    
+    def __init__(
+        self,
+        templates_dir: Optional[Path] = TEMPLATES_DIR,
+        builtin: Optional[Mapping[str, str]] = None,
+        bytecode_cache_dir: Optional[str] = None,
+        use_bytecode_cache: bool = True,
+        auto_reload: bool = False
+    ):
+        loaders = []
+        if templates_dir is not None and Path(templates_dir).is_dir():
+            loaders.append(FileSystemLoader(str(templates_dir)))
+        loaders.append(DictLoader(dict(BUILTIN_TEMPLATES if builtin is None else builtin)))
+        
+        self.env = Environment(
+            loader=ChoiceLoader(loaders),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir) if use_bytecode_cache else None,
+            auto_reload=auto_reload,
+            cache_size=-1,
+        )
+        self.env.globals["fragments"] = {}
+        self._templates: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+        self._compiled = False
+    
+    def compile_all(self) -> int:
+        """Compile every template and render the static fragments; returns the template count."""
+        with self._lock:
+            if self._compiled:
+                return len(self._templates)
+            
+            fragments = {}
+            for name in self.env.list_templates():
+                template = self.env.get_template(name)
+                self._templates[name] = template
+                if name.startswith("_"):
+                    fragments[_fragment_key(name)] = self._render_static(name, template)
+            self.env.globals["fragments"] = fragments
+            self._compiled = True
+            return len(self._templates)
+    
+    def _render_static(self, name: str, template: Template) -> Markup:
+        """Render a partial that must not depend on any variable."""
+        source = self.env.loader.get_source(self.env, name)[0]
+        variables = meta.find_undeclared_variables(self.env.parse(source))
+        if variables:
+            raise ValueError(f"Fragment {name} uses variables: {', '.join(sorted(variables))}")
+        # Already escaped (or plain text), so it is inserted verbatim
+        return Markup(template.render())
+    
+    def get(self, name: str) -> Template:
+        """Compiled template by name; raises TemplateNotFound."""
+        if not self._compiled:
+            self.compile_all()
+        if self.env.auto_reload:
+            # Development: let Jinja notice edited files
+            return self.env.get_template(name)
+        template = self._templates.get(name)
+        if template is None:
+            template = self.env.get_template(name)
+            self._templates[name] = template
+        return template
+    
+    def render(self, name: str, **context: Any) -> str:
+        """Render one template."""
+        return self.get(name).render(**context)
+    
+    def render_batch(
+        self,
+        name: str,
+        contexts: Iterable[Mapping[str, Any]],
+        shared: Optional[Mapping[str, Any]] = None
+    ) -> List[str]:
+        """Render one template per recipient context, looking it up once.
+        
+        shared holds values common to every recipient, e.g. the company name
+        of an invitation fan-out; per-recipient values win on conflicts.
+        """
+        template = self.get(name)
+        shared = dict(shared or {})
+        return [template.render({**shared, **context}) for context in contexts]
+
+
+# Global template registry
+email_templates = TemplateRegistry(
+    bytecode_cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR,
+    use_bytecode_cache=settings.EMAIL_TEMPLATE_BYTECODE_CACHE,
+    auto_reload=settings.is_development,
+)
@@ -6,7 +6,7 @@ FastAPI application entry point
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 import time
 import logging
@@ -14,6 +14,16 @@ from contextlib import asynccontextmanager
 
 from app.core.config import get_settings
 from app.core.database import create_db_and_tables
+from app.core.keys import signing_keys
+from app.core.security import password_hasher, rate_limiter
+from app.core.cache import user_cache
+from app.core.revocation import revocation_list
+from app.core.metrics import MetricsMiddleware, render_metrics, start_metrics_server, mark_process_dead
+from app.core.profiling import QueryProfilerMiddleware
+from app.utils.email import email_dispatcher, email_service
+from app.utils.email_templates import email_templates
+from app.tasks import task_queue
+from app.tasks.maintenance import create_scheduler
 from app.api.v1 import api_router
 
 # Configure logging
@@ -30,9 +40,29 @@ async def lifespan(app: FastAPI):
     logger.info("Starting SkillForge AI User Service...")
     await create_db_and_tables()
     logger.info("Database tables created/verified")
+    if settings.ENABLE_METRICS and settings.METRICS_PORT and not settings.is_testing:
+        start_metrics_server(settings.METRICS_PORT)
+    logger.info(f"Compiled {email_templates.compile_all()} email templates")
+    if email_service.is_configured and not settings.is_testing:
+        email_dispatcher.start()
+    await task_queue.start()
+    await revocation_list.start()
+    scheduler = None
+    if settings.MAINTENANCE_ENABLED and not settings.is_testing:
+        scheduler = create_scheduler()
+        scheduler.start()
     yield
     # Shutdown
     logger.info("Shutting down SkillForge AI User Service...")
+    if scheduler is not None:
+        await scheduler.stop()
+    # Tasks may still queue emails, so drain them first
+    await task_queue.close()
+    await email_dispatcher.stop()
+    password_hasher.shutdown()
+    await rate_limiter.close()
+    await revocation_list.close()
+    mark_process_dead()
 
 
 # Create FastAPI app
@@ -72,6 +102,19 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+# Per-request SQL counts in headers and logs outside production
+if settings.sql_profiling_enabled:
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        repeat_threshold=settings.SQL_PROFILING_REPEAT_THRESHOLD
+    )
+
+
+# Added last so it is outermost and its latency covers all other middleware
+if settings.ENABLE_METRICS:
+    app.add_middleware(MetricsMiddleware)
+
+
 # Health check endpoints
 @app.get("/")
 async def root():
@@ -91,8 +134,32 @@ async def health_check():
         "status": "healthy",
         "timestamp": time.time(),
         "service": "user-service",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "caches": {
+            "user": user_cache.stats
+        }
+    }
+
+
+@app.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks(request: Request):
+    """Public token signing keys, for services that verify tokens themselves."""
+    body, etag = signing_keys.jwks_document()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE}",
+        "ETag": etag,
     }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+if settings.ENABLE_METRICS and not settings.METRICS_PORT:
+    @app.get(settings.METRICS_PATH, include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint."""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
 
 
 # Global exception handler